@@ -0,0 +1,257 @@
+"""Decide whether an AI ping needs the web at all.
+
+classify() sorts a user message into one of four routes before any
+request leaves the bot:
+  - FAQ: one of the community's stock questions, asked the usual way
+    (how do I get runner role, why are mobile runs banned, ...). The
+    system prompt line that answers it rides along as route.fact and
+    Ollama answers from it without a search.
+  - CHAT: greetings, thanks and other small talk. Ollama replies without
+    a search.
+  - LOCAL: the question is about something the system prompt already
+    covers (the fact index below). Ollama replies from the prompt
+    without a search; its web tools stay available.
+  - WEB: everything else, plus anything with a link or asking for news
+    or records. The usual prefetch runs.
+
+Nothing is answered here: FAQ entries only point at lines of the system
+prompt the conversation carries (chat.responses.clear_context), so there
+is no second copy of the facts to drift. An entry whose line is missing
+from the prompt doesn't match. All of it is plain keyword rules: no
+model, no embeddings.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import FrozenSet, Optional, Tuple
+
+FAQ, CHAT, LOCAL, WEB = "faq", "chat", "local", "web"
+
+# Share of the question's content words one prompt fact must contain for LOCAL
+LOCAL_MIN_OVERLAP = 0.6
+
+_NO_SEARCH = "No web search was run for this message: "
+NO_SEARCH_NOTES = {
+    CHAT: "This message is small talk; no web search was run. Reply briefly and naturally.",
+    FAQ: (
+        _NO_SEARCH + "it is a common community question. Answer it in your own words "
+        "from this Google Snake community fact:\n{fact}"
+    ),
+    LOCAL: (
+        _NO_SEARCH + "it is covered by the Google Snake community facts above, so answer "
+        "from those. Use web_search only if they don't actually answer it."
+    ),
+}
+
+
+@dataclass(frozen=True)
+class Route:
+    kind: str
+    fact: Optional[str] = None  # FAQ and LOCAL: the prompt line that answers it
+    reason: str = ""
+
+
+@dataclass(frozen=True)
+class FaqEntry:
+    name: str
+    question: str  # must match the whole question (see _question)
+    facts: Tuple[str, ...]  # each picks the prompt line containing it
+
+
+_Q_END = r"(?: in google snake)?"
+
+FAQ_ENTRIES = (
+    FaqEntry(
+        "wall pattern count",
+        r"how many (?:wall )?patterns (?:are there|exist|does wall(?: mode)? have)"
+        r"(?: in (?:wall(?: mode)?|small(?: board)?))?" + _Q_END,
+        ("235,355,155 wall patterns", "how many patterns in normal size"),
+    ),
+    FaqEntry(
+        "ham cycle rarity",
+        r"how (?:rare|common) (?:is|are) (?:a )?ham(?:iltonian)? ?cycles?" + _Q_END,
+        ("how rare a ham cycle is",),
+    ),
+    FaqEntry(
+        "ham path rarity",
+        r"how (?:rare|common) (?:is|are) (?:a )?ham(?:iltonian)? ?paths?" + _Q_END,
+        ("how rare is a ham path",),
+    ),
+    FaqEntry(
+        "runner role",
+        r"(?:how (?:do|can) (?:i|you|we) (?:get|earn)|how to get) (?:the )?runner role",
+        ("to get runner role",),
+    ),
+    FaqEntry(
+        "mobile runs",
+        r"why (?:are|is) mobile(?: google snake)? runs? (?:banned|not allowed)",
+        ("why mobile google snake runs are banned",),
+    ),
+    FaqEntry(
+        "runs per video",
+        r"(?:can|may) (?:i|you|we) submit (?:multiple|several|two|more than one) runs "
+        r"(?:in|on) (?:the same|one|a single) video",
+        ("multiple runs in the same video",),
+    ),
+    FaqEntry(
+        "game creator",
+        r"who (?:made|created|developed|invented|is the creator of) google snake",
+        ("the creator of google snake is",),
+    ),
+    FaqEntry(
+        "high score modes",
+        r"(?:what|which) (?:are|is) (?:the )?(?:high ?score|hs) modes?" + _Q_END
+        + r"|what makes a mode (?:a )?(?:high ?score|hs)(?: mode)?",
+        ("what makes a mode in google snake a high score mode", "high score modes (spawn-radius"),
+    ),
+    FaqEntry(
+        "mode list",
+        r"(?:how many|what|which) modes (?:are there|does google snake have)" + _Q_END
+        + r"|(?:what are|list) (?:all )?the modes" + _Q_END,
+        ("24 modes on fastsnakestats",),
+    ),
+    FaqEntry(
+        "spawn radius",
+        r"what (?:is|does) (?:the |a )?spawn ?radius(?: mean)?" + _Q_END,
+        ("spawn radius refers to",),
+    ),
+    FaqEntry(
+        "mod loader creator",
+        r"who (?:made|created) (?:the )?(?:mod ?loader|level editor(?: mod)?|mouse mod)",
+        ("the creator of mod loader",),
+    ),
+    FaqEntry(
+        "speeds and sizes",
+        r"(?:how many|what|which) (?:speeds|sizes)(?: and (?:speeds|sizes))? "
+        r"(?:are there|does google snake have)" + _Q_END,
+        ("3 speeds",),
+    ),
+    FaqEntry(
+        "time limit",
+        r"(?:is there|does google snake have) a time ?limit" + _Q_END,
+        ("no time limits",),
+    ),
+)
+
+# Words that say the answer lives outside the prompt: news, records, dates.
+_NEEDS_WEB = re.compile(
+    r"https?://|\b(?:latest|news|today|tonight|yesterday|tomorrow|current(?:ly)?|now|"
+    r"recent(?:ly)?|this (?:week|month|year)|price|weather|(?<!high )scores?|won|wins|"
+    r"records?|wrs?|(?:19|20)\d\d)\b"
+)
+_SMALL_TALK = frozenset(
+    "hi hello hey heya hiya yo sup wassup howdy gm gn good morning afternoon evening night "
+    "thanks thank you ty thx tysm ok okay k cool nice great lol lmao lmfao haha bye cya "
+    "see ya how are doing whats up what's wbu hru there puddingbot pudding bot love u "
+    "please pls".split()
+)
+_STOPWORDS = frozenset(
+    "the a an and or but of to in on at for with from by as is are was were be been being "
+    "do does did doing have has had can could would should will shall may might must "
+    "what whats who whom whose which when where why how that this these those there here "
+    "it its it's i me my mine you your yours we us our they them their he him his she her "
+    "not no yes so if then than too very just about into over under again also any some "
+    "tell know explain please give short answer never mention asked someone asks thing "
+    "google snake game mean means".split()
+)
+_WORD = re.compile(r"[a-z0-9][a-z0-9'%]*")
+
+ROUTES: Counter = Counter()
+
+
+def _words(text: str):
+    return _WORD.findall((text or "").lower())
+
+
+def _stem(word: str) -> str:
+    word = word.strip("'")
+    if word.endswith("'s"):
+        word = word[:-2]
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def _content(text: str) -> FrozenSet[str]:
+    return frozenset(
+        _stem(w) for w in _words(text) if len(w) > 2 and w not in _STOPWORDS
+    ) - {""}
+
+
+@lru_cache(maxsize=4)
+def fact_index(system_prompt: str) -> Tuple[Tuple[FrozenSet[str], str], ...]:
+    """(content words, line) for each fact line of a system prompt."""
+    index = []
+    for line in (system_prompt or "").splitlines():
+        line = line.strip().lstrip("- ").strip()
+        words = _content(line)
+        if len(words) >= 2:
+            index.append((words, line))
+    return tuple(index)
+
+
+def _question(text: str) -> str:
+    """Lowercase, single-spaced, without trailing punctuation."""
+    return " ".join((text or "").lower().split()).rstrip("?!. ")
+
+
+def faq_fact(text: str, system_prompt: str) -> Optional[Tuple[FaqEntry, str]]:
+    """(entry, prompt lines) for the FAQ text asks, or None.
+
+    None too when the prompt lacks one of the entry's lines.
+    """
+    question = _question(text)
+    lines = [line for _words, line in fact_index(system_prompt)]
+    for entry in FAQ_ENTRIES:
+        if not re.fullmatch(entry.question, question):
+            continue
+        found = [next((l for l in lines if key in l.lower()), None) for key in entry.facts]
+        if all(found):
+            return entry, "\n".join(found)
+    return None
+
+
+def _is_small_talk(text: str) -> bool:
+    words = _words(text)
+    return len(words) <= 6 and all(w.strip("'") in _SMALL_TALK for w in words)
+
+
+def _local_fact(text: str, system_prompt: str) -> Optional[str]:
+    question = _content(text)
+    if not question:
+        return None
+    best, best_line = 0, None
+    for words, line in fact_index(system_prompt):
+        shared = len(question & words)
+        if shared > best:
+            best, best_line = shared, line
+    if best_line and best >= min(2, len(question)) and best / len(question) >= LOCAL_MIN_OVERLAP:
+        return best_line
+    return None
+
+
+def classify(text: str, system_prompt: str = "") -> Route:
+    """Route for a cleaned user message (see the module docstring).
+
+    text is the question alone: no bot mention or reply-length suffix.
+    """
+    lowered = (text or "").lower().strip()
+    if _NEEDS_WEB.search(lowered):
+        route = Route(WEB, reason="links, news or records")
+    elif not lowered or _is_small_talk(lowered):
+        route = Route(CHAT, reason="small talk")
+    else:
+        hit = faq_fact(lowered, system_prompt)
+        fact = None if hit else _local_fact(lowered, system_prompt)
+        if hit:
+            route = Route(FAQ, fact=hit[1], reason=hit[0].name)
+        elif fact:
+            route = Route(LOCAL, fact=fact, reason=fact[:80])
+        else:
+            route = Route(WEB, reason="not covered locally")
+    ROUTES[route.kind] += 1
+    return route
@@ -1,10 +1,14 @@
+import asyncio
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional
 from urllib.parse import quote_plus
 
-import requests
+import aiohttp
+
+from . import faq, ollama, webcache
 
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_CHAT_URL = f"{OLLAMA_HOST}/api/chat"
@@ -15,6 +19,10 @@ OLLAMA_TIMEOUT = int(os.getenv("OLLAMA_TIMEOUT", "30"))
 OLLAMA_RETRY_TIMEOUT = int(os.getenv("OLLAMA_RETRY_TIMEOUT", "120"))
 # Qwen3 thinking burns tokens/latency; keep it off for snappy Discord replies
 OLLAMA_THINK = os.getenv("OLLAMA_THINK", "false").lower() in ("1", "true", "yes")
+# Seconds the pre-fetched web context may take in total before Ollama starts
+PREFETCH_DEADLINE = float(os.getenv("WEB_PREFETCH_DEADLINE", "8"))
+# Skip the auto-search for FAQs and whatever the prompt already knows (chat.faq)
+LOCAL_ROUTING = os.getenv("AI_LOCAL_ROUTING", "true").lower() in ("1", "true", "yes")
 
 TOOLS = [
     {
@@ -67,19 +75,40 @@ def _strip_html(html: str) -> str:
     return text.strip()
 
 
-def web_search(query: str, max_results: int = 5) -> str:
-    """Search via DuckDuckGo HTML results (no API key)."""
+_WEB_HEADERS = {"User-Agent": "PuddingBot/1.0 (+https://github.com/DarkSnakeGang/PuddingBot)"}
+
+
+def _web_error(tool: str, error: Exception) -> str:
+    return f"{tool} error: {error or type(error).__name__}"
+
+
+async def web_search(query: str, max_results: int = 5) -> str:
+    """Search via DuckDuckGo HTML results (no API key), cached in webcache.SEARCHES.
+
+    Runs on the pooled session: cancelling the caller aborts the request.
+    """
+    key = webcache.query_key(query, max_results)
+    cached = await webcache.lookup(webcache.SEARCHES, key)
+    if cached is not None:
+        print(f"[DEBUG] web_search cache hit: {query!r}")
+        return cached
+    result = await _web_search(query, max_results)
+    if not result.startswith("web_search error"):
+        await webcache.store(webcache.SEARCHES, key, result)
+    return result
+
+
+async def _web_search(query: str, max_results: int) -> str:
+    session = ollama.get_session()
     try:
-        response = requests.post(
+        async with session.post(
             "https://html.duckduckgo.com/html/",
             data={"q": query},
-            headers={
-                "User-Agent": "PuddingBot/1.0 (+https://github.com/DarkSnakeGang/PuddingBot)"
-            },
-            timeout=20,
-        )
-        response.raise_for_status()
-        html = response.text
+            headers=_WEB_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=20),
+        ) as response:
+            response.raise_for_status()
+            html = await response.text(errors="replace")
 
         # result links look like <a rel="nofollow" class="result__a" href="...">title</a>
         links = re.findall(
@@ -95,13 +124,13 @@ def web_search(query: str, max_results: int = 5) -> str:
 
         if not links:
             # Fallback: DuckDuckGo instant answer API
-            instant = requests.get(
+            async with session.get(
                 "https://api.duckduckgo.com/",
-                params={"q": query, "format": "json", "no_html": 1, "skip_disambig": 1},
-                timeout=15,
-            )
-            instant.raise_for_status()
-            data = instant.json()
+                params={"q": query, "format": "json", "no_html": "1", "skip_disambig": "1"},
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as instant:
+                instant.raise_for_status()
+                data = await instant.json(content_type=None)
             parts = []
             if data.get("AbstractText"):
                 parts.append(f"Abstract: {data['AbstractText']}")
@@ -119,33 +148,46 @@ def web_search(query: str, max_results: int = 5) -> str:
             lines.append(f"{i + 1}. {clean_title}\n   {url}\n   {snippet}")
         return "\n".join(lines)
     except Exception as e:
-        return f"web_search error: {e}"
+        return _web_error("web_search", e)
 
 
-def web_fetch(url: str) -> str:
-    """Fetch a URL and return truncated plain text."""
-    try:
-        if not url.startswith(("http://", "https://")):
-            return "web_fetch error: URL must start with http:// or https://"
+async def web_fetch(url: str) -> str:
+    """Fetch a URL and return truncated plain text, cached in webcache.PAGES.
 
-        response = requests.get(
+    Runs on the pooled session: cancelling the caller aborts the request.
+    """
+    if not url.startswith(("http://", "https://")):
+        return "web_fetch error: URL must start with http:// or https://"
+    key = webcache.url_key(url)
+    cached = await webcache.lookup(webcache.PAGES, key)
+    if cached is not None:
+        print(f"[DEBUG] web_fetch cache hit: {url}")
+        return cached
+    result = await _web_fetch(url)
+    if not result.startswith("web_fetch error"):
+        await webcache.store(webcache.PAGES, key, result)
+    return result
+
+
+async def _web_fetch(url: str) -> str:
+    try:
+        async with ollama.get_session().get(
             url,
-            headers={
-                "User-Agent": "PuddingBot/1.0 (+https://github.com/DarkSnakeGang/PuddingBot)"
-            },
-            timeout=20,
+            headers=_WEB_HEADERS,
+            timeout=aiohttp.ClientTimeout(total=20),
             allow_redirects=True,
-        )
-        response.raise_for_status()
-        content_type = response.headers.get("Content-Type", "")
-        if "html" in content_type or url.endswith((".html", ".htm")) or "<html" in response.text[:200].lower():
-            text = _strip_html(response.text)
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "")
+            body = await response.text(errors="replace")
+        if "html" in content_type or url.endswith((".html", ".htm")) or "<html" in body[:200].lower():
+            text = _strip_html(body)
         else:
-            text = response.text
+            text = body
         text = text[:FETCH_MAX_CHARS]
         return f"Content from {url}:\n{text}"
     except Exception as e:
-        return f"web_fetch error: {e}"
+        return _web_error("web_fetch", e)
 
 
 AVAILABLE_TOOLS = {
@@ -165,15 +207,23 @@ def _parse_tool_args(raw: Any) -> Dict[str, Any]:
     return {}
 
 
-def _ollama_chat(
+TextFn = Callable[[str], None]
+
+
+async def _ollama_chat(
     messages: List[Dict[str, Any]],
     use_tools: bool = True,
     timeout: Optional[int] = None,
+    on_text: Optional[TextFn] = None,
 ) -> Dict[str, Any]:
+    """One /api/chat round on the pooled session; returns the response JSON.
+
+    With on_text the reply is streamed: on_text(text so far) is called as
+    chunks arrive (see ollama.post_chat).
+    """
     payload: Dict[str, Any] = {
         "model": OLLAMA_MODEL,
         "messages": messages,
-        "stream": False,
         "think": OLLAMA_THINK,
         "options": {
             "temperature": 0.7,
@@ -183,14 +233,9 @@ def _ollama_chat(
     }
     if use_tools:
         payload["tools"] = TOOLS
-
-    response = requests.post(
-        OLLAMA_CHAT_URL,
-        json=payload,
-        timeout=timeout or OLLAMA_TIMEOUT,
+    return await ollama.post_chat(
+        OLLAMA_CHAT_URL, payload, timeout or OLLAMA_TIMEOUT, on_text=on_text
     )
-    response.raise_for_status()
-    return response.json()
 
 
 def _search_query_from_user_text(text: str) -> str:
@@ -233,15 +278,28 @@ def _clean_reply(text: str) -> str:
     return cleaned
 
 
-def _run_ollama_conversation(
+async def _run_ollama_conversation(
     chat_messages: List[Dict[str, Any]],
     timeout: int,
+    on_partial: Optional[TextFn] = None,
 ) -> str:
-    """Run tool loop + final answer against Ollama."""
+    """Run tool loop + final answer against Ollama.
+
+    on_partial(text) sees the cleaned reply so far while it streams. A
+    round that ends in tool calls may have streamed some text first; the
+    next round's text replaces it.
+    """
     working = [dict(m) for m in chat_messages]
 
+    def show_partial(text: str) -> None:
+        cleaned = _clean_reply(text.strip())
+        if cleaned:
+            on_partial(cleaned)
+
+    on_text = show_partial if on_partial is not None else None
+
     for _ in range(MAX_TOOL_ROUNDS):
-        result = _ollama_chat(working, use_tools=True, timeout=timeout)
+        result = await _ollama_chat(working, use_tools=True, timeout=timeout, on_text=on_text)
         message = result.get("message") or {}
         tool_calls = message.get("tool_calls") or []
 
@@ -259,7 +317,10 @@ def _run_ollama_conversation(
             args = _parse_tool_args(fn.get("arguments"))
             print(f"[DEBUG] Tool call: {name}({args})")
             handler = AVAILABLE_TOOLS.get(name)
-            tool_result = handler(args) if handler else f"Unknown tool: {name}"
+            if handler:
+                tool_result = await handler(args)
+            else:
+                tool_result = f"Unknown tool: {name}"
             working.append(
                 {
                     "role": "tool",
@@ -268,37 +329,81 @@ def _run_ollama_conversation(
                 }
             )
 
-    result = _ollama_chat(working, use_tools=False, timeout=timeout)
+    result = await _ollama_chat(working, use_tools=False, timeout=timeout, on_text=on_text)
     content = _clean_reply(((result.get("message") or {}).get("content") or "").strip())
     return content or "Sorry, I couldn't generate a response right now."
 
 
-def chat_with_gpt(messages: List[Dict[str, str]], status_notify=None) -> str:
-    """
-    Chat with local Ollama. Always web-searches every user message, then answers.
-    On timeout/connection failure, notifies Discord and retries once.
-    """
-    chat_messages: List[Dict[str, Any]] = [dict(m) for m in messages]
+def _route(chat_messages: List[Dict[str, Any]], user_text: str) -> faq.Route:
+    """faq.classify on the question alone, against the conversation's system prompt."""
+    if not LOCAL_ROUTING:
+        return faq.Route(faq.WEB, reason="local routing off")
+    if re.search(r"https?://", user_text):
+        return faq.Route(faq.WEB, reason="link")
+    system_prompt = next(
+        (m.get("content") or "" for m in chat_messages if m.get("role") == "system"), ""
+    )
+    return faq.classify(_search_query_from_user_text(user_text), system_prompt)
 
-    last_user = next((m for m in reversed(chat_messages) if m.get("role") == "user"), None)
-    if last_user:
-        user_text = last_user.get("content", "")
 
-        urls = re.findall(r"https?://[^\s<>\")]+", user_text)
-        for url in urls[:2]:
-            fetched = web_fetch(url.rstrip(".,);]"))
-            print(f"[DEBUG] Prefetch URL: {url}")
-            chat_messages.append(
+async def prefetch_web_context(
+    user_text: str, deadline: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """System messages with web context for user_text, fetched concurrently.
+
+    Up to two linked pages and the auto-search start together; the top
+    search result is fetched as soon as the search is back. Whatever has
+    finished when the deadline (PREFETCH_DEADLINE) passes is injected, in
+    the order links, search, top result; the rest is cancelled, which
+    aborts their requests on the pooled session.
+    """
+    urls = [url.rstrip(".,);]") for url in re.findall(r"https?://[^\s<>\")]+", user_text)][:2]
+    search_query = _search_query_from_user_text(user_text) or user_text.strip() or "latest news"
+    found: Dict[str, str] = {}
+
+    async def fetch_link(key: str, url: str) -> None:
+        print(f"[DEBUG] Prefetch URL: {url}")
+        found[key] = await web_fetch(url)
+
+    async def search_then_fetch_top() -> None:
+        print(f"[DEBUG] Auto web_search: {search_query!r}")
+        results = await web_search(search_query, 5)
+        found["search"] = results
+        top_urls = re.findall(r"https?://[^\s]+", results)
+        if top_urls and top_urls[0] not in urls:
+            print(f"[DEBUG] Auto web_fetch top result: {top_urls[0]}")
+            found["top"] = await web_fetch(top_urls[0])
+
+    tasks = [asyncio.create_task(fetch_link(f"link{i}", url)) for i, url in enumerate(urls)]
+    tasks.append(asyncio.create_task(search_then_fetch_top()))
+    start = time.perf_counter()
+    try:
+        _done, pending = await asyncio.wait(
+            tasks, timeout=PREFETCH_DEADLINE if deadline is None else deadline
+        )
+    finally:
+        for task in tasks:
+            task.cancel()
+        # Settle cancellations and swallow stray errors so nothing is left unretrieved
+        await asyncio.gather(*tasks, return_exceptions=True)
+    if pending:
+        print(
+            f"[DEBUG] Prefetch deadline hit after {time.perf_counter() - start:.1f}s; "
+            f"using {sorted(found)}"
+        )
+    print(f"[DEBUG] Web cache: {webcache.summary()}")
+
+    context: List[Dict[str, Any]] = []
+    for i in range(len(urls)):
+        if f"link{i}" in found:
+            context.append(
                 {
                     "role": "system",
-                    "content": f"Pre-fetched page content for the user's link:\n{fetched}",
+                    "content": f"Pre-fetched page content for the user's link:\n{found[f'link{i}']}",
                 }
             )
-
-        search_query = _search_query_from_user_text(user_text) or user_text.strip() or "latest news"
-        print(f"[DEBUG] Auto web_search (always): {search_query!r}")
-        search_results = web_search(search_query, max_results=5)
-        chat_messages.append(
+    if "search" in found:
+        context.append(
             {
                 "role": "system",
                 "content": (
@@ -307,48 +412,95 @@ def chat_with_gpt(messages: List[Dict[str, str]], status_notify=None) -> str:
                     "NEVER say you lack real-time access, cannot browse, or cannot check CNN/news. "
                     "Answer using these results. If they are thin, still summarize what they contain "
                     "instead of refusing.\n\n"
-                    f"{search_results}"
+                    f"{found['search']}"
                 ),
             }
         )
+    if "top" in found:
+        context.append(
+            {
+                "role": "system",
+                "content": f"Top search result page content:\n{found['top']}",
+            }
+        )
+    return context
+
+
+def _notify(status_notify, text: str) -> None:
+    if status_notify:
+        try:
+            status_notify(text)
+        except Exception as notify_error:
+            print(f"[DEBUG] status_notify failed: {notify_error}")
+
+
+async def _generate(
+    chat_messages: List[Dict[str, Any]],
+    timeout: int,
+    priority: int,
+    status_notify=None,
+    on_partial: Optional[TextFn] = None,
+) -> str:
+    """_run_ollama_conversation once a generation slot is free."""
+
+    def on_wait(position: int) -> None:
+        _notify(status_notify, f"The AI is busy — you're #{position} in the queue, hang on…")
+
+    async with ollama.GENERATIONS.slot(priority, on_wait):
+        return await _run_ollama_conversation(chat_messages, timeout, on_partial)
 
-        top_urls = re.findall(r"https?://[^\s]+", search_results)
-        for url in top_urls[:1]:
-            if url in urls:
-                continue
-            print(f"[DEBUG] Auto web_fetch top result: {url}")
-            chat_messages.append(
-                {
-                    "role": "system",
-                    "content": f"Top search result page content:\n{web_fetch(url)}",
-                }
-            )
 
+async def chat_with_gpt(
+    messages: List[Dict[str, str]],
+    status_notify=None,
+    on_partial: Optional[TextFn] = None,
+) -> str:
+    """
+    Chat with local Ollama. FAQs, small talk and messages the system prompt
+    already answers skip the web search (chat.faq); the rest are
+    web-searched first, by prefetch_web_context within PREFETCH_DEADLINE.
+    On timeout/connection failure, notifies Discord and retries once.
+    on_partial(text) is called with the reply so far while it streams.
+    Generations queue in ollama.GENERATIONS; short prompts go first and a
+    queued user is told their place through status_notify.
+    """
+    chat_messages: List[Dict[str, Any]] = [dict(m) for m in messages]
+
+    last_user = next((m for m in reversed(chat_messages) if m.get("role") == "user"), None)
+    user_text = last_user.get("content", "") if last_user else ""
+    if last_user:
+        route = _route(chat_messages, user_text)
+        print(f"[DEBUG] Route: {route.kind} ({route.reason}) · totals {dict(faq.ROUTES)}")
+        if route.kind == faq.WEB:
+            chat_messages.extend(await prefetch_web_context(user_text))
+        else:
+            note = faq.NO_SEARCH_NOTES[route.kind].format(fact=route.fact)
+            chat_messages.append({"role": "system", "content": note})
+
+    priority = ollama.prompt_priority(_search_query_from_user_text(user_text))
     try:
-        return _run_ollama_conversation(chat_messages, timeout=OLLAMA_TIMEOUT)
-    except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as first_error:
-        print(f"[DEBUG] Ollama first attempt failed: {first_error}")
-        if status_notify:
-            try:
-                status_notify(
-                    "The AI is taking a while — trying one more time, hang on…"
-                )
-            except Exception as notify_error:
-                print(f"[DEBUG] status_notify failed: {notify_error}")
+        return await _generate(
+            chat_messages, OLLAMA_TIMEOUT, priority, status_notify, on_partial
+        )
+    except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as first_error:
+        print(f"[DEBUG] Ollama first attempt failed: {first_error!r}")
+        _notify(status_notify, "The AI is taking a while — trying one more time, hang on…")
 
         try:
-            return _run_ollama_conversation(chat_messages, timeout=OLLAMA_RETRY_TIMEOUT)
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            return await _generate(
+                chat_messages, OLLAMA_RETRY_TIMEOUT, priority, status_notify, on_partial
+            )
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError):
             return (
                 "Sorry, the AI is overloaded or still loading the model. "
                 "Please try again in a minute."
             )
-        except requests.exceptions.RequestException:
+        except (aiohttp.ClientError, ollama.OllamaError):
             return (
                 "Sorry, I couldn't reach the AI on the second try either. "
                 "Please try again shortly."
             )
-    except requests.exceptions.RequestException:
+    except (aiohttp.ClientError, ollama.OllamaError):
         return (
             "Sorry, I hit a temporary AI error. "
             "Please try again in a moment."
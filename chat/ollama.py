@@ -0,0 +1,160 @@
+"""Async Ollama transport: one pooled HTTP session and a generation queue.
+
+A single local Ollama serves every AI reply. At most OLLAMA_CONCURRENCY
+generations run at once; the rest wait in GENERATIONS, short prompts first,
+so a burst of pings queues on the event loop instead of tying up threads
+that all time out together. The session also carries the web tools'
+requests (chat.gpt), so cancelling a fetch aborts its connection.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import os
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+import aiohttp
+
+OLLAMA_CONCURRENCY = max(1, int(os.getenv("OLLAMA_CONCURRENCY", "2")))
+# User prompts up to this many characters jump ahead of longer ones.
+SHORT_PROMPT_CHARS = int(os.getenv("OLLAMA_SHORT_PROMPT_CHARS", "200"))
+
+SHORT, LONG = 0, 1
+
+
+class OllamaError(Exception):
+    """Ollama answered, but with an error instead of a reply."""
+
+
+class GenerationQueue:
+    """At most limit holders at once; waiters served by (priority, arrival).
+
+    on_wait(position) is called once if a request has to wait, with its
+    1-based place among the waiters.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.active = 0
+        self._waiting: List[list] = []  # heap of [priority, seq, future]
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for entry in self._waiting if not entry[2].done())
+
+    @contextlib.asynccontextmanager
+    async def slot(
+        self, priority: int = SHORT, on_wait: Optional[Callable[[int], None]] = None
+    ) -> AsyncIterator[None]:
+        if self.active < self.limit and not self.waiting:
+            self.active += 1
+        else:
+            entry = [priority, next(self._seq), asyncio.get_running_loop().create_future()]
+            heapq.heappush(self._waiting, entry)
+            if on_wait is not None:
+                ahead = sum(
+                    1 for other in self._waiting if other[:2] < entry[:2] and not other[2].done()
+                )
+                on_wait(ahead + 1)
+            try:
+                await entry[2]
+            except asyncio.CancelledError:
+                if entry[2].done() and not entry[2].cancelled():
+                    self._release()  # handed a slot just as we gave up
+                else:
+                    entry[2].cancel()
+                raise
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        # Hand the slot straight to the next live waiter, if any.
+        while self._waiting:
+            _priority, _seq, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
+GENERATIONS = GenerationQueue(OLLAMA_CONCURRENCY)
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def prompt_priority(user_text: str) -> int:
+    return SHORT if len(user_text or "") <= SHORT_PROMPT_CHARS else LONG
+
+
+def get_session() -> aiohttp.ClientSession:
+    """The shared session, made on first use (per event loop).
+
+    Ollama calls and the web tools (chat.gpt.web_search / web_fetch) both
+    use it; the per-host cap keeps web traffic from crowding out Ollama.
+    """
+    global _session, _session_loop
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        _session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit_per_host=OLLAMA_CONCURRENCY * 2)
+        )
+        _session_loop = loop
+    return _session
+
+
+async def close() -> None:
+    global _session
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+async def post_chat(
+    url: str,
+    payload: Dict[str, Any],
+    timeout: float,
+    on_text: Optional[Callable[[str], None]] = None,
+) -> Dict[str, Any]:
+    """POST an /api/chat payload on the pooled session; returns the response JSON.
+
+    With on_text, payload is sent with "stream": true and on_text(text so
+    far) is called per chunk; timeout then bounds the wait for each chunk.
+    The result has the same {"message": ...} shape either way.
+    """
+    stream = on_text is not None
+    payload = dict(payload, stream=stream)
+    if stream:
+        client_timeout = aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+    else:
+        client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with get_session().post(url, json=payload, timeout=client_timeout) as response:
+        response.raise_for_status()
+        if not stream:
+            return await response.json(content_type=None)
+        content = ""
+        tool_calls: List[Dict[str, Any]] = []
+        async for line in response.content:
+            line = line.strip()
+            if not line:
+                continue
+            chunk = json.loads(line)
+            if chunk.get("error"):
+                raise OllamaError(chunk["error"])
+            message = chunk.get("message") or {}
+            tool_calls.extend(message.get("tool_calls") or [])
+            if message.get("content"):
+                content += message["content"]
+                on_text(content)
+            if chunk.get("done"):
+                break
+    message = {"role": "assistant", "content": content}
+    if tool_calls:
+        message["tool_calls"] = tool_calls
+    return {"message": message}
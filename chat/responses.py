@@ -194,7 +194,7 @@ def clear_context():
 context = clear_context()
 conversation_history = {}  # Store conversation history per user
 
-def get_response(user_input: str, user="Nobody", status_notify=None) -> str:
+async def get_response(user_input: str, user="Nobody", status_notify=None, on_partial=None) -> str:
     blocked_users = ["1118731833262231714"]
     global context
     lowered = user_input.lower()
@@ -204,7 +204,7 @@ def get_response(user_input: str, user="Nobody", status_notify=None) -> str:
                    'https://tenor.com/view/pingas-butt-lame-fat-sitdown-gif-4771119']
 
     if lowered in cringe_list:
-        return get_random_funny_gif(os.getenv('KLIPY_KEY'), False)
+        return await asyncio.to_thread(get_random_funny_gif, os.getenv('KLIPY_KEY'), False)
 
     if lowered == 'roll dice':
         return str(randint(1, 6))
@@ -213,7 +213,9 @@ def get_response(user_input: str, user="Nobody", status_notify=None) -> str:
         return POI_EMOJI
 
     if 'gif' == lowered[:3]:
-        return get_random_funny_gif(os.getenv('KLIPY_KEY'), lowered[3:].strip())
+        return await asyncio.to_thread(
+            get_random_funny_gif, os.getenv('KLIPY_KEY'), lowered[3:].strip()
+        )
     
     if 'i completely agree' == lowered[:len('I completely agree')]:
         return 'https://klipy.com/gifs/i-completely-agree-i-agree'
@@ -222,7 +224,7 @@ def get_response(user_input: str, user="Nobody", status_notify=None) -> str:
         cleaned = wall.parse_pattern_input(user_input)
         if not cleaned:
             return "Use `/wallall` or paste pudding copy (`pattern` plus a 90-cell 1/2 grid)."
-        return wall.check_pattern(cleaned)
+        return await asyncio.to_thread(wall.check_pattern, cleaned)
 
     if "how" in lowered:
         if "timer" in lowered:
@@ -260,7 +262,9 @@ def get_response(user_input: str, user="Nobody", status_notify=None) -> str:
         # Create messages array with system context and full conversation history
         messages = context + conversation_history[user]
         
-        gpt_res = gpt.chat_with_gpt(messages, status_notify=status_notify)
+        gpt_res = await gpt.chat_with_gpt(
+            messages, status_notify=status_notify, on_partial=on_partial
+        )
         print(f"[AI RESPONSE] Generated: {gpt_res}")
         
         # Add assistant response to conversation history
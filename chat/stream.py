@@ -0,0 +1,68 @@
+"""Progressive Discord edits while an AI reply streams in."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import discord
+
+# Discord allows about 5 edits per 5s per channel. The first partial text
+# is sent at once; later ones wait STREAM_EDIT_SECONDS after the last edit.
+STREAM_EDIT_SECONDS = 1.5
+STREAM_MAX_CHARS = 1900
+
+PartialFn = Callable[[str], None]
+
+
+def _preview(text: str) -> str:
+    if len(text) > STREAM_MAX_CHARS:
+        return text[:STREAM_MAX_CHARS] + "…"
+    return text + " ▌"
+
+
+async def stream_reply(
+    target, run: Callable[[PartialFn], Awaitable[Any]]
+) -> Tuple[Any, Optional[discord.Message]]:
+    """Await run(on_partial) in a task, showing its partial text as it grows.
+
+    The first partial text is sent to target straight away; after that the
+    message is edited with the latest text at most every STREAM_EDIT_SECONDS.
+    on_partial only stores the latest text, so generation never waits on
+    Discord. Returns run's result and the message the partial text went
+    to (None if run never called on_partial); the caller puts the final
+    reply in that message.
+    """
+    latest: list = [None]
+    changed = asyncio.Event()
+
+    def on_partial(text: str) -> None:
+        latest[0] = text
+        changed.set()
+
+    worker = asyncio.ensure_future(run(on_partial))
+    message: Optional[discord.Message] = None
+    posted = None
+    while not worker.done():
+        waiter = asyncio.create_task(changed.wait())
+        await asyncio.wait({worker, waiter}, return_when=asyncio.FIRST_COMPLETED)
+        waiter.cancel()
+        if worker.done():
+            break
+        changed.clear()
+        text = latest[0]
+        if not text or text == posted:
+            continue
+        try:
+            if message is None:
+                message = await target.send(_preview(text))
+            else:
+                await message.edit(content=_preview(text))
+            posted = text
+        except discord.HTTPException as error:
+            print(f"[DEBUG] Partial reply edit failed: {error}")
+        # Collect whatever arrives during the pause into one edit.
+        await asyncio.wait({worker}, timeout=STREAM_EDIT_SECONDS)
+        if latest[0] != posted:
+            changed.set()
+    return await worker, message
@@ -0,0 +1,205 @@
+"""TTL cache for web_search and web_fetch results.
+
+Several users often ask about the same thing within minutes, and every
+AI ping auto-searches. SEARCHES (keyed by normalized query) and PAGES
+(keyed by canonical URL) answer repeats without the network until an
+entry is WEB_CACHE_TTL seconds old. Both are bounded by entry count and
+total stored characters, evicting least recently used first.
+
+With WEB_CACHE_PATH set, both caches are loaded from that JSON file on
+first use and written back at most every SAVE_SECONDS and on shutdown.
+lookup() and store() do that file work in a thread, off the event loop.
+Expiry uses wall-clock time, so entries survive a restart but not their TTL.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TTL_SECONDS = float(os.getenv("WEB_CACHE_TTL", "900"))
+MAX_ENTRIES = int(os.getenv("WEB_CACHE_ENTRIES", "256"))
+# Total characters of cached text per cache; single values are cut to ENTRY_MAX_CHARS
+MAX_CHARS = int(os.getenv("WEB_CACHE_MAX_CHARS", "1000000"))
+ENTRY_MAX_CHARS = 8000
+CACHE_PATH = os.getenv("WEB_CACHE_PATH", "")
+SAVE_SECONDS = 60
+
+_TRACKING_PARAMS = re.compile(r"^(?:utm_\w+|fbclid|gclid|ref|ref_src)$", re.IGNORECASE)
+
+
+def query_key(query: str, max_results: int = 5) -> str:
+    """'  What is  Google Snake?? ' -> '5:what is google snake'."""
+    words = re.sub(r"[^\w\s:/.+#-]", " ", (query or "").lower()).split()
+    return f"{max_results}:{' '.join(words).strip('.')}"
+
+
+def url_key(url: str) -> str:
+    """Canonical form of url: lowercase scheme and host, no default port,
+    fragment or tracking parameters, sorted query, no trailing slash."""
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and (scheme, parts.port) not in (("http", 80), ("https", 443)):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+        if not _TRACKING_PARAMS.match(k)
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, urlencode(query), ""))
+
+
+class TTLCache:
+    """LRU-bounded map of key -> (expires_at, text) with hit/miss counters."""
+
+    def __init__(self, name: str, ttl: float = TTL_SECONDS, max_entries: int = MAX_ENTRIES,
+                 max_chars: int = MAX_CHARS):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.chars = 0
+        self.hits = self.misses = self.expired = self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.time():
+                self._drop(key)
+                self.expired += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: str, text: str, expires_at: Optional[float] = None) -> None:
+        text = text[:ENTRY_MAX_CHARS]
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (expires_at or time.time() + self.ttl, text)
+            self.chars += len(text)
+            while self._entries and (
+                len(self._entries) > self.max_entries or self.chars > self.max_chars
+            ):
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _drop(self, key: str) -> None:
+        _expires, text = self._entries.pop(key)
+        self.chars -= len(text)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.chars = 0
+            self.hits = self.misses = self.expired = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "chars": self.chars,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def dump(self) -> Dict[str, list]:
+        now = time.time()
+        with self._lock:
+            return {key: [exp, text] for key, (exp, text) in self._entries.items() if exp > now}
+
+    def load(self, entries: Dict[str, list]) -> None:
+        now = time.time()
+        for key, (expires_at, text) in sorted(entries.items(), key=lambda kv: kv[1][0]):
+            if expires_at > now:
+                self.put(key, text, expires_at)
+
+
+SEARCHES = TTLCache("search")
+PAGES = TTLCache("fetch")
+CACHES = (SEARCHES, PAGES)
+
+_file_lock = threading.Lock()
+_loaded = False
+_saved_at = 0.0
+
+
+def _load() -> None:
+    global _loaded, _saved_at
+    with _file_lock:
+        if _loaded:
+            return
+        _loaded = True
+        _saved_at = time.time()
+        if not CACHE_PATH or not os.path.isfile(CACHE_PATH):
+            return
+        try:
+            with open(CACHE_PATH, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            for cache in CACHES:
+                cache.load(data.get(cache.name) or {})
+        except Exception as error:
+            print(f"[web-cache] Could not read {CACHE_PATH}: {error}")
+
+
+def save() -> None:
+    """Write both caches to CACHE_PATH (no-op when persistence is off)."""
+    global _saved_at
+    if not CACHE_PATH:
+        return
+    with _file_lock:
+        _saved_at = time.time()
+        try:
+            with open(CACHE_PATH, "w", encoding="utf-8") as handle:
+                json.dump({cache.name: cache.dump() for cache in CACHES}, handle)
+        except Exception as error:
+            print(f"[web-cache] Could not write {CACHE_PATH}: {error}")
+
+
+async def lookup(cache: TTLCache, key: str) -> Optional[str]:
+    if not _loaded:
+        await asyncio.to_thread(_load)
+    return cache.get(key)
+
+
+async def store(cache: TTLCache, key: str, text: str) -> None:
+    """Cache text under key; the periodic save runs off the event loop."""
+    global _saved_at
+    if not _loaded:
+        await asyncio.to_thread(_load)
+    cache.put(key, text)
+    if CACHE_PATH and time.time() - _saved_at >= SAVE_SECONDS:
+        _saved_at = time.time()  # one save at a time, not one per store
+        await asyncio.to_thread(save)
+
+
+def summary() -> str:
+    """'search 3/4 hits (75%), 2 entries · fetch 0/1 hits (0%), 1 entries'."""
+    parts = []
+    for cache in CACHES:
+        s = cache.stats()
+        parts.append(
+            f"{cache.name} {s['hits']}/{s['hits'] + s['misses']} hits ({s['hit_rate']:.0%}), "
+            f"{s['entries']} entries"
+        )
+    return " · ".join(parts)
@@ -29,7 +29,8 @@ except ValueError:
 StatusCallback = Callable[[str], Awaitable[None]]
 
 
-def _get_owner_id() -> Optional[int]:
+def get_owner_id() -> Optional[int]:
+    """BOT_OWNER_ID as an int, or None when unset or invalid."""
     owner_id = os.getenv("BOT_OWNER_ID")
     if not owner_id:
         return None
@@ -190,6 +191,10 @@ async def _apply_repo_update(set_status: StatusCallback) -> tuple[bool, bool, st
             "repo_watch_state.json",
             "-e",
             "wr_watch_state.json",
+            "-e",
+            "wall_text_mode.json",
+            "-e",
+            "web_cache.json",
         ],
         timeout=60,
     )
@@ -259,7 +264,7 @@ class Admin(commands.Cog):
             self.auto_update_task.cancel()
 
     def _is_owner(self, user_id: int) -> bool:
-        owner_id = _get_owner_id()
+        owner_id = get_owner_id()
         return owner_id is not None and user_id == owner_id
 
     async def _restart_after_update(self) -> None:
@@ -3,15 +3,24 @@
 from __future__ import annotations
 
 import asyncio
+import io
+import json
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
 import wall
+from cogs.admin import get_owner_id
+from wall import analyse as wall_analyse
 from wall import stream as wall_stream
+from wall import telemetry as wall_telemetry
+from wall import textmode as wall_textmode
+from wall.hampath import CancelToken, SolveCancelled
 
 SOLVE_TIMEOUT_SECONDS = wall_stream.FIRST_SOLVE_TIMEOUT
+# The analysis stops itself after ANALYSE_SECONDS; this covers the heatmap and slack.
+ANALYSE_TIMEOUT_SECONDS = wall_analyse.ANALYSE_SECONDS + 30
 
 
 class WallAll(commands.Cog):
@@ -26,9 +35,23 @@ class WallAll(commands.Cog):
     )
     @app_commands.describe(
         grid="Paste pudding copy (`pattern 12…`) or a 10×9 0/1 or 1/2 grid. Spaces ignored.",
+        mode=(
+            "solve: best cycle / path · replay: solve, plus an animation of the path · "
+            "analyse: heatmap of one-cell wall edits"
+        ),
+    )
+    @app_commands.choices(
+        mode=[
+            app_commands.Choice(name="solve", value="solve"),
+            app_commands.Choice(name="replay", value="replay"),
+            app_commands.Choice(name="analyse", value="analyse"),
+        ]
     )
     async def wallall_command(
-        self, interaction: discord.Interaction, grid: app_commands.Range[str, 1, 600]
+        self,
+        interaction: discord.Interaction,
+        grid: app_commands.Range[str, 1, 600],
+        mode: str = "solve",
     ) -> None:
         cleaned = wall.parse_pattern_input(grid)
         if len(cleaned) != 90:
@@ -42,17 +65,49 @@ class WallAll(commands.Cog):
         await interaction.response.defer()
 
         async def send(result: wall.PatternResult) -> discord.Message:
-            file = wall_stream.pattern_file(result)
+            files = wall_stream.pattern_files(result)
             content = result.content or ""
             if len(content) > 1900:
                 content = content[:1900] + "\n…(truncated)"
-            if file:
-                return await interaction.followup.send(content, file=file)
+            if files:
+                return await interaction.followup.send(content, files=files)
             return await interaction.followup.send(content)
 
+        if mode == "analyse":
+            token = CancelToken()
+            try:
+                result = await asyncio.wait_for(
+                    asyncio.to_thread(wall_analyse.analyse_pattern, cleaned, cancel=token),
+                    timeout=ANALYSE_TIMEOUT_SECONDS,
+                )
+                await send(result)
+            except asyncio.TimeoutError:
+                await interaction.followup.send(
+                    f"Analysis timed out after {ANALYSE_TIMEOUT_SECONDS:.0f}s. Try again later."
+                )
+            except SolveCancelled:
+                await interaction.followup.send("Analysis was cancelled.")
+            except Exception as error:
+                print(f"Error in /wallall analyse: {error}")
+                await interaction.followup.send("Failed to analyse that pattern.")
+            finally:
+                token.cancel()
+            return
+
+        text = wall_textmode.is_text_mode(interaction.user.id, interaction.channel_id)
+        if mode == "replay" and text:
+            await interaction.followup.send(
+                "Text mode is on here, so there's no replay animation: "
+                "you'll get the text board only. `/wall-textmode enabled:False` turns it off.",
+                ephemeral=True,
+            )
         try:
             await wall_stream.stream_pattern_solve(
-                cleaned, send, wall_stream.edit_pattern_message
+                cleaned,
+                send,
+                wall_stream.edit_pattern_message,
+                replay=mode == "replay",
+                text=text,
             )
         except asyncio.TimeoutError:
             await interaction.followup.send(
@@ -62,6 +117,71 @@ class WallAll(commands.Cog):
             print(f"Error in /wallall: {error}")
             await interaction.followup.send("Failed to solve that pattern.")
 
+    @app_commands.command(
+        name="wall-textmode",
+        description="Wall All answers as text boards instead of images (for you or this channel)",
+    )
+    @app_commands.describe(
+        enabled="True: text boards, no images · False: images again",
+        scope="you: your solves anywhere · channel: every solve here (Manage Channels)",
+    )
+    @app_commands.choices(
+        scope=[
+            app_commands.Choice(name="you", value="user"),
+            app_commands.Choice(name="channel", value="channel"),
+        ]
+    )
+    async def wall_textmode_command(
+        self, interaction: discord.Interaction, enabled: bool, scope: str = "user"
+    ) -> None:
+        if scope == "channel":
+            can_manage = (
+                isinstance(interaction.user, discord.Member)
+                and interaction.user.guild_permissions.manage_channels
+            )
+            if interaction.guild and not (can_manage or interaction.user.id == get_owner_id()):
+                await interaction.response.send_message(
+                    "You need the **Manage Channels** permission to set this for the channel.",
+                    ephemeral=True,
+                )
+                return
+            target_id, who = interaction.channel_id, "this channel"
+        else:
+            target_id, who = interaction.user.id, "you"
+        wall_textmode.set_text_mode(scope, target_id, enabled)
+        state = "text boards, no images" if enabled else "images"
+        await interaction.response.send_message(
+            f"Wall All answers for {who}: {state}.", ephemeral=True
+        )
+
+    @app_commands.command(
+        name="wall-telemetry",
+        description="Where /wallall solve time goes: phases, prunes, outcomes (owner only)",
+    )
+    @app_commands.describe(reset="Clear the recorded solves after showing them")
+    async def wall_telemetry_command(
+        self, interaction: discord.Interaction, reset: bool = False
+    ) -> None:
+        if interaction.user.id != get_owner_id():
+            await interaction.response.send_message(
+                "You are not authorized to run this command.",
+                ephemeral=True,
+            )
+            return
+
+        text = wall_telemetry.summary()
+        if len(text) > 1900:
+            text = text[:1900] + "\n…(truncated)"
+        recent = wall_telemetry.recent()
+        kwargs = {}
+        if recent:
+            data = json.dumps(recent, indent=1).encode("utf-8")
+            kwargs["file"] = discord.File(io.BytesIO(data), filename="wall-telemetry.json")
+        if reset:
+            wall_telemetry.reset()
+            text += "\n\n(reset)"
+        await interaction.response.send_message(f"```\n{text}\n```", ephemeral=True, **kwargs)
+
 
 async def setup(bot: commands.Bot):
     await bot.add_cog(WallAll(bot))
@@ -9,10 +9,14 @@ import discord
 from discord import Intents, Message, Object, NotFound, Forbidden, HTTPException, File
 from discord.ext import commands
 from chat import get_response, is_allowed_poi_message
+from chat import ollama as chat_ollama
+from chat import webcache as chat_webcache
+from chat import stream as chat_stream
 import data_management as dm
 import asyncio
 import wall
 import wall.stream as wall_stream
+import wall.textmode as wall_textmode
 from wall import PatternResult
 
 # Load Token
@@ -130,6 +134,7 @@ async def send_message(message: Message, user_message: str, user="Nobody") -> No
                     cleaned,
                     lambda result: wall_stream.send_pattern_message(target, result),
                     wall_stream.edit_pattern_message,
+                    text=wall_textmode.is_text_mode(message.author.id, target.id),
                 )
             except asyncio.TimeoutError:
                 await target.send(
@@ -137,11 +142,15 @@ async def send_message(message: Message, user_message: str, user="Nobody") -> No
                 )
             return
 
-        # Run sync AI / response logic off the event loop so status messages can send
-        response = await asyncio.to_thread(
-            get_response, user_message, user, status_notify
+        # AI replies stream into one message that is edited as it grows.
+        response, streamed = await chat_stream.stream_reply(
+            target,
+            lambda on_partial: get_response(user_message, user, status_notify, on_partial),
         )
-        if isinstance(response, PatternResult):
+        if streamed is not None and isinstance(response, str):
+            print("[PuddingBot]: " + response)
+            await streamed.edit(content=response or "…")
+        elif isinstance(response, PatternResult):
             print("[PuddingBot]: " + response.content)
             if response.png:
                 await target.send(
@@ -466,9 +475,13 @@ async def load_extensions():
 
 # Main entry point
 async def main() -> None:
-    async with bot:
-        await load_extensions()
-        await bot.start(token=TOKEN)
+    try:
+        async with bot:
+            await load_extensions()
+            await bot.start(token=TOKEN)
+    finally:
+        await chat_ollama.close()
+        chat_webcache.save()
 
 if __name__ == '__main__':
     asyncio.run(main())
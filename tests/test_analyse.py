@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+/wallall analyse: every one-cell edit vs a fresh solve of the edited board
+"""
+import os
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import analyse, hamcycle, hampath, hamsat, stringToBoardArray
+from wall.hampath import CancelToken, SolveCancelled
+
+WORKERS = int(os.getenv("ANALYSE_WORKERS", "1"))
+
+# A cycle board with one wall removed: edits keep a cycle, a path or neither.
+PATTERN = "111111121112111211111111111121211211111111111212111112111111121111211211111111112112112111"
+
+
+def _fresh_status(child):
+    if analyse.cycle_coloring_ok(child) and hamcycle.CycleBoard(child).solve():
+        return analyse.CYCLE
+    return analyse.PATH if hampath.has_hamiltonian_path(child) else analyse.NONE
+
+
+def test_statuses_match_fresh_solves():
+    grid = stringToBoardArray(PATTERN)
+    statuses = analyse.analyse_grid(grid, seconds=120, workers=WORKERS)
+    assert analyse.UNKNOWN not in statuses
+    for i, status in enumerate(statuses):
+        assert status == _fresh_status(analyse._toggled(grid, i)), (i, status)
+    assert {analyse.CYCLE, analyse.PATH, analyse.NONE} <= set(statuses)
+
+
+def _stall(cancel):
+    while not cancel.cancelled:
+        time.sleep(0.005)
+    raise SolveCancelled()
+
+
+def test_edit_within_budget():
+    """Cycle, DFS and SAT that all stall still end within one edit's time."""
+    grid = stringToBoardArray(PATTERN)
+    saved = hamcycle.CycleBoard.solve, hampath.has_hamiltonian_path, hamsat.gap_path, hamsat.SAT_ENABLED
+    hamcycle.CycleBoard.solve = lambda self, cancel=None: _stall(cancel)
+    hampath.has_hamiltonian_path = lambda grid, cancel=None: _stall(cancel)
+    hamsat.gap_path = lambda grid, pairs, deadline, cancel=None: (
+        time.sleep(max(0.0, deadline - time.perf_counter())), ("timeout", None))[1]
+    hamsat.SAT_ENABLED = True
+    try:
+        start = time.perf_counter()
+        status = analyse.edit_status(grid, None, True, 0.4)
+        elapsed = time.perf_counter() - start
+    finally:
+        hamcycle.CycleBoard.solve, hampath.has_hamiltonian_path, hamsat.gap_path, hamsat.SAT_ENABLED = saved
+    assert status == analyse.UNKNOWN
+    assert 0.35 < elapsed < 0.6, elapsed
+
+
+def test_cancel():
+    token = CancelToken()
+    token.cancel()
+    try:
+        analyse.analyse_pattern(PATTERN, cancel=token, workers=1)
+    except SolveCancelled:
+        return
+    raise AssertionError("analyse ignored a cancelled token")
+
+
+def test_pattern_result():
+    result = analyse.analyse_pattern(PATTERN, seconds=120, workers=WORKERS)
+    assert result.png and result.png.startswith(b"\x89PNG")
+    assert "keep a cycle" in result.content
+    assert analyse.analyse_pattern("12").png is None
+
+
+def main():
+    print(f"Analysing one-cell edits ({WORKERS} workers) against fresh solves...")
+    test_statuses_match_fresh_solves()
+    print("✅ Every edit matches a fresh solve")
+    test_edit_within_budget()
+    print("✅ Cycle, path and SAT searches share one edit's time")
+    test_cancel()
+    print("✅ Cancelled token stops the analysis")
+    test_pattern_result()
+    print("✅ Heatmap PNG and caption")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Solver benchmark harness (wall.bench): corpus, measurements, regression gates
+"""
+import copy
+import json
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import bench
+
+
+def test_corpus_parses():
+    corpus = bench.load_corpus()
+    names = [name for name, _category, _pattern in corpus]
+    assert len(names) == len(set(names))
+    assert {category for _name, category, _pattern in corpus} == set(bench.CATEGORIES)
+    assert all(set(pattern) <= {"1", "2"} for _name, _category, pattern in corpus)
+
+
+def _quick_report():
+    corpus = {name: (name, category, pattern) for name, category, pattern in bench.load_corpus()}
+    quick = [corpus["s1-i794"], corpus["s0-i268"], corpus["s0-i1"]]
+    return bench.run_bench(quick, seconds=20.0)
+
+
+def test_run_reports_every_field():
+    report = _quick_report()
+    json.dumps(report)
+    assert not bench.check_expected(report)
+    cycle, path, none = (report["patterns"][n] for n in ("s1-i794", "s0-i268", "s0-i1"))
+    assert cycle["status"] == "cycle" and cycle["first_tour_s"] == cycle["proven_s"]
+    assert path["status"] == "path" and path["gap"] == 2
+    assert path["first_tour_s"] <= path["proven_s"] <= path["total_s"]
+    assert none["status"] == "none" and none["first_tour_s"] is None and none["proven_s"]
+    assert path["nodes"] > 0 and none["nodes"] > 0
+    if bench.resource is not None:
+        assert path["peak_rss_kb"] > 0 and path["rss_growth_kb"] >= 0
+
+
+def _entry(**kw):
+    entry = {
+        "category": "path", "status": "path", "gap": 2, "first_tour_s": 0.2,
+        "proven_s": 1.0, "total_s": 1.0, "nodes": 1000,
+    }
+    entry.update(kw)
+    return entry
+
+
+def test_compare_gates():
+    base = {"patterns": {"a": _entry(), "b": _entry(status="none", gap=None)}}
+    same = copy.deepcopy(base)
+    assert bench.compare(base, same) == ([], [])
+
+    slow = copy.deepcopy(base)
+    slow["patterns"]["a"]["proven_s"] = 2.0
+    regressions, _notes = bench.compare(base, slow)
+    assert regressions == ["a: proven_s 1.000s -> 2.000s"]
+
+    noise = copy.deepcopy(base)
+    noise["patterns"]["a"]["first_tour_s"] = 0.24  # +20%, under both gates
+    assert bench.compare(base, noise)[0] == []
+
+    worse = copy.deepcopy(base)
+    worse["patterns"]["a"].update(gap=4, proven_s=None)
+    worse["patterns"]["b"]["status"] = "path"
+    regressions, _notes = bench.compare(base, worse)
+    assert len(regressions) == 2
+
+    faster = copy.deepcopy(base)
+    faster["patterns"]["a"].update(proven_s=0.5, nodes=5000)
+    regressions, notes = bench.compare(base, faster)
+    assert not regressions and len(notes) == 2
+
+
+def main():
+    test_corpus_parses()
+    print("✅ Corpus parses")
+    test_compare_gates()
+    print("✅ Regression gates")
+    report = _quick_report()
+    for name, entry in report["patterns"].items():
+        print(f"  {name}: {entry['status']} first {entry['first_tour_s']} proven {entry['proven_s']}")
+    test_run_reports_every_field()
+    print("✅ Benchmark run reports every field")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Streamed AI replies: Ollama NDJSON chunks and rate-limited Discord edits
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat import gpt, ollama
+from chat import stream as chat_stream
+
+EDIT_SECONDS = 0.3
+
+
+class FakeMessage:
+    def __init__(self, log, content):
+        self.log = log
+        log.append(("send", time.perf_counter(), content))
+
+    async def edit(self, content):
+        self.log.append(("edit", time.perf_counter(), content))
+
+
+class FakeTarget:
+    def __init__(self):
+        self.log = []
+
+    async def send(self, content):
+        return FakeMessage(self.log, content)
+
+
+class ChunkHandler(BaseHTTPRequestHandler):
+    chunks = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert body["stream"] is True
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.end_headers()
+        for chunk in self.chunks:
+            self.wfile.write(json.dumps(chunk).encode() + b"\n")
+            self.wfile.flush()
+
+    def log_message(self, *_args):
+        pass
+
+
+def _serve(chunks):
+    ChunkHandler.chunks = chunks
+    server = HTTPServer(("127.0.0.1", 0), ChunkHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_ollama_chunks_accumulate():
+    words = ["assistant: ", "Hello", " there", "!"]
+    chunks = [{"message": {"role": "assistant", "content": w}, "done": False} for w in words]
+    chunks.append({"message": {"role": "assistant", "content": ""}, "done": True})
+    server = _serve(chunks)
+    saved = gpt.OLLAMA_CHAT_URL
+    gpt.OLLAMA_CHAT_URL = f"http://127.0.0.1:{server.server_port}/api/chat"
+    partials = []
+
+    async def go():
+        try:
+            return await gpt._run_ollama_conversation(
+                [{"role": "user", "content": "hi"}], timeout=5, on_partial=partials.append
+            )
+        finally:
+            await ollama.close()
+
+    try:
+        reply = asyncio.run(go())
+    finally:
+        gpt.OLLAMA_CHAT_URL = saved
+        server.shutdown()
+    assert reply == "Hello there!"
+    assert partials == ["Hello", "Hello there", "Hello there!"]
+
+
+def test_partial_text_is_rate_limited():
+    async def run(on_partial):
+        text = ""
+        for i in range(20):
+            text += f"word{i} "
+            on_partial(text.strip())
+            await asyncio.sleep(0.05)
+        return text.strip()
+
+    async def go():
+        saved = chat_stream.STREAM_EDIT_SECONDS
+        chat_stream.STREAM_EDIT_SECONDS = EDIT_SECONDS
+        target = FakeTarget()
+        start = time.perf_counter()
+        try:
+            result, message = await chat_stream.stream_reply(target, run)
+        finally:
+            chat_stream.STREAM_EDIT_SECONDS = saved
+        return start, target.log, result, message
+
+    start, log, result, message = asyncio.run(go())
+    assert result.endswith("word19") and message is not None
+    assert log[0][0] == "send" and log[0][1] - start < 0.2
+    assert all(kind == "edit" for kind, _t, _c in log[1:])
+    times = [t for _kind, t, _c in log]
+    assert all(b - a >= EDIT_SECONDS - 0.02 for a, b in zip(times, times[1:]))
+    assert len(log) < 20
+
+
+def test_no_message_without_partial_text():
+    async def run(_on_partial):
+        return "4"
+
+    target = FakeTarget()
+    result, message = asyncio.run(chat_stream.stream_reply(target, run))
+    assert result == "4" and message is None and not target.log
+
+
+def main():
+    test_ollama_chunks_accumulate()
+    print("✅ Streamed Ollama chunks build the cleaned reply")
+    test_partial_text_is_rate_limited()
+    print("✅ First text sent at once, later edits rate limited")
+    test_no_message_without_partial_text()
+    print("✅ Non-AI replies send nothing early")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+AI routing: FAQ answers, small talk and prompt-covered questions skip the web
+"""
+import asyncio
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat import faq, gpt
+from chat.responses import clear_context
+
+PROMPT = clear_context()[0]["content"]
+SUFFIX = ", give a short answer but never mention that I asked for a short answer"
+
+CASES = [
+    ("hi", faq.CHAT),
+    ("thanks!", faq.CHAT),
+    ("how do i get runner role", faq.FAQ),
+    ("why are mobile runs banned", faq.FAQ),
+    ("what are the high score modes", faq.FAQ),
+    ("how rare is a ham cycle", faq.FAQ),
+    ("how rare are ham paths compared to ham cycles", faq.LOCAL),
+    ("what is schnippi coil", faq.LOCAL),
+    ("who is spacedoge", faq.LOCAL),
+    ("what is python", faq.WEB),
+    ("latest news on nasa", faq.WEB),
+    ("what is the wr for classic 25", faq.WEB),
+]
+
+# Share a keyword with an FAQ but aren't that question
+NOT_FAQ = [
+    "which modes are the hardest",
+    "what modes do you like",
+    "why is my phone banned",
+    "how do I get the runner role back after losing it",
+]
+
+
+def test_classify():
+    for text, kind in CASES:
+        route = faq.classify(text, PROMPT)
+        assert route.kind == kind, (text, route)
+    for text in NOT_FAQ:
+        assert faq.classify(text, PROMPT).kind != faq.FAQ, text
+    # FAQ facts are the prompt's own lines
+    fact = faq.classify("How do I get the Runner role?", PROMPT).fact
+    assert fact.startswith("If someone asks, to get Runner role") and fact in PROMPT
+    prompt_lines = PROMPT.lower()
+    for entry in faq.FAQ_ENTRIES:
+        assert all(key in prompt_lines for key in entry.facts), entry.name
+    # Without the prompt's facts nothing is FAQ or local
+    assert faq.classify("how do i get runner role", "").kind == faq.WEB
+    assert faq.classify("what is schnippi coil", "").kind == faq.WEB
+
+
+def _chat(text):
+    """chat_with_gpt with the web and Ollama replaced; returns (reply, messages, prefetched)."""
+    seen = {"prefetched": False, "messages": None}
+
+    async def fake_prefetch(_user_text, deadline=None):
+        seen["prefetched"] = True
+        return [{"role": "system", "content": "web results"}]
+
+    async def fake_generate(chat_messages, *_args):
+        seen["messages"] = chat_messages
+        return "model reply"
+
+    saved = gpt.prefetch_web_context, gpt._generate
+    gpt.prefetch_web_context, gpt._generate = fake_prefetch, fake_generate
+    try:
+        messages = clear_context() + [{"role": "user", "content": text + SUFFIX}]
+        reply = asyncio.run(gpt.chat_with_gpt(messages))
+    finally:
+        gpt.prefetch_web_context, gpt._generate = saved
+    return reply, seen["messages"], seen["prefetched"]
+
+
+def test_chat_routes():
+    reply, messages, prefetched = _chat(" how do i get runner role")
+    assert reply == "model reply" and not prefetched
+    assert "verified run on SRC" in messages[-1]["content"]
+
+    for text in NOT_FAQ:
+        reply, messages, prefetched = _chat(" " + text)
+        assert reply == "model reply" and "community question" not in messages[-1]["content"]
+
+    reply, messages, prefetched = _chat(" hey")
+    assert reply == "model reply" and not prefetched
+    assert messages[-1]["content"] == faq.NO_SEARCH_NOTES[faq.CHAT]
+
+    reply, messages, prefetched = _chat(" what is schnippi coil")
+    assert not prefetched and messages[-1]["content"] == faq.NO_SEARCH_NOTES[faq.LOCAL]
+
+    reply, messages, prefetched = _chat(" what is https://example.com about")
+    assert prefetched and messages[-1]["content"] == "web results"
+
+
+def main():
+    test_classify()
+    print("✅ Messages routed to FAQ, small talk, local facts or the web")
+    test_chat_routes()
+    print("✅ FAQs answered by Ollama from the prompt's line; nothing skips the model")
+
+
+if __name__ == "__main__":
+    main()
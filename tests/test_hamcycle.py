@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Differential test: bitboard Ham Cycle solver vs the original Pattern.solve
+"""
+import os
+import random
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wall
+from wall import hamcycle
+
+BOARDS = int(os.getenv("HAMCYCLE_DIFF_BOARDS", "2000"))
+SEED = int(os.getenv("HAMCYCLE_DIFF_SEED", "2024"))
+
+
+def _random_boards(count, seed):
+    """Balanced-coloring new_pattern boards (the ones solve_pattern cycle-checks)."""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        b = wall.new_pattern(10, 9, rng)
+        if wall.darklightcheck(b):
+            boards.append([[2 if cell == 2 else 1 for cell in row] for row in b])
+    return boards
+
+
+def compare_solvers(count=BOARDS, seed=SEED):
+    """Assert identical results; return (cycles, legacy seconds, bitboard seconds)."""
+    cycles = 0
+    legacy_time = bitboard_time = 0.0
+    for grid in _random_boards(count, seed):
+        walls = sum(row.count(2) for row in grid)
+        t0 = time.perf_counter()
+        old = wall.Pattern(10, 9, wmap=[row[:] for row in grid], walls=walls).solve()
+        t1 = time.perf_counter()
+        new = hamcycle.CycleBoard(grid).solve()
+        t2 = time.perf_counter()
+        legacy_time += t1 - t0
+        bitboard_time += t2 - t1
+        assert bool(old) == bool(new), f"verdict differs on {grid}"
+        if old:
+            cycles += 1
+            assert old.wallmap == new.wallmap(), f"wallmap differs on {grid}"
+            assert old.snakemap == new.snakemap(), f"snakemap differs on {grid}"
+            assert hamcycle.solve_cycle(grid) == wall.hampath.tour_from_snakemap(
+                old.wallmap, old.snakemap
+            )
+    return cycles, legacy_time, bitboard_time
+
+
+def test_bitboard_matches_pattern_solve():
+    compare_solvers()
+
+
+def main():
+    print(f"Comparing {BOARDS} random boards (seed {SEED})...")
+    cycles, legacy_time, bitboard_time = compare_solvers()
+    print(f"✅ Identical verdicts and tours ({cycles} Ham Cycles)")
+    print(f"   Pattern.solve: {legacy_time:.2f}s, CycleBoard.solve: {bitboard_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
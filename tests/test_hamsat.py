@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Exact SAT back-end (wall.hamsat) vs brute force and the path DFS
+"""
+import itertools
+import os
+import random
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wall
+from wall import hampath, hamsat
+
+CNF_TRIALS = int(os.getenv("HAMSAT_CNF_TRIALS", "300"))
+BOARDS = int(os.getenv("HAMSAT_BOARDS", "20"))
+SEED = int(os.getenv("HAMSAT_SEED", "5"))
+
+
+def _brute_sat(nvars, clauses):
+    return any(
+        all(any((lit > 0) == bits[abs(lit) - 1] for lit in c) for c in clauses)
+        for bits in itertools.product((False, True), repeat=nvars)
+    )
+
+
+def test_solver_matches_brute_force():
+    rng = random.Random(SEED)
+    for _ in range(CNF_TRIALS):
+        nvars = rng.randint(3, 10)
+        solver = hamsat.Solver()
+        for _ in range(nvars):
+            solver.new_var()
+        clauses = []
+        for _round in range(3):  # incremental: clauses added between solves
+            new = [
+                [rng.choice((1, -1)) * rng.randint(1, nvars) for _ in range(rng.randint(1, 3))]
+                for _ in range(rng.randint(3, 15))
+            ]
+            clauses += new
+            for c in new:
+                solver.add_clause(c)
+            sat = solver.solve()
+            assert sat == _brute_sat(nvars, clauses), clauses
+            if not sat:
+                break
+            assert all(
+                any(solver.value[abs(lit)] == (1 if lit > 0 else -1) for lit in c)
+                for c in clauses
+            )
+
+
+def _small_boards(count, seed):
+    """new_pattern walls cropped to 5x6, so the DFS can be exhaustive."""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        grid = [[2 if cell == 2 else 1 for cell in row] for row in wall.new_pattern(10, 9, rng)]
+        for r in range(9):
+            for c in range(10):
+                if r >= 5 or c >= 6:
+                    grid[r][c] = 2
+        if hampath.coloring_allows_path(grid):
+            boards.append(grid)
+    return boards
+
+
+def test_gap_path_matches_dfs():
+    rng = random.Random(SEED)
+    for grid in _small_boards(BOARDS, SEED):
+        cells = [r * 10 + c for r in range(9) for c in range(10) if grid[r][c] != 2]
+        d = rng.randint(1, 5)
+        pairs = [
+            (a, b)
+            for i, a in enumerate(cells)
+            for b in cells[i + 1 :]
+            if hampath._cell_manhattan(a, b) == d
+        ]
+        status, tour = hamsat.gap_path(grid, pairs)
+        dfs = any(
+            hampath._path_between(grid, a, b, 0, 0.0)
+            or hampath._path_between(grid, b, a, 0, 0.0)
+            for a, b in pairs
+        )
+        assert status == ("found" if dfs else "impossible"), (grid, d, status)
+        if tour:
+            assert hampath.verify_path(grid, tour)
+            assert hampath.path_end_gap(tour) == d
+
+
+# Open board where the DFS alone cannot rule out gaps 3 and 4 within 20 s.
+HARD_BOARD = "111121121112111111211111111111111121111121111111111111111111111111111111111111111111111111"
+
+
+def test_race_proves_what_dfs_cannot():
+    grid = [[int(ch) for ch in HARD_BOARD[r * 10 : (r + 1) * 10]] for r in range(9)]
+    tour = hampath.find_hamiltonian_path(grid, time_limit=5)
+    assert tour
+    dfs = hampath.improve_path_endpoints(grid, tour, time_limit=5)
+    raced = hampath.improve_path_endpoints(grid, tour, time_limit=60, sat=True)
+    assert raced[2], f"race left gap {raced[1]} unproven"
+    assert raced[1] <= dfs[1], (raced[1:], dfs[1:])
+    assert hampath.verify_path(grid, raced[0])
+    assert hampath.path_end_gap(raced[0]) == raced[1]
+
+
+def main():
+    print(f"Checking {CNF_TRIALS} random CNFs against brute force...")
+    test_solver_matches_brute_force()
+    print("✅ Solver agrees with brute force")
+    print(f"Comparing {BOARDS} small boards (seed {SEED}) with the exhaustive DFS...")
+    test_gap_path_matches_dfs()
+    print("✅ gap_path agrees with the DFS")
+    test_race_proves_what_dfs_cannot()
+    print("✅ SAT race proves the closest ends the DFS alone leaves open")
+
+
+if __name__ == "__main__":
+    main()
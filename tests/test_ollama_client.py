@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Async Ollama client: generation queue (limit, short prompts first, positions)
+and one pooled session across requests
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat import ollama
+
+
+def test_queue_limit_and_order():
+    async def go():
+        queue = ollama.GenerationQueue(2)
+        order, positions, running, peak = [], {}, [0], [0]
+        gate = asyncio.Event()
+
+        async def job(name, priority):
+            def on_wait(position):
+                positions[name] = position
+
+            async with queue.slot(priority, on_wait):
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                order.append(name)
+                await gate.wait()
+                running[0] -= 1
+
+        tasks = [asyncio.create_task(job("a", ollama.LONG)), asyncio.create_task(job("b", ollama.LONG))]
+        await asyncio.sleep(0)
+        for name, priority in (("long1", ollama.LONG), ("long2", ollama.LONG), ("short", ollama.SHORT)):
+            tasks.append(asyncio.create_task(job(name, priority)))
+            await asyncio.sleep(0)
+        gate.set()
+        await asyncio.gather(*tasks)
+        return order, positions, peak[0], queue.active
+
+    order, positions, peak, active = asyncio.run(go())
+    assert peak == 2 and active == 0
+    assert order == ["a", "b", "short", "long1", "long2"]
+    assert positions == {"long1": 1, "long2": 2, "short": 1}
+
+
+def test_cancelled_waiter_gives_up_its_place():
+    async def go():
+        queue = ollama.GenerationQueue(1)
+        release = asyncio.Event()
+        served = []
+
+        async def hold():
+            async with queue.slot():
+                await release.wait()
+
+        async def wait(name):
+            async with queue.slot():
+                served.append(name)
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        gone = asyncio.create_task(wait("gone"))
+        kept = asyncio.create_task(wait("kept"))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(holder, kept)
+        return served, queue.active
+
+    served, active = asyncio.run(go())
+    assert served == ["kept"] and active == 0
+
+
+class ReplyHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    clients = set()
+
+    def do_POST(self):
+        json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.clients.add(self.client_address)
+        body = json.dumps({"message": {"role": "assistant", "content": "ok"}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *_args):
+        pass
+
+
+def test_pooled_session_reuses_connections():
+    server = HTTPServer(("127.0.0.1", 0), ReplyHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}/api/chat"
+
+    async def go():
+        try:
+            replies = [await ollama.post_chat(url, {"messages": []}, 5) for _ in range(5)]
+        finally:
+            await ollama.close()
+        return replies
+
+    try:
+        replies = asyncio.run(go())
+    finally:
+        server.shutdown()
+    assert all(r["message"]["content"] == "ok" for r in replies)
+    assert len(ReplyHandler.clients) == 1  # one kept-alive connection
+
+
+def main():
+    test_queue_limit_and_order()
+    print("✅ At most the limit at once; short prompts first, positions reported")
+    test_cancelled_waiter_gives_up_its_place()
+    print("✅ A cancelled waiter leaves the queue")
+    test_pooled_session_reuses_connections()
+    print("✅ Requests share one pooled connection")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Concurrent PathBoard solves: each thread must get its own board's path
+"""
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import hampath
+
+BOARDS = int(os.getenv("PATHBOARD_BOARDS", "40"))
+ROUNDS = int(os.getenv("PATHBOARD_ROUNDS", "5"))
+THREADS = 8
+
+# new_pattern boards (seed 31) that need guessing, not just forced fill.
+PATTERNS = (
+    "211211111111111211111121111212111121111111211121112111211112111111111112112112111111111112",
+    "111211211212111111111112111211111112111111211111212111112111111121111111211112112111121112",
+    "112111121111111211111121111111111121112112111121111111111111111121112112111121111112111112",
+    "112112111211111111111121111121211112111111211112121111211111212111212111111111111112111211",
+    "111112111111121111212111111111111112112111211111111111211111121111211211111111112112112111",
+    "211211121111111211111121111211211121111211111112111212111111111111211112111111211112112111",
+    "111211121111111211112121111211111121111111111121212112111111111112121212121111111111112111",
+    "111121111112111111211111121111212111121111111111111112112112121111111111111212112112111112",
+)
+
+
+def _solve(grid):
+    win = hampath.PathBoard(grid).solve(time_limit=0)
+    return win.path_cells() if win else None
+
+
+def _rectangle(top, left, height, width):
+    grid = [[2] * 10 for _ in range(9)]
+    for r in range(top, top + height):
+        for c in range(left, left + width):
+            grid[r][c] = 1
+    return grid
+
+
+def _solvable_boards(count):
+    """Quickly solved boards with their sequential paths."""
+    boards = []
+    for pattern in PATTERNS:
+        grid = [[int(ch) for ch in pattern[r * 10 : (r + 1) * 10]] for r in range(9)]
+        boards.append((grid, _solve(grid)))
+    for height in range(2, 5):
+        for width in range(2, 7):
+            for top, left in ((0, 0), (9 - height, 10 - width), (2, 3)):
+                grid = _rectangle(top, left, height, width)
+                path = _solve(grid)
+                if path and hampath.verify_path(grid, path):
+                    boards.append((grid, path))
+    return boards[:count]
+
+
+def test_concurrent_solves_keep_their_own_results():
+    boards = _solvable_boards(BOARDS)
+    grids = [grid for grid, _ in boards] * ROUNDS
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-5)  # interleave the solver threads aggressively
+    try:
+        with ThreadPoolExecutor(max_workers=THREADS) as pool:
+            paths = list(pool.map(_solve, grids))
+    finally:
+        sys.setswitchinterval(interval)
+    for grid, path in zip(grids, paths):
+        expected = boards[grids.index(grid)][1]
+        assert path == expected, f"concurrent solve returned another board's path on {grid}"
+        assert hampath.verify_path(grid, path)
+
+
+def main():
+    print(f"Solving up to {BOARDS} boards x {ROUNDS} rounds on {THREADS} threads...")
+    test_concurrent_solves_keep_their_own_results()
+    print("✅ Every concurrent solve returned its own board's path")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Parallel closest-ends search (wall.pathpool) vs the sequential search
+"""
+import os
+import random
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wall
+from wall import hampath, pathpool
+
+BOARDS = int(os.getenv("PATHPOOL_BOARDS", "3"))
+SEED = int(os.getenv("PATHPOOL_SEED", "7"))
+WORKERS = 2
+
+
+def _path_boards(count, seed):
+    """new_pattern boards that have a covering path, with a first tour each."""
+    rng = random.Random(seed)
+    boards = []
+    while len(boards) < count:
+        b = wall.new_pattern(10, 9, rng)
+        grid = [[2 if cell == 2 else 1 for cell in row] for row in b]
+        if not hampath.coloring_allows_path(grid) or hampath._early_impossible(grid):
+            continue
+        tour = hampath.find_hamiltonian_path(grid, time_limit=5)
+        if tour:
+            boards.append((grid, tour))
+    return boards
+
+
+def test_parallel_matches_sequential():
+    for grid, tour in _path_boards(BOARDS, SEED):
+        seq = hampath.improve_path_endpoints(grid, tour, time_limit=30)
+        par = hampath.improve_path_endpoints(grid, tour, time_limit=30, workers=WORKERS)
+        assert seq[1:] == par[1:], f"gap/proof differs on {grid}: {seq[1:]} vs {par[1:]}"
+        assert hampath.verify_path(grid, par[0])
+        assert hampath.path_end_gap(par[0]) == par[1]
+
+        found = hampath.find_hamiltonian_path(grid, time_limit=5, workers=WORKERS)
+        assert found and hampath.verify_path(grid, found)
+
+
+def test_parallel_cancel():
+    grid = [[1] * 10 for _ in range(9)]
+    stopped = hampath.CancelToken()
+    stopped.cancel()
+    try:
+        hampath._exhaustive_ham_path(grid, cancel=stopped, workers=WORKERS)
+    except hampath.SolveCancelled:
+        pass
+    else:
+        raise AssertionError("cancelled parallel search should raise SolveCancelled")
+
+
+def test_shared_pool_reused():
+    pool = pathpool.shared_pool(WORKERS)
+    assert pathpool.shared_pool(1) is pool and pathpool.shared_pool(WORKERS) is pool
+    _won, first = pool.race(os.getpid, [()] * 4, lambda _pid: False)
+    _won, again = pathpool.shared_pool(WORKERS).race(os.getpid, [()] * 4, lambda _pid: False)
+    # Same worker processes: start-up is paid once, not per search
+    assert len(set(first) | set(again)) <= WORKERS
+
+
+def test_flag_rearmed_only_after_batch_ends():
+    pool = pathpool.shared_pool(WORKERS)
+    pool.race(os.getpid, [()] * WORKERS * 2, lambda _pid: False)  # workers up
+    free = len(pool._free)
+    saved = pathpool._UNWIND_SECONDS
+    pathpool._UNWIND_SECONDS = 0.05
+    try:
+        # The sleeps start, then outlive the deadline and the bounded unwind wait.
+        deadline = time.perf_counter() + 0.5
+        pool.race(time.sleep, [(2.0,)] * WORKERS, lambda _r: False, deadline)
+    finally:
+        pathpool._UNWIND_SECONDS = saved
+    busy = [slot for slot in range(pathpool._SLOTS) if slot not in pool._free]
+    assert len(busy) == 1 and pool._flags[busy[0]] == 1  # still stopping
+    end = time.perf_counter() + 10
+    while len(pool._free) < free and time.perf_counter() < end:
+        time.sleep(0.05)
+    assert len(pool._free) == free and not any(pool._flags[:])
+
+
+def main():
+    print(f"Comparing {BOARDS} path boards (seed {SEED}) on {WORKERS} workers...")
+    test_parallel_matches_sequential()
+    print("✅ Same gaps and proofs as the sequential search")
+    test_parallel_cancel()
+    print("✅ Cancel stops the worker pool")
+    test_shared_pool_reused()
+    print("✅ One shared pool, same workers across searches")
+    test_flag_rearmed_only_after_batch_ends()
+    print("✅ Stop flag re-armed only once its batch has finished")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+AI web context: link fetches and search run together under one deadline
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat import gpt, ollama, webcache
+
+DELAY = 0.3
+
+
+def _fake_web(delays):
+    """Stand-ins for web_fetch/web_search that sleep per URL or query.
+
+    cancelled collects the URLs / queries whose request was aborted.
+    """
+    calls = []
+    cancelled = []
+
+    async def wait(key):
+        calls.append(key)
+        try:
+            await asyncio.sleep(delays.get(key, DELAY))
+        except asyncio.CancelledError:
+            cancelled.append(key)
+            raise
+
+    async def fetch(url):
+        await wait(url)
+        return f"Content from {url}"
+
+    async def search(query, max_results=5):
+        await wait(query)
+        return f"Search results for: {query}\n1. Top\n   https://top.example/page\n   snippet"
+
+    return fetch, search, calls, cancelled
+
+
+def _prefetch(text, delays, deadline):
+    fetch, search, calls, cancelled = _fake_web(delays)
+    saved = gpt.web_fetch, gpt.web_search
+    gpt.web_fetch, gpt.web_search = fetch, search
+
+    async def timed():
+        start = time.perf_counter()
+        context = await gpt.prefetch_web_context(text, deadline=deadline)
+        return context, time.perf_counter() - start
+
+    try:
+        context, elapsed = asyncio.run(timed())
+        return context, calls, cancelled, elapsed
+    finally:
+        gpt.web_fetch, gpt.web_search = saved
+
+
+def test_fetches_run_concurrently():
+    text = "compare https://a.example/x and https://b.example/y."
+    context, calls, cancelled, elapsed = _prefetch(text, {}, deadline=5)
+    # Links and search overlap; only the top-result fetch waits on the search.
+    assert elapsed < 3 * DELAY, elapsed
+    assert "https://b.example/y" in calls and "https://top.example/page" in calls
+    assert not cancelled
+    contents = [m["content"] for m in context]
+    assert len(contents) == 4
+    assert "a.example" in contents[0] and "b.example" in contents[1]
+    assert "Live web search results" in contents[2]
+    assert contents[3].startswith("Top search result page content")
+
+
+def test_deadline_drops_stragglers():
+    text = "what is https://slow.example/"
+    context, _calls, cancelled, elapsed = _prefetch(
+        text, {"https://slow.example/": 2.0, "https://top.example/page": 2.0}, deadline=DELAY * 2
+    )
+    assert elapsed < 1.5, elapsed
+    # Aborted, not left running in the background
+    assert sorted(cancelled) == ["https://slow.example/", "https://top.example/page"]
+    contents = [m["content"] for m in context]
+    assert len(contents) == 1 and "Live web search results" in contents[0]
+
+
+class PageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == "/slow":
+            time.sleep(2.0)
+        body = b"<html><body><script>x()</script><p>Pudding &amp; snakes</p></body></html>"
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass  # the client gave up
+
+    def log_message(self, *_args):
+        pass
+
+
+def test_fetch_on_the_pooled_session():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PageHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    webcache.PAGES.clear()
+
+    async def go():
+        try:
+            page = await gpt.web_fetch(f"{base}/page")
+            start = time.perf_counter()
+            try:
+                await asyncio.wait_for(gpt.web_fetch(f"{base}/slow"), timeout=0.2)
+            except asyncio.TimeoutError:
+                pass
+            return page, time.perf_counter() - start
+        finally:
+            await ollama.close()
+
+    try:
+        page, aborted_after = asyncio.run(go())
+    finally:
+        server.shutdown()
+        webcache.PAGES.clear()
+    assert page == f"Content from {base}/page:\nPudding & snakes"
+    assert aborted_after < 1.0, aborted_after
+
+
+def main():
+    test_fetches_run_concurrently()
+    print("✅ Links, search and top result fetched concurrently, injected in order")
+    test_deadline_drops_stragglers()
+    print("✅ Deadline keeps what finished and cancels the rest")
+    test_fetch_on_the_pooled_session()
+    print("✅ Pages fetched on the pooled session; a cancelled fetch returns at once")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Board PNGs: cached frame/wall layers, snake drawn per call
+"""
+import io
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image
+
+from wall import stringToBoardArray, wall_render as render
+
+PATTERN = "111111121112111211111111111121211211111111111212111112111111121111211211111111112112112111"
+
+# Row 7 is the only wall-free row of PATTERN.
+TOUR = [(7, c) for c in range(10)]
+
+
+def _open(png):
+    return Image.open(io.BytesIO(png)).convert("RGB")
+
+
+def test_layers_are_cached_and_untouched():
+    render._wall_layer.cache_clear()
+    grid = stringToBoardArray(PATTERN)
+    walls = render._wall_mask(grid)
+    empty = render._wall_layer(walls, 0, render.SCALE).tobytes()
+    render.render_board_png(grid, TOUR, caption="first")
+    render.render_board_png(grid, TOUR[:5], caption="second")
+    info = render._wall_layer.cache_info()
+    assert info.misses == 2 and info.hits >= 1, info
+    assert render._wall_layer(walls, 0, render.SCALE).tobytes() == empty
+
+
+def test_walls_and_snake_drawn():
+    grid = stringToBoardArray(PATTERN)
+    bare = _open(render.render_board_png(grid))
+    snake = _open(render.render_board_png(grid, TOUR))
+    inner = (render.PAD + render.FRAME) // render.SCALE
+    cell = render.BASE_CELL
+    wall_r, wall_c = next(
+        (r, c) for r in range(9) for c in range(10) if grid[r][c] == 2
+    )
+    centre = lambda r, c: (inner + c * cell + cell // 2, inner + r * cell + cell // 2)
+    assert bare.getpixel(centre(wall_r, wall_c)) == render.WALL
+    assert bare.getpixel(centre(7, 3)) != snake.getpixel(centre(7, 3))
+    assert bare.getpixel(centre(2, 3)) == snake.getpixel(centre(2, 3))
+
+
+def test_fast_profile():
+    grid = stringToBoardArray(PATTERN)
+    final = render.render_board_png(grid, TOUR, caption="gap 9")
+    fast = render.render_board_png(grid, TOUR, caption="gap 9", profile=render.FAST)
+    assert _open(fast).size == _open(final).size
+    assert Image.open(io.BytesIO(fast)).mode == "P"
+    assert len(fast) < len(final)
+    report = render.bench_profiles(repeat=2)
+    assert set(report) == set(render.PROFILES)
+    assert report["fast"]["bytes"] < report["final"]["bytes"]
+
+
+def test_replay_gif():
+    grid = stringToBoardArray(PATTERN)
+    gif = render.render_replay_gif(grid, TOUR, caption="gap 9")
+    img = Image.open(io.BytesIO(gif))
+    assert img.format == "GIF" and img.n_frames == len(TOUR)  # 9 steps + head
+    assert img.size == _open(render.render_board_png(grid, TOUR, caption="gap 9")).size
+    few = Image.open(io.BytesIO(render.render_replay_gif(grid, TOUR, max_frames=3)))
+    assert few.n_frames == 4
+    assert render.render_replay_gif(grid, TOUR, max_bytes=100) is None
+    assert render.render_replay_gif(grid, []) is None
+
+
+def main():
+    test_layers_are_cached_and_untouched()
+    print("✅ Wall layers cached by mask and never mutated")
+    test_walls_and_snake_drawn()
+    print("✅ Walls from the cache, snake only where the tour is")
+    test_fast_profile()
+    print("✅ Fast profile: same size, palette PNG, fewer bytes")
+    test_replay_gif()
+    print("✅ Replay GIF within its frame and byte budgets")
+
+
+if __name__ == "__main__":
+    main()
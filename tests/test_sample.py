@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Seeded random-pattern sampler (wall.sample): reproducible boards, rates, fan-out
+"""
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import analyse, hamcycle, hampath, sample
+from wall.hampath import CancelToken, SolveCancelled
+
+N = int(os.getenv("SAMPLE_TEST_N", "40"))
+SEED = int(os.getenv("SAMPLE_TEST_SEED", "3"))
+WORKERS = int(os.getenv("SAMPLE_TEST_WORKERS", "2"))
+
+
+def test_boards_are_reproducible():
+    first = [sample.sample_grid(SEED, i) for i in range(N)]
+    assert first == [sample.sample_grid(SEED, i) for i in range(N)]
+    assert first != [sample.sample_grid(SEED + 1, i) for i in range(N)]
+    assert len({str(g) for g in first}) == N
+
+
+def test_wilson_interval():
+    assert sample.wilson(0, 0) == (0.0, 1.0)
+    low, high = sample.wilson(0, 50)
+    assert low == 0.0 and 0.0 < high < 0.1
+    low, high = sample.wilson(25, 50)
+    assert abs((low + high) / 2 - 0.5) < 1e-9 and low < 0.5 < high
+
+
+def _checked_stats():
+    stats = sample.SampleStats(SEED)
+    for i in range(N):
+        result = sample._sample_job(SEED, i, 30.0)
+        grid = sample.sample_grid(SEED, i)
+        if analyse.cycle_coloring_ok(grid) and hamcycle.solve_cycle(grid):
+            expected = sample.CYCLE
+        elif hampath.has_hamiltonian_path(grid):
+            expected = sample.PATH
+        else:
+            expected = sample.NONE
+        assert result.status == expected, (i, result.status, expected)
+        stats.add(result)
+    assert stats.n == N and sum(stats.counts.values()) == N
+    assert [s.seconds for s in stats.slowest()] == sorted(
+        (t for ts in stats.times.values() for t in ts), reverse=True
+    )[: sample.SLOWEST]
+    return stats
+
+
+def test_statuses_match_fresh_solves():
+    _checked_stats()
+
+
+def test_workers_fold_every_sample():
+    updates = []
+    stats = sample.sample(N, SEED, 30.0, workers=WORKERS, on_update=updates.append)
+    assert stats.n == N and updates and updates[-1] is stats
+    assert stats.counts[sample.UNKNOWN] == 0
+    sequential = sample.sample(N, SEED, 30.0, workers=1)
+    assert stats.counts == sequential.counts
+
+
+def test_cancel():
+    token = CancelToken()
+    token.cancel()
+    try:
+        sample.sample(N, SEED, workers=1, cancel=token)
+    except SolveCancelled:
+        return
+    raise AssertionError("sampler ignored a cancelled token")
+
+
+def main():
+    test_boards_are_reproducible()
+    test_wilson_interval()
+    print("✅ Seeded boards and Wilson intervals")
+    print(f"Classifying {N} patterns (seed {SEED}) against fresh solves...")
+    stats = _checked_stats()
+    print(stats.summary())
+    print("✅ Statuses match fresh solves")
+    test_workers_fold_every_sample()
+    print(f"✅ {WORKERS} workers give the same counts")
+    test_cancel()
+    print("✅ Cancelled token stops the sampler")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Live progress edits in wall.stream: placeholder, rate limit, clean-up
+"""
+import asyncio
+import os
+import sys
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import bench, stream
+from wall.hampath import CancelToken, SolveCancelled, current_progress
+
+# Shorter than production so the test stays quick; ratios are what matter.
+PROGRESS_DELAY = 0.5
+PROGRESS_EDIT_SECONDS = 1.0
+
+
+class FakeMessage:
+    def __init__(self, log, content):
+        self.log = log
+        self.deleted = False
+        log.append(("send", time.perf_counter(), content))
+
+    async def delete(self):
+        self.deleted = True
+        self.log.append(("delete", time.perf_counter(), None))
+
+
+def _pattern(name):
+    return {n: p for n, _category, p in bench.load_corpus()}[name]
+
+
+async def _run(pattern, stop_after=0.0):
+    log = []
+    messages = []
+
+    async def send(result):
+        messages.append(FakeMessage(log, result.content))
+        return messages[-1]
+
+    async def edit(message, result):
+        log.append(("edit", time.perf_counter(), result.content))
+
+    async def edit_text(message, content):
+        log.append(("text", time.perf_counter(), content))
+
+    cancel = CancelToken()
+    if stop_after:
+        asyncio.get_running_loop().call_later(stop_after, cancel.cancel)
+    saved = stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS
+    stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS = PROGRESS_DELAY, PROGRESS_EDIT_SECONDS
+    error = None
+    try:
+        await stream.stream_pattern_solve(
+            pattern, send, edit, cancel=cancel, edit_text=edit_text
+        )
+    except asyncio.TimeoutError as exc:
+        error = exc
+    finally:
+        stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS = saved
+    return log, messages, error
+
+
+def test_fast_solve_has_no_progress():
+    log, messages, error = asyncio.run(_run(_pattern("s1-i794")))
+    assert error is None and len(messages) == 1
+    assert [kind for kind, _t, _c in log] == ["send"]
+    assert log[0][2].startswith("Ham Cycle")
+
+
+def test_slow_solve_edits_a_placeholder():
+    log, messages, error = asyncio.run(_run(_pattern("s0-i150")))
+    assert error is None and len(messages) == 1 and not messages[0].deleted
+    kinds = [kind for kind, _t, _c in log]
+    assert kinds[0] == "send" and log[0][2].startswith("Solving… · ")
+    assert "text" in kinds and kinds[-1] == "edit"
+    assert log[-1][2].startswith("No Ham Cycle or Ham Path")
+    times = [t for _kind, t, _c in log]
+    gaps = [b - a for a, b in zip(times, times[1:-1])]
+    assert all(gap >= PROGRESS_EDIT_SECONDS - 0.05 for gap in gaps), gaps
+
+
+def test_progress_line_under_a_result():
+    # open-6 shows a path at once, then searches closer ends for long
+    log, _messages, error = asyncio.run(_run(_pattern("open-6"), stop_after=5.0))
+    assert error is None
+    texts = [c for kind, _t, c in log if kind == "text"]
+    assert any("gap" in c and "\n-# ⏳ " in c for c in texts)
+
+
+def test_placeholder_removed_on_timeout():
+    first = stream.FIRST_SOLVE_TIMEOUT
+    stream.FIRST_SOLVE_TIMEOUT = 3
+    try:
+        log, messages, error = asyncio.run(_run(_pattern("s0-i100")))
+    finally:
+        stream.FIRST_SOLVE_TIMEOUT = first
+    assert isinstance(error, asyncio.TimeoutError)
+    assert len(messages) == 1 and messages[0].deleted
+    assert log[-1][0] == "delete"
+
+
+def test_only_shown_results_are_rendered():
+    # A slow Discord edit lets open-6's improvements pile up behind it.
+    shown = []
+    updates = [0]
+    profiles = []
+    solve, render = stream.solve_pattern, stream.render_result
+
+    def counting_solve(pattern, on_update, **kwargs):
+        def counted(result):
+            assert result.png is None
+            updates[0] += 1
+            on_update(result)
+
+        return solve(pattern, on_update=counted, **kwargs)
+
+    def counting_render(result, profile, replay):
+        profiles.append(profile)
+        return render(result, profile, replay)
+
+    async def send(result):
+        shown.append(result)
+        return FakeMessage([], result.content)
+
+    async def edit(message, result):
+        shown.append(result)
+        await asyncio.sleep(1.0)
+
+    async def edit_text(message, content):
+        pass
+
+    async def run():
+        cancel = CancelToken()
+        asyncio.get_running_loop().call_later(5.0, cancel.cancel)
+        await stream.stream_pattern_solve(
+            _pattern("open-6"), send, edit, cancel=cancel, edit_text=edit_text
+        )
+
+    stream.solve_pattern, stream.render_result = counting_solve, counting_render
+    try:
+        asyncio.run(run())
+    finally:
+        stream.solve_pattern, stream.render_result = solve, render
+    assert shown and all(result.png.startswith(b"\x89PNG") for result in shown)
+    # At most one extra render: the last interim board redrawn as the answer
+    assert len(profiles) == len(shown) <= updates[0] + 1
+    # open-6's first path is unproven and the search is still running
+    assert profiles[0] is stream.wall_render.INTERIM_PROFILE
+    assert profiles[-1] is stream.wall_render.FINAL
+
+
+def test_replay_on_the_final_result():
+    shown = []
+
+    async def send(result):
+        shown.append(result)
+        return FakeMessage([], result.content)
+
+    async def edit(message, result):
+        shown.append(result)
+
+    asyncio.run(
+        stream.stream_pattern_solve(_pattern("s1-i794"), send, edit, replay=True)
+    )
+    assert len(shown) == 1 and shown[0].gif.startswith(b"GIF89a")
+    files = stream.pattern_files(shown[0])
+    assert [f.filename.rsplit(".", 1)[1] for f in files] == ["png", "gif"]
+
+
+def _stub_solve(grid, tours, lag):
+    """solve_pattern stand-in: unproven paths, still searching except the last."""
+    from wall import PatternResult
+
+    def solve(pattern, on_update, cancel, **kwargs):
+        for i, tour in enumerate(tours):
+            searching = i < len(tours) - 1
+            result = PatternResult(
+                f"Ham Path {i} · searching closer…" if searching else f"Ham Path {i}",
+                kind="path", gap=9, searching=searching, min_gap=1,
+            )
+            result.grid, result.tour = grid, tour
+            on_update(result)
+            time.sleep(lag)
+            if cancel.cancelled:
+                raise SolveCancelled()
+        return result
+
+    return solve
+
+
+def _run_stub(tours, lag, stop_after=0.0, replay=True):
+    from wall import stringToBoardArray
+
+    calls = []
+    shown = []
+    solve, render = stream.solve_pattern, stream.render_result
+    grid = stringToBoardArray(_pattern("open-6"))
+
+    def counting_render(result, profile, replay):
+        calls.append((profile, replay))
+        return render(result, profile, replay)
+
+    async def send(result):
+        shown.append(result)
+        return FakeMessage([], result.content)
+
+    async def edit(message, result):
+        shown.append(result)
+
+    async def run():
+        cancel = CancelToken()
+        if stop_after:
+            asyncio.get_running_loop().call_later(stop_after, cancel.cancel)
+        await stream.stream_pattern_solve(
+            "x" * 90, send, edit, cancel=cancel, edit_text=edit, replay=replay
+        )
+
+    stream.solve_pattern = _stub_solve(grid, tours, lag)
+    stream.render_result = counting_render
+    try:
+        asyncio.run(run())
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        stream.solve_pattern, stream.render_result = solve, render
+    return calls, shown
+
+
+def test_unproven_final_result_is_final():
+    # The final answer after an improve timeout is unproven, and the worker
+    # lags before the end marker: it must still get the final render.
+    tour = [(7, c) for c in range(10)]
+    calls, shown = _run_stub([tour], lag=0.05)
+    assert calls == [(stream.wall_render.FINAL, True)]
+    assert shown[-1].gif.startswith(b"GIF89a")
+
+
+def test_interim_board_redrawn_when_search_stops():
+    tour = [(7, c) for c in range(10)]
+    saved = stream.IMPROVE_WAIT_TIMEOUT
+    stream.IMPROVE_WAIT_TIMEOUT = 0.2
+    try:
+        # The second (last) result never arrives before the wait runs out.
+        calls, shown = _run_stub([tour, tour], lag=1.0)
+    finally:
+        stream.IMPROVE_WAIT_TIMEOUT = saved
+    assert calls[0] == (stream.wall_render.INTERIM_PROFILE, False)
+    assert calls[-1] == (stream.wall_render.FINAL, True)
+    assert shown[-1].png.startswith(b"\x89PNG") and shown[-1].gif
+    assert shown[-1].content.startswith("Ham Path · gap 9 · not proven closest (min 1)")
+    assert "searching" not in shown[-1].content and not shown[-1].searching
+
+
+def test_replay_too_large_is_reported():
+    tour = [(7, c) for c in range(10)]
+    saved = stream.wall_render.render_replay_gif
+    stream.wall_render.render_replay_gif = lambda *args, **kwargs: None  # over budget
+    try:
+        _calls, shown = _run_stub([tour], lag=0.0)
+    finally:
+        stream.wall_render.render_replay_gif = saved
+    assert shown[-1].gif is None and shown[-1].content.endswith(stream.REPLAY_SKIPPED)
+
+
+def test_progress_errors_do_not_hide_the_result():
+    from wall import stringToBoardArray
+
+    tour = [(7, c) for c in range(10)]
+    inner = _stub_solve(stringToBoardArray(_pattern("open-6")), [tour, tour], lag=0.5)
+    solve = stream.solve_pattern
+    shown = []
+
+    def phased_solve(pattern, on_update, **kwargs):
+        current_progress().set_phase("stub search")
+        return inner(pattern, on_update, **kwargs)
+
+    async def send(result):
+        if result.content.startswith("Solving…"):
+            raise RuntimeError("placeholder: not an HTTPException")
+        shown.append(result)
+        return FakeMessage([], result.content)
+
+    async def edit(message, result):
+        shown.append(result)
+
+    async def broken_edit_text(message, content):
+        raise RuntimeError("progress edit: not an HTTPException")
+
+    saved = stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS
+    stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS = 0.05, 0.05
+    stream.solve_pattern = phased_solve
+    try:
+        asyncio.run(stream.stream_pattern_solve("x" * 90, send, edit, edit_text=broken_edit_text))
+    finally:
+        stream.solve_pattern = solve
+        stream.PROGRESS_DELAY, stream.PROGRESS_EDIT_SECONDS = saved
+    assert shown[-1].content == "Ham Path 1"
+
+
+def main():
+    test_fast_solve_has_no_progress()
+    print("✅ Fast solve: one message, no progress")
+    test_slow_solve_edits_a_placeholder()
+    print("✅ Slow solve: placeholder edited at the rate limit, then the answer")
+    test_progress_line_under_a_result()
+    print("✅ Progress line under the current best path")
+    test_placeholder_removed_on_timeout()
+    print("✅ Timeout removes the placeholder")
+    test_only_shown_results_are_rendered()
+    print("✅ Only the results that get shown are rendered")
+    test_replay_on_the_final_result()
+    print("✅ Replay GIF attached to the final result")
+    test_unproven_final_result_is_final()
+    print("✅ Unproven last result drawn with the final profile, whatever the timing")
+    test_interim_board_redrawn_when_search_stops()
+    print("✅ Interim board redrawn as the answer when the search stops")
+    test_replay_too_large_is_reported()
+    print("✅ Skipped replay noted in the caption")
+    test_progress_errors_do_not_hide_the_result()
+    print("✅ A failing progress edit doesn't hide the answer")
+
+
+if __name__ == "__main__":
+    main()
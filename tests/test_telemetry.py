@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Structured solver telemetry (wall.telemetry) recorded by wall.stream solves
+"""
+import asyncio
+import os
+import sys
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from wall import bench, hampath, stream, telemetry
+
+
+def _corpus(*names):
+    corpus = {name: pattern for name, _category, pattern in bench.load_corpus()}
+    return [corpus[name] for name in names]
+
+
+async def _stream(pattern):
+    sent = []
+
+    async def send(result):
+        sent.append(result)
+        return object()
+
+    async def edit(_message, result):
+        sent.append(result)
+
+    await stream.stream_pattern_solve(pattern, send, edit)
+    return sent
+
+
+def test_stream_solves_are_recorded():
+    telemetry.reset()
+    for pattern in _corpus("s1-i794", "s0-i40", "s0-i1"):
+        asyncio.run(_stream(pattern))
+    records = telemetry.recent()
+    assert [r["outcome"] for r in records] == ["cycle", "path (closest)", "none"]
+    cycle, path, none = records
+    assert [p[0] for p in cycle["phases"]] == ["cycle search"]
+    assert path["improvements"] and path["improvements"][-1][1] == path["gap"]
+    assert any(name.startswith("rotate endpoints") for name, _s, _t in path["phases"])
+    assert none["nodes"] > 0 and any(rule.startswith("dfs ") for rule in none["prunes"])
+    for record in records:
+        assert abs(sum(t for _p, _s, t in record["phases"]) - record["seconds"]) < 0.05
+        assert sum(s for _p, s, _t in record["phases"]) == record["nodes"]
+
+    text = telemetry.summary()
+    assert text.startswith("3 solves") and "Phases by total time:" in text
+    telemetry.reset()
+    assert telemetry.summary() == "No solves recorded yet." and not telemetry.recent()
+
+
+def test_early_prunes_are_named():
+    grid = [[1] * hampath.WIDTH for _ in range(hampath.HEIGHT)]
+    grid[0][1] = grid[1][0] = hampath.WALL  # corner cell cut off
+    with hampath.progress_scope(lambda _line: None) as prog:
+        assert hampath._early_impossible(grid)
+    assert prog.prunes == {"early isolated cell": 1}
+
+
+def test_histogram_buckets():
+    hist = telemetry.Histogram()
+    for value in (0.005, 0.02, 0.02, 5.0, 500.0):
+        hist.add(value)
+    assert hist.counts[0] == 1 and hist.counts[1] == 2 and hist.counts[-1] == 1
+    assert len(hist.lines()) == 4
+
+
+def main():
+    test_histogram_buckets()
+    test_early_prunes_are_named()
+    print("✅ Histograms and named prunes")
+    telemetry.reset()
+    for pattern in _corpus("s1-i794", "s0-i40", "s0-i1"):
+        asyncio.run(_stream(pattern))
+    print(telemetry.summary())
+    test_stream_solves_are_recorded()
+    print("✅ Stream solves recorded per phase")
+
+
+if __name__ == "__main__":
+    main()
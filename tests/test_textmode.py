@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Text-only Wall All answers: box-drawing boards, no PNG, per user/channel opt-in
+"""
+import os
+import sys
+import tempfile
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wall
+from wall import bench, textmode
+
+
+def _pattern(name):
+    return {n: p for n, _category, p in bench.load_corpus()}[name]
+
+
+def _no_render(*_args, **_kwargs):
+    raise AssertionError("text mode rendered a PNG")
+
+
+def test_text_board_pieces():
+    grid = [[1] * 10 for _ in range(9)]
+    grid[0][2] = 2
+    board = wall.text_board(grid, [(0, 0), (0, 1), (1, 1), (1, 2)]).splitlines()
+    assert board[0] == board[-1] == "+----------+"
+    assert board[1] == "|╞╗#.......|"
+    assert board[2] == "|.╚╡.......|"
+    loop = wall.text_board(grid, [(2, 0), (2, 1), (3, 1), (3, 0)], is_cycle=True)
+    assert loop.splitlines()[3:5] == ["|╔╗........|", "|╚╝........|"]
+
+
+def test_text_solve_skips_rendering():
+    saved = wall.wall_render.render_board_png
+    wall.wall_render.render_board_png = _no_render
+    updates = []
+    try:
+        cycle = wall.solve_pattern(_pattern("s1-i794"), text=True)
+        path = wall.solve_pattern(_pattern("s0-i40"), on_update=updates.append, text=True)
+    finally:
+        wall.wall_render.render_board_png = saved
+    for result in [cycle, path] + updates:
+        assert result.png is None and result.grid is None
+        assert "\n```\n+----------+\n" in result.content and result.content.endswith("```")
+    assert cycle.kind == "cycle" and "═" in cycle.content
+    assert path.kind == "path" and updates[-1].content == path.content
+
+
+def test_opt_in_state():
+    saved = textmode.STATE_PATH, textmode._state
+    with tempfile.TemporaryDirectory() as tmp:
+        textmode.STATE_PATH = os.path.join(tmp, "wall_text_mode.json")
+        textmode._state = None
+        try:
+            assert not textmode.is_text_mode(1, 10)
+            textmode.set_text_mode("user", 1, True)
+            textmode.set_text_mode("channel", 20, True)
+            textmode._state = None  # read back from disk
+            assert textmode.is_text_mode(1, 10) and textmode.is_text_mode(2, 20)
+            assert not textmode.is_text_mode(2, 10)
+            textmode.set_text_mode("user", 1, False)
+            assert not textmode.is_text_mode(1, 10)
+        finally:
+            textmode.STATE_PATH, textmode._state = saved
+
+
+def main():
+    test_text_board_pieces()
+    print("✅ Box-drawing pieces for paths and cycles")
+    test_text_solve_skips_rendering()
+    print("✅ Text solves put the board in the caption and never render")
+    test_opt_in_state()
+    print("✅ Per-user and per-channel opt-in survives a reload")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Web cache: normalized keys, TTL expiry, size caps, persistence, hit rate
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+
+# Add repo root to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chat import gpt, webcache
+
+
+def test_keys_normalized():
+    assert webcache.query_key("  What is  Google Snake?? ") == webcache.query_key("what is google snake")
+    assert webcache.query_key("snake", 5) != webcache.query_key("snake", 3)
+    same = (
+        "HTTPS://Example.com:443/wiki/Snake/?b=2&a=1&utm_source=x#top",
+        "https://example.com/wiki/Snake?a=1&b=2",
+    )
+    assert webcache.url_key(same[0]) == webcache.url_key(same[1])
+    assert webcache.url_key("https://example.com/") == webcache.url_key("https://example.com")
+    assert webcache.url_key("https://example.com/a") != webcache.url_key("https://example.com/A")
+
+
+def test_ttl_and_caps():
+    cache = webcache.TTLCache("t", ttl=0.05, max_entries=2, max_chars=10)
+    cache.put("a", "1234")
+    assert cache.get("a") == "1234"
+    time.sleep(0.06)
+    assert cache.get("a") is None and cache.expired == 1
+
+    cache.ttl = 60
+    cache.put("a", "1234")
+    cache.put("b", "1234")
+    cache.get("a")  # b is now least recently used
+    cache.put("c", "1234")  # over 10 chars: b goes
+    assert cache.get("b") is None and cache.get("a") == "1234" and cache.get("c") == "1234"
+    assert cache.chars == 8 and cache.evictions == 1
+    cache.put("d", "x" * 50000)
+    assert cache.get("d") is None and not len(cache)  # one value over the cap
+
+
+def test_persistence_round_trip():
+    path = os.path.join(tempfile.mkdtemp(), "web_cache.json")
+    saved = webcache.CACHE_PATH
+    webcache.CACHE_PATH = path
+    try:
+        webcache.SEARCHES.clear()
+        webcache.SEARCHES.put("5:snake", "results")
+        webcache.SEARCHES.put("5:old", "stale", expires_at=time.time() - 1)
+        webcache.save()
+        webcache.SEARCHES.clear()
+        webcache._loaded = False
+        assert asyncio.run(webcache.lookup(webcache.SEARCHES, "5:snake")) == "results"
+        assert asyncio.run(webcache.lookup(webcache.SEARCHES, "5:old")) is None
+    finally:
+        webcache.CACHE_PATH = saved
+        webcache.SEARCHES.clear()
+
+
+def test_periodic_save_off_the_loop():
+    saves = []
+    saved = webcache.CACHE_PATH, webcache.save, webcache._saved_at
+    webcache.CACHE_PATH = os.path.join(tempfile.mkdtemp(), "web_cache.json")
+    webcache.save = lambda: saves.append(threading.current_thread())
+    webcache._loaded, webcache._saved_at = True, 0.0
+    try:
+        asyncio.run(webcache.store(webcache.SEARCHES, "5:snake", "results"))
+        asyncio.run(webcache.store(webcache.SEARCHES, "5:snake", "again"))  # not due yet
+    finally:
+        webcache.CACHE_PATH, webcache.save, webcache._saved_at = saved
+        webcache.SEARCHES.clear()
+    assert len(saves) == 1 and saves[0] is not threading.main_thread()
+
+
+def test_repeat_search_skips_network():
+    calls = []
+
+    async def fake_search(query, max_results):
+        calls.append(query)
+        return f"Search results for: {query}"
+
+    saved = gpt._web_search
+    gpt._web_search = fake_search
+    webcache.SEARCHES.clear()
+    try:
+        first = asyncio.run(gpt.web_search("Google Snake world record"))
+        second = asyncio.run(gpt.web_search("google snake  world record?"))
+    finally:
+        gpt._web_search = saved
+    assert first == second and len(calls) == 1
+    stats = webcache.SEARCHES.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1 and stats["hit_rate"] == 0.5
+    assert "search 1/2 hits (50%)" in webcache.summary()
+    webcache.SEARCHES.clear()
+
+
+def main():
+    test_keys_normalized()
+    print("✅ Queries and URLs normalized into cache keys")
+    test_ttl_and_caps()
+    print("✅ Entries expire after the TTL; LRU eviction keeps the caps")
+    test_persistence_round_trip()
+    print("✅ Live entries survive a save/load, expired ones don't")
+    test_periodic_save_off_the_loop()
+    print("✅ Periodic save runs in a worker thread, at most once per SAVE_SECONDS")
+    test_repeat_search_skips_network()
+    print("✅ Repeated search answered from the cache, hit rate counted")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,17 @@
 # Wall all calculator originally by ScienceCrafter
 # Tip: The primary and most useful function is check(amount,width,height)
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 from random import randint as rand
 from copy import deepcopy as copy
 from typing import Optional
 import re
+import time
 
+from . import hamcycle
 from . import hampath
+from . import hamsat
+from . import pathpool
 from . import render as wall_render
 
 # order --> UP DOWN LEFT RIGHT
@@ -38,10 +42,28 @@ ENDPOINT_PIECES = {
 
 @dataclass
 class PatternResult:
-    """Solver reply for Discord: caption plus optional Board-tab PNG."""
+    """Solver reply for Discord: caption plus optional Board-tab PNG.
+
+    kind ("cycle", "path", "none"), gap (head-tail gap of a path) and proven
+    (nothing better exists) describe the answer without parsing the caption.
+    grid and tour are what the PNG draws; solve_pattern(render=False) leaves
+    png empty until render_result fills it in. gif is the optional replay
+    of the tour being traced (render_result(..., replay=True)). searching
+    marks an unproven path the search is still trying to beat; the last
+    result of a solve never has it. min_gap is the closest gap a path could
+    have, for path results.
+    """
 
     content: str
     png: Optional[bytes] = None
+    kind: str = ""
+    gap: Optional[int] = None
+    proven: bool = False
+    gif: Optional[bytes] = None
+    searching: bool = False
+    min_gap: Optional[int] = None
+    grid: Optional[list] = field(default=None, repr=False)
+    tour: Optional[list] = field(default=None, repr=False)
 
 
 # Match Wall Research Board-tab closer-endpoint search.
@@ -94,16 +116,17 @@ def generate_eligible(b):
                 elig += [(i,j)]
     return elig
 
-def new_wall(b):
-    ''' (list) -> None
+def new_wall(b,rng=None):
+    ''' (list,random.Random) -> None
     adds a random eligible wall to the board and updates the eligible positions
+    rng: draw from this generator instead of the module-level random
     '''
     lx = len(b[0])
     ly = len(b)
     elig = generate_eligible(b)
     if len(elig) == 0:
         return False
-    choice = elig[rand(0,len(elig)-1)]
+    choice = elig[(rng.randint if rng else rand)(0,len(elig)-1)]
     x = choice[0]
     y = choice[1]
     b[y][x] = 2
@@ -188,14 +211,15 @@ def render(b):
         print("|")
     print("+"+"-"*len(b[0])+"+")
 
-def new_pattern(x,y):
-    ''' (int,int) -> list
+def new_pattern(x,y,rng=None):
+    ''' (int,int,random.Random) -> list
     creates a new pattern of size x by y
+    rng makes it reproducible: same seed, same pattern (see wall.sample)
     '''
     b = newblank(x,y)
     d = True
     while d:
-        d = new_wall(b)
+        d = new_wall(b,rng)
     return b
 
 ## PHASE 2 :  Let's test these patterns
@@ -410,20 +434,22 @@ class Pattern:
         if x == False:
             self.ham = False
 
-    def work(self,p=True,lim=True): # False-False for weakest test, #True-False for stronger test, #False-True for weak development, #True-True for maximisation
-        ''' (Pattern,bool,bool) -> None
+    def work(self,p=True,lim=True,cancel=None): # False-False for weakest test, #True-False for stronger test, #False-True for weak development, #True-True for maximisation
+        ''' (Pattern,bool,bool,CancelToken) -> None
         if lim, does as many snakefillsteps as it can (ie goes to the limit)
         if not lim, stops when reaches non hamcycle
         p regulates pairing
+        raises hampath.SolveCancelled once cancel fires
         '''
         prev = copy(self)
         if p:
-            self.work(False,lim)
+            self.work(False,lim,cancel)
         self.step(p)
         while (self.ham or lim) and prev != self:
+            hampath.check_cancel(cancel)
             prev = copy(self)
             if p:
-                self.work(False,lim)
+                self.work(False,lim,cancel)
             self.step(p)
 
     def __eq__(self, other):
@@ -477,13 +503,15 @@ class Pattern:
                     l += [(i,j)]
         return l
 
-    def solve(self):
-        ''' (Pattern) -> bool
+    def solve(self, cancel=None):
+        ''' (Pattern,CancelToken) -> bool
         solves the pattern
+        raises hampath.SolveCancelled once cancel fires
         '''
+        hampath.check_cancel(cancel)
         if not self.ham:
             return False
-        self.work()
+        self.work(cancel=cancel)
         #print(self)
         if not self.ham:
             return False
@@ -505,7 +533,7 @@ class Pattern:
         guess.snakemap[fe[1]][fe[0]] = guesspiece[:]
         guess.adjacencymap = new_adjmap(guess.wallmap,guess.snakemap)
         if not cyclecheck(guess.snakemap,fe[0],fe[1]):
-            g1 = guess.solve()
+            g1 = guess.solve(cancel)
             if g1:
                 return g1
         # second guess (╚/═)
@@ -516,23 +544,23 @@ class Pattern:
         guess.snakemap[fe[1]][fe[0]] = guesspiece[:]
         guess.adjacencymap = new_adjmap(guess.wallmap,guess.snakemap)
         if not cyclecheck(guess.snakemap,fe[0],fe[1]):
-            g2 = guess.solve()
+            g2 = guess.solve(cancel)
             if g2:
                 return g2
         return False
 
-    def analyse(self, depth=0):
+    def analyse(self, depth=0, cancel=None):
         if depth <= 0:
-            return copy(self).solve()
+            return copy(self).solve(cancel)
         else:
-            c = self.analyse(depth-1)
+            c = self.analyse(depth-1, cancel)
             if c:
                 return c
             for x in self.allempty():
                 newmap = self.basewallmap()
                 newmap[x[1]][x[0]] = 2
                 c = Pattern(self.lenx,self.leny,wmap=newmap,walls=self.wallcount+1)
-                c = c.analyse(depth-1)
+                c = c.analyse(depth-1, cancel)
                 if c:
                     rmap = self.basewallmap()
                     for j in range(self.leny):
@@ -549,6 +577,7 @@ last_res = []
 def check(n,x,y,m=False,pre=False):
     ''' (int,int,int,int,list) -> None
     checks n patterns of size x by y for hampaths, and prints all the ones it finds as well as a count
+    wall.sample is the seeded, parallel version with rates and solver times
     if you want to increase the amount of results (won't increase ham, but can give some insight) then you can set an m value
     if you set an m value, instead of having to pass all steps, it will only need to pass m (so the results will be less filtered)
     '''
@@ -681,13 +710,84 @@ def _cycle_coloring_possible(grid) -> bool:
     return black == white
 
 
-def _result(content: str, grid=None, tour=None, is_cycle: bool = False) -> PatternResult:
-    png = None
-    if grid is not None:
-        png = wall_render.render_board_png(
-            grid, tour, is_cycle=is_cycle, caption=content
+def render_result(
+    result: PatternResult, profile=wall_render.FINAL, replay: bool = False
+) -> PatternResult:
+    """Draw result.png from its grid and tour if it has not been drawn yet.
+
+    profile: a wall.render.RenderProfile; INTERIM_PROFILE suits results
+    that a closer one will soon replace. replay also draws result.gif.
+    """
+    if result.png is None and result.grid is not None:
+        result.png = wall_render.render_board_png(
+            result.grid,
+            result.tour,
+            is_cycle=result.kind == "cycle",
+            caption=result.content,
+            profile=profile,
+        )
+    if replay and result.gif is None and result.tour and result.grid is not None:
+        result.gif = wall_render.render_replay_gif(
+            result.grid, result.tour, caption=result.content
         )
-    return PatternResult(content=content, png=png)
+    return result
+
+
+def text_board(grid, tour=None, is_cycle: bool = False) -> str:
+    """render_compound board of grid with tour drawn in box-drawing pieces."""
+    wmap = [[2 if cell == 2 else 1 for cell in row] for row in grid]
+    smap = [[[0, 0, 0, 0] for _ in row] for row in grid]
+    cells = list(tour or [])
+    links = list(zip(cells, cells[1:]))
+    if is_cycle and len(cells) > 2:
+        links.append((cells[-1], cells[0]))
+    for r, c in cells:
+        wmap[r][c] = 3
+    # smap pieces are UP DOWN LEFT RIGHT
+    for (r0, c0), (r1, c1) in links:
+        if r1 == r0 - 1:
+            smap[r0][c0][0] = smap[r1][c1][1] = 1
+        elif r1 == r0 + 1:
+            smap[r0][c0][1] = smap[r1][c1][0] = 1
+        elif c1 == c0 - 1:
+            smap[r0][c0][2] = smap[r1][c1][3] = 1
+        else:
+            smap[r0][c0][3] = smap[r1][c1][2] = 1
+    return render_compound(wmap, smap)
+
+
+def text_result(result: PatternResult) -> PatternResult:
+    """result with its board as a text code block under the caption, no PNG."""
+    if result.grid is None:
+        return result
+    board = text_board(result.grid, result.tour, is_cycle=result.kind == "cycle")
+    return replace(
+        result, content=f"{result.content}\n```\n{board}```", png=None, gif=None, grid=None
+    )
+
+
+def _result(
+    content: str,
+    grid=None,
+    tour=None,
+    is_cycle: bool = False,
+    proven: bool = False,
+    render: bool = True,
+) -> PatternResult:
+    if is_cycle:
+        result = PatternResult(content, None, "cycle", proven=True)
+    elif tour:
+        result = PatternResult(content, None, "path", hampath.path_end_gap(tour), proven)
+    else:
+        result = PatternResult(content, None, "none", proven=proven)
+    result.grid, result.tour = grid, tour
+    if render and grid is not None:
+        start = time.perf_counter()
+        render_result(result)
+        prog = hampath.current_progress()
+        if prog is not None:
+            prog.add_time("render", time.perf_counter() - start)
+    return result
 
 
 def _path_caption(wall_count: int, gap, min_gap, *, best: bool, searching: bool) -> str:
@@ -704,7 +804,10 @@ def _path_caption(wall_count: int, gap, min_gap, *, best: bool, searching: bool)
     )
 
 
-def _emit_path(on_update, wall_count, grid, tour, *, cycle_possible: bool, searching: bool, best=None):
+def _emit_path(
+    on_update, wall_count, grid, tour, *, cycle_possible: bool, searching: bool, best=None,
+    render: bool = True,
+):
     gap = hampath.path_end_gap(tour)
     min_gap = hampath.min_path_end_gap(len(tour), cycle_possible=cycle_possible)
     if best is None:
@@ -714,17 +817,56 @@ def _emit_path(on_update, wall_count, grid, tour, *, cycle_possible: bool, searc
         grid,
         tour,
         False,
+        proven=best,
+        render=render,
     )
+    result.searching = searching and not best
+    result.min_gap = min_gap
     if on_update:
         on_update(result)
     return result, best
 
 
-def solve_pattern(pattern_string, on_update=None) -> PatternResult:
+def stopped_result(result: PatternResult) -> PatternResult:
+    """A searching path result as the answer once its search has stopped.
+
+    Same tour, captioned "not proven closest" and not yet rendered.
+    """
+    wall_count = sum(row.count(2) for row in result.grid)
+    stopped = _result(
+        _path_caption(wall_count, result.gap, result.min_gap, best=False, searching=False),
+        result.grid,
+        result.tour,
+        render=False,
+    )
+    stopped.min_gap = result.min_gap
+    return stopped
+
+
+def solve_pattern(
+    pattern_string, on_update=None, cancel=None, render=True, text=False
+) -> PatternResult:
     """Solve, then tighten head–tail gap like the Wall Research Board tab.
 
     on_update(PatternResult) is called for the first tour and each closer one.
+    cancel: optional hampath.CancelToken; raises hampath.SolveCancelled when
+    it fires so an abandoned solve stops burning CPU.
+    render=False skips the PNGs: callers that only show some of the updates
+    draw those with render_result, outside the search.
+    text=True puts a text_board code block in each caption instead of any
+    PNG, so Pillow never runs.
     """
+    if not text:
+        return _solve_pattern(pattern_string, on_update, cancel, render)
+
+    def text_update(result):
+        if on_update:
+            on_update(text_result(result))
+
+    return text_result(_solve_pattern(pattern_string, text_update, cancel, False))
+
+
+def _solve_pattern(pattern_string, on_update, cancel, render) -> PatternResult:
     pattern_string = canonicalize_pattern_string(pattern_string)
 
     if len(pattern_string) != 90:
@@ -742,27 +884,37 @@ def solve_pattern(pattern_string, on_update=None) -> PatternResult:
 
     if wall_count >= MIN_WALLS and cycle_coloring:
         searched_cycle = True
-        pattern = Pattern(10, 9, wmap=copy(grid), walls=wall_count)
-        solution = pattern.solve()
+        prog = hampath.current_progress()
+        if prog is not None:
+            prog.set_phase("cycle search")
+        solution = hamcycle.CycleBoard(grid).solve(cancel)
         if solution:
-            tour = hampath.tour_from_snakemap(solution.wallmap, solution.snakemap)
+            tour = solution.tour()
             if tour:
-                result = _result(f"Ham Cycle · {wall_count} walls", grid, tour, True)
+                result = _result(
+                    f"Ham Cycle · {wall_count} walls", grid, tour, True, render=render
+                )
             else:
-                result = PatternResult("Ham Cycle (could not draw tour)")
+                result = PatternResult(
+                    "Ham Cycle (could not draw tour)", kind="cycle", proven=True
+                )
             if on_update:
                 on_update(result)
             return result
 
     if not hampath.coloring_allows_path(grid):
-        result = _result("No Ham Cycle or Ham Path (coloring)", grid)
+        result = _result(
+            "No Ham Cycle or Ham Path (coloring)", grid, proven=True, render=render
+        )
         if on_update:
             on_update(result)
         return result
 
-    tour = hampath.find_hamiltonian_path(grid)
+    tour = hampath.find_hamiltonian_path(
+        grid, cancel=cancel, workers=pathpool.PATH_WORKERS
+    )
     if not tour:
-        result = _result("No Ham Cycle or Ham Path", grid)
+        result = _result("No Ham Cycle or Ham Path", grid, render=render)
         if on_update:
             on_update(result)
         return result
@@ -776,6 +928,7 @@ def solve_pattern(pattern_string, on_update=None) -> PatternResult:
     result, best = _emit_path(
         on_update, wall_count, grid, tour,
         cycle_possible=cycle_possible, searching=not already_best, best=already_best,
+        render=render,
     )
     if best:
         return result
@@ -786,6 +939,7 @@ def solve_pattern(pattern_string, on_update=None) -> PatternResult:
         _emit_path(
             on_update, wall_count, grid, tour,
             cycle_possible=cycle_possible, searching=True, best=is_best,
+            render=render,
         )
 
     tour, _gap, best = hampath.improve_path_endpoints(
@@ -794,10 +948,14 @@ def solve_pattern(pattern_string, on_update=None) -> PatternResult:
         time_limit=IMPROVE_SECONDS,
         on_better=on_better,
         cycle_possible=cycle_possible,
+        cancel=cancel,
+        workers=pathpool.PATH_WORKERS,
+        sat=hamsat.SAT_ENABLED,
     )
     result, _ = _emit_path(
         on_update, wall_count, grid, tour,
         cycle_possible=cycle_possible, searching=False, best=best,
+        render=render,
     )
     return result
 
@@ -0,0 +1,231 @@
+"""Single-cell edits of a pattern: which keep a Ham Cycle or a Ham Path.
+
+Every empty cell is tried as an extra wall and every wall as a removal.
+Each edit is an independent solve, so they fan out over wall.pathpool
+workers: ANALYSE_WORKERS (WALLALL_ANALYSE_WORKERS, by default one per
+spare CPU up to 4), or this thread alone with 0 or 1.
+
+Most edits are settled from the parent's own solution first:
+  - a cycle minus the new wall is a path
+  - a cycle opened next to a removed wall extends into that cell
+  - a wall on a path end, or a removal next to one, keeps the rest a path
+Those edits leave the colours unbalanced, so no cycle is possible and
+a path is final. Only the other edits need a search.
+Adding a wall never invalidates a forced snake-fill piece that does not
+touch that cell, so the cycle search for such an edit resumes from the
+parent's filled CycleBoard instead of an empty board.
+
+The whole analysis runs within ANALYSE_SECONDS and each edit within
+CELL_SECONDS; edits that run out of time are reported as unknown. The
+cycle search gets at most half of an edit's time and the path search the
+rest. With WALLALL_SAT on, the path DFS gets a quarter of what is left
+and anything it leaves open goes to the exact SAT back-end (any pair of
+ends) until the edit's time is up.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from typing import List, Optional
+
+from . import PatternResult, canonicalize_pattern_string, hamcycle, hampath, hamsat, pathpool
+from .render import render_heatmap_png
+from . import stringToBoardArray
+from .hampath import N, WALL, WIDTH, CancelToken, Deadline, SolveCancelled, check_cancel
+
+ANALYSE_SECONDS = 30.0
+CELL_SECONDS = 3.0
+ANALYSE_WORKERS = max(
+    0,
+    int(os.getenv("WALLALL_ANALYSE_WORKERS", str(min(4, (os.cpu_count() or 1) - 1)))),
+)
+
+CYCLE = "cycle"
+PATH = "path"
+NONE = "none"
+UNKNOWN = "unknown"
+
+
+def cycle_coloring_ok(grid) -> bool:
+    """True if the checkerboard allows a Ham Cycle: equal colours, at least 4 cells."""
+    black = white = 0
+    for r, row in enumerate(grid):
+        for c, cell in enumerate(row):
+            if cell != WALL:
+                if (r + c) & 1:
+                    black += 1
+                else:
+                    white += 1
+    return black == white and black > 1
+
+
+def _toggled(grid, i):
+    r, c = divmod(i, WIDTH)
+    child = [row[:] for row in grid]
+    child[r][c] = 1 if grid[r][c] == WALL else WALL
+    return child
+
+
+def _touches(board, i) -> bool:
+    """True if the forced fill has a piece on cell i or pointing into it."""
+    if board.snake >> i & 1:
+        return True
+    for d in range(4):
+        j = hamcycle.STEP[i][d]
+        if j >= 0 and board.pieces[j] >> hamcycle._OPP[d] & 1:
+            return True
+    return False
+
+
+def _adjacent(i, cell) -> bool:
+    return cell[0] * WIDTH + cell[1] in hampath.NEIGHBORS[i]
+
+
+def _warm_status(grid, i, tour, is_cycle, cycle_ok) -> Optional[str]:
+    """Status settled from the parent's tour alone, or None."""
+    if not tour:
+        return None
+    adding = grid[i // WIDTH][i % WIDTH] != WALL
+    cell = divmod(i, WIDTH)
+    if is_cycle:
+        if adding or any(_adjacent(i, c) for c in tour):
+            return PATH
+        return None
+    ends = (tour[0], tour[-1])
+    kept = cell in ends if adding else any(_adjacent(i, end) for end in ends)
+    if kept and not cycle_ok:
+        return PATH
+    return None
+
+
+def edit_status(child, board, cycle_ok, seconds, cancel=None):
+    """CYCLE / PATH / NONE / UNKNOWN for the board child within seconds.
+
+    board: a warm CycleBoard for child, or None. cycle_ok: cycle_coloring_ok(child).
+
+    The cycle search, the path DFS and SAT share the one budget of seconds.
+    """
+    end = time.perf_counter() + seconds
+    if cycle_ok:
+        # half, so a cycle search that stalls still leaves time for a path
+        token = CancelToken(Deadline(seconds / 2), parent=cancel)
+        try:
+            if (board or hamcycle.CycleBoard(child)).solve(token):
+                return CYCLE
+        except SolveCancelled:
+            check_cancel(cancel)  # else only this edit ran out of time
+    # the DFS settles most edits at once; what it cannot goes to SAT early
+    left = end - time.perf_counter()
+    token = CancelToken(Deadline(left / 4 if hamsat.SAT_ENABLED else left), parent=cancel)
+    try:
+        return PATH if hampath.has_hamiltonian_path(child, cancel=token) else NONE
+    except SolveCancelled:
+        check_cancel(cancel)
+    if not hamsat.SAT_ENABLED or time.perf_counter() >= end:
+        return UNKNOWN
+    status, _ = hamsat.gap_path(child, hampath.end_pairs(child), end, cancel)
+    return {"found": PATH, "impossible": NONE}.get(status, UNKNOWN)
+
+
+def _parent_tour(grid, cancel):
+    """(tour, is_cycle) for the unedited board within CELL_SECONDS."""
+    token = CancelToken(Deadline(CELL_SECONDS), parent=cancel)
+    try:
+        if cycle_coloring_ok(grid):
+            solution = hamcycle.CycleBoard(grid).solve(token)
+            if solution:
+                return solution.tour(), True
+        return hampath.find_hamiltonian_path(grid, CELL_SECONDS, cancel=token), False
+    except SolveCancelled:
+        check_cancel(cancel)
+        return None, False
+
+
+def _parent_fill(grid, cancel):
+    """Parent CycleBoard after forced fill, or None if the fill is unusable."""
+    board = hamcycle.CycleBoard(grid)
+    token = CancelToken(Deadline(CELL_SECONDS), parent=cancel)
+    try:
+        board.work(cancel=token)
+    except SolveCancelled:
+        check_cancel(cancel)
+        return None
+    return board if board.ham else None
+
+
+def analyse_grid(grid, seconds=ANALYSE_SECONDS, workers=None, cancel=None) -> List[str]:
+    """Status of every single-cell edit, indexed by cell (row * WIDTH + col).
+
+    CYCLE / PATH / NONE for what the edited board still admits, UNKNOWN when
+    the time ran out. Raises SolveCancelled if cancel fires.
+    """
+    if workers is None:
+        workers = ANALYSE_WORKERS
+    deadline = time.perf_counter() + seconds
+    tour, is_cycle = _parent_tour(grid, cancel)
+    fill = None
+    statuses: List[str] = [UNKNOWN] * N
+    jobs = []
+    cells = []
+    for i in range(N):
+        check_cancel(cancel)
+        child = _toggled(grid, i)
+        if not hampath.coloring_allows_path(child):
+            statuses[i] = NONE
+            continue
+        cycle_ok = cycle_coloring_ok(child)
+        warm = _warm_status(grid, i, tour, is_cycle, cycle_ok)
+        if warm is not None:
+            statuses[i] = warm
+            continue
+        board = None
+        if cycle_ok and grid[i // WIDTH][i % WIDTH] != WALL:
+            if fill is None:
+                fill = _parent_fill(grid, cancel) or False
+            if fill and not _touches(fill, i):
+                board = fill.clone()
+                board.walls |= 1 << i
+                board.nfree -= 1
+        cells.append(i)
+        jobs.append((child, board, cycle_ok, CELL_SECONDS))
+
+    if workers > 1 and len(jobs) > 1:
+        results = pathpool.shared_pool(workers).map_within(edit_status, jobs, deadline, cancel)
+    else:
+        results = []
+        for job in jobs:
+            if time.perf_counter() > deadline:
+                break
+            results.append(edit_status(*job, cancel=cancel))
+    for i, result in zip(cells, results):
+        statuses[i] = result or UNKNOWN
+    return statuses
+
+
+def _caption(wall_count: int, statuses: List[str]) -> str:
+    counts = {s: statuses.count(s) for s in (CYCLE, PATH, NONE, UNKNOWN)}
+    text = (
+        f"Analyse · {wall_count} walls · one-cell edits: "
+        f"{counts[CYCLE]} keep a cycle · {counts[PATH]} a path · "
+        f"{counts[NONE]} neither"
+    )
+    if counts[UNKNOWN]:
+        text += f" · {counts[UNKNOWN]} unknown (out of time)"
+    return text
+
+
+def analyse_pattern(
+    pattern_string, seconds=ANALYSE_SECONDS, workers=None, cancel=None
+) -> PatternResult:
+    """Heatmap of which single-cell wall additions / removals keep a cycle or path."""
+    pattern_string = canonicalize_pattern_string(pattern_string)
+    if len(pattern_string) != N:
+        return PatternResult(
+            "I can analyse only Small Board patterns, so I'm expecting exactly 90 characters"
+        )
+    grid = stringToBoardArray(pattern_string)
+    statuses = analyse_grid(grid, seconds=seconds, workers=workers, cancel=cancel)
+    caption = _caption(pattern_string.count("2"), statuses)
+    png = render_heatmap_png(grid, statuses, caption=caption)
+    return PatternResult(content=caption, png=png)
@@ -0,0 +1,264 @@
+"""Solver benchmark over a fixed corpus of pudding-clipboard patterns.
+
+bench_corpus.txt holds one pattern per line: name, category, then the
+copy as pasted in Discord. The categories say what the solver should end
+with within the budget:
+  cycle      a Ham Cycle
+  path       a Ham Path with the closest gap proven
+  none       neither, proven
+  timeout    nothing proven within BENCH_SECONDS (the cases to speed up)
+
+Each pattern runs solve_pattern in a fresh process, under a progress
+scope (so the DFS is exhaustive) and a BENCH_SECONDS cancel deadline,
+and reports:
+  first_tour_s   first cycle / path on screen
+  proven_s       answer proven final (cycle, closest gap, or no path)
+  total_s        until solve_pattern returned or the deadline hit
+  nodes          SearchProgress steps of the solving process
+  peak_rss_kb    peak RSS of that process, rss_growth_kb above the import baseline
+Times are medians over BENCH_REPEAT runs.
+
+    BENCH_JSON=new.json python3 -m wall.bench
+    BENCH_BASELINE=old.json python3 -m wall.bench   # exit 1 on regressions
+
+The report is sorted JSON, so two of them diff line by line. Worker
+processes of WALLALL_WORKERS are not in nodes or peak_rss_kb.
+
+    python3 -m wall.bench render   # board PNG draw/encode time and bytes per profile
+"""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+from . import hamsat, parse_pattern_input, pathpool, solve_pattern, wall_render
+from .hampath import CancelToken, Deadline, SolveCancelled, progress_scope
+
+try:
+    import resource
+except ImportError:  # Windows: no RSS figures
+    resource = None
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_corpus.txt")
+CATEGORIES = ("cycle", "path", "none", "timeout")
+BENCH_SECONDS = 20.0
+
+# Regression gates: slower by SLOWER and by more than NOISE_SECONDS.
+SLOWER = 1.25
+NOISE_SECONDS = 0.05
+
+
+def load_corpus(path: str = CORPUS) -> List[Tuple[str, str, str]]:
+    """[(name, category, 90-cell pattern string), ...] from a corpus file."""
+    corpus = []
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            name, category, copy = line.split(None, 2)
+            pattern = parse_pattern_input(copy)
+            if category not in CATEGORIES or len(pattern) != 90:
+                raise ValueError(f"{path}:{number}: bad corpus line")
+            corpus.append((name, category, pattern))
+    return corpus
+
+
+def _max_rss_kb() -> Optional[int]:
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_one(pattern: str, seconds: float) -> dict:
+    """One solve_pattern run: outcome, timings, nodes and memory."""
+    rss0 = _max_rss_kb()
+    token = CancelToken(Deadline(seconds))
+    start = time.perf_counter()
+    first = proven = None
+    final = None
+
+    def on_update(result):
+        nonlocal first, proven, final
+        now = time.perf_counter() - start
+        if first is None and result.kind in ("cycle", "path"):
+            first = now
+        if proven is None and result.proven:
+            proven = now
+        final = result
+
+    with progress_scope(lambda _line: None, interval=3600.0) as prog:
+        try:
+            solve_pattern(pattern, on_update=on_update, cancel=token)
+            timed_out = False
+        except SolveCancelled:
+            timed_out = True
+    total = time.perf_counter() - start
+    kind = final.kind if final else "none"
+    if not timed_out and kind == "none":
+        proven = total  # under a progress scope the path search is exhaustive
+    rss = _max_rss_kb()
+    return {
+        "status": "timeout" if proven is None and timed_out else kind,
+        "gap": final.gap if final else None,
+        "first_tour_s": first,
+        "proven_s": proven,
+        "total_s": total,
+        "nodes": prog.nodes,
+        "peak_rss_kb": rss,
+        "rss_growth_kb": rss - rss0 if rss is not None else None,
+    }
+
+
+def _median(values):
+    values = [v for v in values if v is not None]
+    return round(statistics.median(values), 4) if values else None
+
+
+def run_bench(
+    corpus=None, seconds: float = BENCH_SECONDS, repeat: int = 1, on_pattern=None
+) -> dict:
+    """Benchmark every corpus pattern; returns the JSON-ready report.
+
+    on_pattern(name, entry) is called as each pattern finishes.
+    """
+    if corpus is None:
+        corpus = load_corpus()
+    ctx = multiprocessing.get_context(pathpool._START_METHOD)
+    patterns: Dict[str, dict] = {}
+    # max_tasks_per_child=1: a fresh process (and RSS peak) per run
+    with ProcessPoolExecutor(1, mp_context=ctx, max_tasks_per_child=1) as pool:
+        for name, category, pattern in corpus:
+            runs = [pool.submit(_run_one, pattern, seconds).result() for _ in range(repeat)]
+            entry = dict(runs[0])
+            for key in ("first_tour_s", "proven_s", "total_s"):
+                entry[key] = _median(r[key] for r in runs)
+            entry["category"] = category
+            entry["pattern"] = pattern
+            patterns[name] = entry
+            if on_pattern is not None:
+                on_pattern(name, entry)
+    return {
+        "python": platform.python_version(),
+        "workers": pathpool.PATH_WORKERS,
+        "sat": hamsat.SAT_ENABLED,
+        "seconds": seconds,
+        "repeat": repeat,
+        "patterns": patterns,
+    }
+
+
+def _outcome_rank(entry) -> tuple:
+    """Lower is better: proven before unproven, then a smaller gap."""
+    return (entry["proven_s"] is None, entry["gap"] if entry["gap"] is not None else 0)
+
+
+def check_expected(report) -> List[str]:
+    """Patterns whose outcome contradicts their corpus category."""
+    wrong = []
+    for name, entry in sorted(report["patterns"].items()):
+        category, status = entry["category"], entry["status"]
+        if status == "timeout" or category == "timeout":
+            continue
+        if status != category or entry["proven_s"] is None:
+            wrong.append(f"{name}: expected proven {category}, got {status}")
+    return wrong
+
+
+def compare(base, new, slower: float = SLOWER, noise: float = NOISE_SECONDS):
+    """(regressions, notes) of report new against baseline report base."""
+    regressions: List[str] = []
+    notes: List[str] = []
+    for name, now in sorted(new["patterns"].items()):
+        was = base["patterns"].get(name)
+        if was is None:
+            notes.append(f"{name}: new pattern")
+            continue
+        if was["status"] != now["status"] and "timeout" not in (was["status"], now["status"]):
+            regressions.append(f"{name}: {was['status']} -> {now['status']}")
+            continue
+        if _outcome_rank(now) > _outcome_rank(was):
+            regressions.append(
+                f"{name}: gap {was['gap']} proven={was['proven_s'] is not None} -> "
+                f"gap {now['gap']} proven={now['proven_s'] is not None}"
+            )
+        elif _outcome_rank(now) < _outcome_rank(was):
+            notes.append(f"{name}: better outcome (gap {was['gap']} -> {now['gap']})")
+        for key in ("first_tour_s", "proven_s"):
+            old_t, new_t = was.get(key), now.get(key)
+            if old_t is None or new_t is None:
+                continue
+            if new_t > old_t * slower and new_t - old_t > noise:
+                regressions.append(f"{name}: {key} {old_t:.3f}s -> {new_t:.3f}s")
+            elif old_t > new_t * slower and old_t - new_t > noise:
+                notes.append(f"{name}: {key} {old_t:.3f}s -> {new_t:.3f}s")
+        if was["nodes"] and now["nodes"] > was["nodes"] * slower:
+            notes.append(f"{name}: nodes {was['nodes']:,} -> {now['nodes']:,}")
+    return regressions, notes
+
+
+def _fmt(seconds) -> str:
+    return "      -" if seconds is None else f"{seconds:7.3f}"
+
+
+def _main() -> int:
+    seconds = float(os.getenv("BENCH_SECONDS", str(BENCH_SECONDS)))
+    repeat = int(os.getenv("BENCH_REPEAT", "1"))
+    out = os.getenv("BENCH_JSON", "")
+    baseline = os.getenv("BENCH_BASELINE", "")
+    corpus = load_corpus(os.getenv("BENCH_CORPUS", CORPUS))
+    print(f"Benchmarking {len(corpus)} patterns ({seconds:.0f}s budget, x{repeat})")
+    print(f"  {'name':<16}{'category':<9}{'status':<9}{'gap':>4}"
+          f"{'first':>9}{'proven':>9}{'nodes':>12}{'rss KB':>9}")
+
+    def show(name, e):
+        print(
+            f"  {name:<16}{e['category']:<9}{e['status']:<9}"
+            f"{e['gap'] if e['gap'] is not None else '-':>4}"
+            f"  {_fmt(e['first_tour_s'])}  {_fmt(e['proven_s'])}"
+            f"{e['nodes']:>12,}{e['peak_rss_kb'] or 0:>9,}",
+            flush=True,
+        )
+
+    report = run_bench(corpus, seconds, repeat, on_pattern=show)
+    if out:
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"  wrote {out}")
+    failed = check_expected(report)
+    for line in failed:
+        print(f"  WRONG {line}")
+    if baseline:
+        with open(baseline, encoding="utf-8") as f:
+            regressions, notes = compare(json.load(f), report)
+        for line in notes:
+            print(f"  note  {line}")
+        for line in regressions:
+            print(f"  SLOW  {line}")
+        failed += regressions
+    return 1 if failed else 0
+
+
+def _render_main() -> int:
+    repeat = int(os.getenv("BENCH_REPEAT", "20"))
+    print(f"Board PNG profiles (median of {repeat})")
+    print(f"  {'profile':<9}{'draw ms':>9}{'encode ms':>11}{'bytes':>9}")
+    for name, entry in wall_render.bench_profiles(repeat).items():
+        print(
+            f"  {name:<9}{entry['draw_ms']:>9.1f}{entry['encode_ms']:>11.1f}"
+            f"{entry['bytes']:>9,}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(_render_main() if sys.argv[1:] == ["render"] else _main())
@@ -0,0 +1,311 @@
+"""Bitboard Ham Cycle solver for the 10x9 small board.
+
+Same search as wall.Pattern.solve (ScienceCrafter's snake-fill + guess),
+so verdicts and tours match it exactly, but the board lives in 90-bit
+masks instead of nested lists:
+
+  walls, snake     cells that are walls / already hold a snake piece
+  up/down/left/right
+                   cells whose piece connects in that direction
+
+Adjacency for every empty cell comes from a few shifts of those masks,
+so a fill step never rebuilds an adjacency map, pairing never deep-copies
+the snake to test for a loop, and guesses clone a handful of ints.
+"""
+
+from .hampath import (
+    FULL,
+    HEIGHT,
+    LEFT_COL,
+    N,
+    RIGHT_COL,
+    WALL,
+    WIDTH,
+    check_cancel,
+    current_progress,
+    tour_from_snakemap,
+)
+
+TOP_ROW = (1 << WIDTH) - 1
+BOTTOM_ROW = TOP_ROW << (N - WIDTH)
+
+# UP DOWN LEFT RIGHT, matching wall.piecedict / the snakemap 4-lists.
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+_OPP = (DOWN, UP, RIGHT, LEFT)
+
+
+def _step_to(i, d):
+    r, c = divmod(i, WIDTH)
+    if d == UP:
+        return i - WIDTH if r > 0 else -1
+    if d == DOWN:
+        return i + WIDTH if r + 1 < HEIGHT else -1
+    if d == LEFT:
+        return i - 1 if c > 0 else -1
+    return i + 1 if c + 1 < WIDTH else -1
+
+
+STEP = tuple(tuple(_step_to(i, d) for d in range(4)) for i in range(N))
+POP4 = tuple(bin(nib).count("1") for nib in range(16))
+# First connection in UP DOWN LEFT RIGHT order (list.index(1)), or -1.
+FIRST = tuple(next((d for d in range(4) if nib >> d & 1), -1) for nib in range(16))
+
+# Pattern.step sweeps columns outer, rows inner. Pairing decisions depend
+# on pieces placed earlier in that sweep, so keep its order.
+_COL_RANK = tuple((i % WIDTH) * HEIGHT + i // WIDTH for i in range(N))
+COL_BEFORE = tuple(
+    sum(1 << j for j in range(N) if _COL_RANK[j] < _COL_RANK[i]) for i in range(N)
+)
+
+
+def _count_eq2_ge3(a, b, c, d):
+    """Bit-sliced popcount of four masks: (cells with exactly 2, cells with >= 3)."""
+    s1, k1 = a ^ b, a & b
+    s2, k2 = c ^ d, c & d
+    low = s1 ^ s2
+    carry = s1 & s2
+    mid = k1 ^ k2 ^ carry
+    high = (k1 & k2) | (carry & (k1 ^ k2))
+    return ~low & mid & ~high, (low & mid) | high
+
+
+class CycleBoard:
+    """Bitboard Pattern: 1=empty, 2=wall, 3=snake piece (as masks)."""
+
+    __slots__ = ("walls", "snake", "dirs", "pieces", "nfree", "ham")
+
+    def __init__(self, grid):
+        walls = 0
+        for r in range(HEIGHT):
+            for c in range(WIDTH):
+                if grid[r][c] == WALL:
+                    walls |= 1 << (r * WIDTH + c)
+        self.walls = walls
+        self.snake = 0
+        self.dirs = [0, 0, 0, 0]
+        self.pieces = bytearray(N)
+        self.nfree = N - walls.bit_count()
+        self.ham = True
+
+    def clone(self):
+        b = CycleBoard.__new__(CycleBoard)
+        b.walls = self.walls
+        b.snake = self.snake
+        b.dirs = self.dirs[:]
+        b.pieces = self.pieces[:]
+        b.nfree = self.nfree
+        b.ham = self.ham
+        return b
+
+    def _key(self):
+        return (self.snake, self.dirs[0], self.dirs[1], self.dirs[2], self.dirs[3])
+
+    def _place(self, i, nib):
+        bit = 1 << i
+        self.snake |= bit
+        self.pieces[i] = nib
+        dirs = self.dirs
+        for d in range(4):
+            if nib >> d & 1:
+                dirs[d] |= bit
+
+    def _place_mask(self, cells, nib_masks):
+        """Place pieces on every cell in cells; nib_masks[d] marks connections."""
+        dirs = self.dirs
+        for d in range(4):
+            dirs[d] |= nib_masks[d] & cells
+        self.snake |= cells
+        pieces = self.pieces
+        up, down, left, right = (m & cells for m in nib_masks)
+        r = cells
+        while r:
+            b = r & -r
+            i = b.bit_length() - 1
+            pieces[i] = (
+                (up >> i & 1)
+                | (down >> i & 1) << 1
+                | (left >> i & 1) << 2
+                | (right >> i & 1) << 3
+            )
+            r ^= b
+
+    def _adjacency(self):
+        """Per-direction (blocked, head) masks for every cell (adj_check 1 / 2)."""
+        occ = self.walls | self.snake
+        up, down, left, right = self.dirs
+        b_up = TOP_ROW | ((occ << WIDTH) & FULL)
+        h_up = (down << WIDTH) & FULL
+        b_down = BOTTOM_ROW | (occ >> WIDTH)
+        h_down = up >> WIDTH
+        b_left = LEFT_COL | ((occ << 1) & FULL & ~LEFT_COL)
+        h_left = (right << 1) & FULL & ~LEFT_COL
+        b_right = RIGHT_COL | ((occ >> 1) & ~RIGHT_COL)
+        h_right = (left >> 1) & ~RIGHT_COL
+        return (b_up, b_down, b_left, b_right), (h_up, h_down, h_left, h_right)
+
+    def walk(self, start, nib0):
+        """cyclecheck: loop length through start (holding nib0), else 0."""
+        pieces = self.pieces
+        d = FIRST[nib0]
+        cur = start
+        n = 0
+        while True:
+            n += 1
+            cur = STEP[cur][d]
+            if cur < 0:
+                # Only a guessed piece can point off the board; no loop there.
+                return 0
+            nib = nib0 if cur == start else pieces[cur]
+            if POP4[nib] != 2:
+                return 0
+            d = FIRST[nib & ~(1 << _OPP[d])]
+            if cur == start:
+                return n
+            if n > N:
+                return 0
+
+    def step(self, pairing=True):
+        """One snakefillstep sweep against the adjacency from its start."""
+        free = FULL & ~(self.walls | self.snake)
+        if not free:
+            return
+        blocked, heads = self._adjacency()
+        ones = [b & ~h for b, h in zip(blocked, heads)]
+        one2, one3 = _count_eq2_ge3(*ones)
+        head2, head3 = _count_eq2_ge3(*heads)
+        if (one3 | head3) & free:
+            self.ham = False
+        forced = one2 & free
+        # Forced pieces connect their two non-blocked sides.
+        forced_dirs = [~o for o in ones]
+        pair = (head2 & free) if pairing else 0
+        if not pair:
+            if forced:
+                self._place_mask(forced, forced_dirs)
+            return
+        applied = 0
+        full = self.nfree
+        r = pair
+        order = []
+        while r:
+            b = r & -r
+            order.append(b.bit_length() - 1)
+            r ^= b
+        order.sort(key=_COL_RANK.__getitem__)
+        for i in order:
+            earlier = forced & COL_BEFORE[i] & ~applied
+            if earlier:
+                self._place_mask(earlier, forced_dirs)
+                applied |= earlier
+            bit = 1 << i
+            nib = (
+                (heads[0] >> i & 1)
+                | (heads[1] >> i & 1) << 1
+                | (heads[2] >> i & 1) << 2
+                | (heads[3] >> i & 1) << 3
+            )
+            if forced & bit:
+                self._place(i, nib)
+                applied |= bit
+                loop = self.walk(i, nib)
+                if loop and loop != full:
+                    self.ham = False
+                continue
+            loop = self.walk(i, nib)
+            if not loop:
+                self._place(i, nib)
+            elif loop != full:
+                self.ham = False
+        rest = forced & ~applied
+        if rest:
+            self._place_mask(rest, forced_dirs)
+
+    def work(self, pairing=True, cancel=None):
+        """Pattern.work(lim=True) to its fixed point; stops early once not ham."""
+        prev = self._key()
+        if pairing:
+            self.work(False, cancel)
+        if not self.ham:
+            return
+        self.step(pairing)
+        while self.ham and prev != self._key():
+            check_cancel(cancel)
+            prev = self._key()
+            if pairing:
+                self.work(False, cancel)
+                if not self.ham:
+                    return
+            self.step(pairing)
+
+    def solve(self, cancel=None):
+        """Solved CycleBoard (a Ham Cycle), or False. Same order as Pattern.solve."""
+        check_cancel(cancel)
+        prog = current_progress()
+        if prog is not None:
+            prog.tick()
+        if not self.ham:
+            return False
+        self.work(cancel=cancel)
+        if not self.ham:
+            return False
+        full = self.nfree
+        snake = self.snake
+        if (snake & 1 and self.walk(0, self.pieces[0]) == full) or (
+            snake & 2 and self.walk(1, self.pieces[1]) == full
+        ):
+            return self
+        free = FULL & ~(self.walls | snake)
+        if not free:
+            return False
+        fe = (free & -free).bit_length() - 1
+        _blocked, heads = self._adjacency()
+        base = 0
+        if heads[UP] >> fe & 1:
+            base = 1 << UP
+        elif heads[LEFT] >> fe & 1:
+            base = 1 << LEFT
+        for extra in (DOWN, RIGHT):
+            nib = base | (1 << extra)
+            guess = self.clone()
+            guess._place(fe, nib)
+            if not guess.walk(fe, nib):
+                found = guess.solve(cancel)
+                if found:
+                    return found
+        return False
+
+    def wallmap(self):
+        """Pattern-style wallmap: 1 empty, 2 wall, 3 snake."""
+        return [
+            [
+                2 if self.walls >> (r * WIDTH + c) & 1
+                else 3 if self.snake >> (r * WIDTH + c) & 1
+                else 1
+                for c in range(WIDTH)
+            ]
+            for r in range(HEIGHT)
+        ]
+
+    def snakemap(self):
+        """Pattern-style snakemap: [UP, DOWN, LEFT, RIGHT] 0/1 per cell."""
+        return [
+            [
+                [self.pieces[r * WIDTH + c] >> d & 1 for d in range(4)]
+                for c in range(WIDTH)
+            ]
+            for r in range(HEIGHT)
+        ]
+
+    def tour(self):
+        """Cycle as [(row, col), ...] exactly as tour_from_snakemap walks it."""
+        return tour_from_snakemap(self.wallmap(), self.snakemap())
+
+
+def solve_cycle(grid, cancel=None):
+    """Ham Cycle tour on a 10x9 grid as [(row, col), ...], or None."""
+    if len(grid) != HEIGHT or len(grid[0]) != WIDTH:
+        raise ValueError(f"expected {HEIGHT}x{WIDTH} grid")
+    solution = CycleBoard(grid).solve(cancel)
+    if not solution:
+        return None
+    return solution.tour()
@@ -12,7 +12,8 @@ Prunes, in order:
      tie-break, forced corridors). Timeouts never count as no.
 """
 
-import collections
+import heapq
+import random
 import threading
 import time
 
@@ -29,22 +30,184 @@ OPP = (1, 0, 3, 2)
 _tls = threading.local()
 
 
+class SolveCancelled(Exception):
+    """Raised from inside a search once its CancelToken has been cancelled."""
+
+
+class CancelToken:
+    """Cooperative cancellation shared by every solver entry point.
+
+    Hot loops test `cancelled` and unwind with SolveCancelled, so an
+    abandoned solve gives its thread back without waiting for a deadline.
+    event: anything with set() / is_set(), e.g. a multiprocessing Event
+    shared with worker processes (wall.pathpool). Defaults to a thread Event.
+    parent: another token (or None); a child also counts as cancelled once
+    its parent is, so one search can be stopped without stopping the solve.
+    """
+
+    __slots__ = ("_event", "_parent")
+
+    def __init__(self, event=None, parent=None):
+        self._event = threading.Event() if event is None else event
+        self._parent = parent
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        if self._event.is_set():
+            return True
+        return self._parent is not None and self._parent.cancelled
+
+
+class Deadline:
+    """Event-like clock for CancelToken: set once seconds have passed."""
+
+    __slots__ = ("at",)
+
+    def __init__(self, seconds):
+        self.at = time.perf_counter() + seconds
+
+    def set(self):
+        self.at = 0.0
+
+    def is_set(self):
+        return time.perf_counter() > self.at
+
+
+def check_cancel(cancel):
+    """Raise SolveCancelled if cancel (a CancelToken or None) has fired."""
+    if cancel is not None and cancel.cancelled:
+        raise SolveCancelled()
+
+
+DEAD_STATES_LIMIT = 100_000
+
+
+class DeadStates:
+    """Bounded table of DFS states proven to have no covering path.
+
+    A state is (head, remaining cells, required end) packed into one int.
+    Only exhaustive failures are stored: once a node cap or deadline cuts
+    a search (cut = True), its later failures prove nothing. One table is
+    shared across node budgets and start cells of a solve. Two generations
+    keep it bounded: a full young set becomes the old one and the previous
+    old set is dropped.
+    """
+
+    __slots__ = ("limit", "cut", "probes", "hits", "stores", "_young", "_old")
+
+    def __init__(self, limit=DEAD_STATES_LIMIT):
+        self.limit = limit
+        self.cut = False
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self._young = set()
+        self._old = set()
+
+    def __len__(self):
+        return len(self._young) + len(self._old)
+
+    def probe(self, key):
+        self.probes += 1
+        if key in self._young or key in self._old:
+            self.hits += 1
+            return True
+        return False
+
+    def store(self, keys):
+        young = self._young
+        young.update(keys)
+        self.stores += len(keys)
+        if len(young) >= self.limit:
+            self._old = young
+            self._young = set()
+
+    def hit_rate(self):
+        return self.hits / self.probes if self.probes else 0.0
+
+    def summary(self):
+        return (
+            f"dead-state hits {self.hit_rate():.1%} "
+            f"({self.hits:,}/{self.probes:,}), {len(self):,} stored"
+        )
+
+
+def _state_key(head, rem, required_end):
+    end = 0 if required_end is None else required_end + 1
+    return rem | (head << N) | (end << (N + 7))
+
+
 class SearchProgress:
-    """Rate-limited status lines for a single-board search."""
+    """Rate-limited status lines for a single-board search.
+
+    Also keeps structured telemetry of the search: steps and seconds per
+    phase, prune counts by rule, the gaps of improved tours and side work
+    such as rendering (see record(), aggregated by wall.telemetry).
+    batch: no human waits on the search, so the first-path DFS runs
+    without its time limit (find_hamiltonian_path).
+    """
 
-    def __init__(self, emit, interval=1.0):
+    def __init__(self, emit, interval=1.0, batch=True):
         self.emit = emit
         self.interval = interval
+        self.batch = batch
         self.t0 = time.perf_counter()
         self._last = 0.0
         self.steps = 0
+        self.done = 0  # steps of earlier phases
         self.phase = "start"
+        self._phase_t0 = self.t0
+        self.phases = []  # (phase, steps, seconds) of finished phases
+        self.prunes = {}
+        self.improvements = []  # (seconds, gap)
+        self.timers = {}  # seconds of side work inside the phases
+
+    @property
+    def nodes(self):
+        """Steps over every phase so far (benchmarks, telemetry)."""
+        return self.done + self.steps
+
+    def _close_phase(self, now):
+        if self.steps or self.phase != "start":
+            self.phases.append((self.phase, self.steps, now - self._phase_t0))
+        self._phase_t0 = now
 
     def set_phase(self, phase):
+        self._close_phase(time.perf_counter())
         self.phase = phase
+        self.done += self.steps
         self.steps = 0
         self._send(force=True)
 
+    def prune(self, rule):
+        """Count one dead end cut by rule."""
+        self.prunes[rule] = self.prunes.get(rule, 0) + 1
+
+    def improved(self, gap):
+        self.improvements.append((time.perf_counter() - self.t0, gap))
+
+    def add_time(self, name, seconds):
+        """Charge side work (e.g. rendering) that runs inside a phase."""
+        self.timers[name] = self.timers.get(name, 0.0) + seconds
+
+    def record(self):
+        """Telemetry so far: phases, prunes, improvements, nodes and seconds."""
+        now = time.perf_counter()
+        phases = list(self.phases)
+        if self.steps or self.phase != "start":
+            phases.append((self.phase, self.steps, now - self._phase_t0))
+        return {
+            "seconds": now - self.t0,
+            "nodes": self.nodes,
+            "phases": phases,
+            "prunes": dict(self.prunes),
+            "improvements": list(self.improvements),
+            "timers": dict(self.timers),
+        }
+
     def add(self, n=1, extra=""):
         """Cheap increment for tight DFS. Time is checked every 8192 steps."""
         self.steps += n
@@ -80,8 +243,8 @@ class SearchProgress:
 
 
 class progress_scope:
-    def __init__(self, emit, interval=1.0):
-        self.progress = SearchProgress(emit, interval)
+    def __init__(self, emit, interval=1.0, batch=True):
+        self.progress = SearchProgress(emit, interval, batch)
 
     def __enter__(self):
         _tls.progress = self.progress
@@ -116,6 +279,44 @@ def _neighbors_of(i):
 NEIGHBORS = tuple(_neighbors_of(i) for i in range(N))
 NBR_MASK = tuple(sum(1 << n for n in NEIGHBORS[i]) for i in range(N))
 
+FULL = (1 << N) - 1
+LEFT_COL = sum(1 << (r * WIDTH) for r in range(HEIGHT))
+RIGHT_COL = LEFT_COL << (WIDTH - 1)
+
+
+def _ring_of(i):
+    """The 8 cells around i clockwise from N (N NE E SE S SW W NW); -1 off-board."""
+    r, c = divmod(i, WIDTH)
+    out = []
+    for dr, dc in ((-1, 0), (-1, 1), (0, 1), (1, 1), (1, 0), (1, -1), (0, -1), (-1, -1)):
+        nr, nc = r + dr, c + dc
+        out.append(nr * WIDTH + nc if 0 <= nr < HEIGHT and 0 <= nc < WIDTH else -1)
+    return tuple(out)
+
+
+def _ring_safe(bits):
+    """True if every open orthogonal ring cell lies on one arc of open ring cells.
+
+    Consecutive ring cells are grid neighbours, so the centre is then not a
+    cut vertex: any route through it can detour around the ring.
+    """
+    if bits == 0xFF:
+        return True
+    start = next(k for k in range(8) if not bits >> k & 1)
+    arc = 0
+    arc_of_orth = set()
+    for step in range(1, 9):
+        k = (start + step) % 8
+        if not bits >> k & 1:
+            arc += 1
+        elif k % 2 == 0:
+            arc_of_orth.add(arc)
+    return len(arc_of_orth) <= 1
+
+
+RING = tuple(_ring_of(i) for i in range(N))
+RING_SAFE = tuple(_ring_safe(bits) for bits in range(256))
+
 
 def coloring_allows_path(grid):
     """True iff a ham path is not ruled out by checkerboard coloring."""
@@ -216,6 +417,27 @@ def _color_of(i):
     return (r + c) & 1
 
 
+# Static tables for the fixed 10x9 geometry; per-board work is masking.
+COLOR_MASK = tuple(sum(1 << i for i in range(N) if _color_of(i) == k) for k in (0, 1))
+CELL_DIST = tuple(
+    abs(a // WIDTH - b // WIDTH) + abs(a % WIDTH - b % WIDTH)
+    for a in range(N)
+    for b in range(N)
+)  # flat [a * N + b]
+MAX_GAP = HEIGHT + WIDTH - 2
+AFTER = tuple(FULL ^ ((2 << i) - 1) for i in range(N))  # cells with index > i
+
+
+def _dist_rings(a):
+    rings = [0] * (MAX_GAP + 1)
+    for b in range(N):
+        rings[CELL_DIST[a * N + b]] |= 1 << b
+    return tuple(rings)
+
+
+DIST_RING = tuple(_dist_rings(a) for a in range(N))  # [a][d]: cells at gap d
+
+
 def _free_mask(grid):
     free = 0
     for r in range(HEIGHT):
@@ -248,12 +470,46 @@ def _reachable_mask(start, rem):
     return seen
 
 
+def _low_degree_masks(open_cells):
+    """(degree-0, degree-1) cells of open_cells, counted bit-parallel."""
+    up = (open_cells << WIDTH) & FULL
+    down = open_cells >> WIDTH
+    left = (open_cells << 1) & FULL & ~LEFT_COL
+    right = (open_cells >> 1) & ~RIGHT_COL
+    s1, k1 = up ^ down, up & down
+    s2, k2 = left ^ right, left & right
+    deg0 = open_cells & ~(up | down | left | right)
+    deg1 = open_cells & (s1 ^ s2) & ~(k1 | k2)
+    return deg0, deg1
+
+
+def _ring_bits(i, open_cells):
+    bits = 0
+    k = 0
+    for j in RING[i]:
+        if j >= 0 and open_cells >> j & 1:
+            bits |= 1 << k
+        k += 1
+    return bits
+
+
 def _early_impossible(grid):
     """Cheap graph prunes. True means no path. False means 'not sure'."""
+    rule = _early_rule(grid)
+    if rule is None:
+        return False
+    prog = current_progress()
+    if prog is not None:
+        prog.prune(f"early {rule}")
+    return True
+
+
+def _early_rule(grid):
+    """Name of the first _early_impossible prune that fires, or None."""
     free = _free_mask(grid)
     nfree = free.bit_count()
     if nfree <= 1:
-        return False
+        return None
     deg1 = []
     black = white = 0
     for i in range(N):
@@ -265,36 +521,29 @@ def _early_impossible(grid):
             white += 1
         d = _degree(i, free)
         if d == 0:
-            return True
+            return "isolated cell"
         if d == 1:
             deg1.append(i)
     if abs(black - white) > 1:
-        return True
+        return "colour count"
     start = (free & -free).bit_length() - 1
     if _reachable_mask(start, free) != free:
-        return True
+        return "disconnected"
     if len(deg1) > 2:
-        return True
+        return "dead ends"
     n = black + white
     if n % 2 == 1:
         majority = 1 if black > white else 0
         for i in deg1:
             if _color_of(i) != majority:
-                return True
+                return "dead end colour"
     elif len(deg1) == 2 and _color_of(deg1[0]) == _color_of(deg1[1]):
-        return True
-    return False
+        return "dead end colour"
+    return None
 
 
 def _color_count(rem):
-    black = 0
-    r = rem
-    while r:
-        b = r & -r
-        if _color_of(b.bit_length() - 1):
-            black += 1
-        r ^= b
-    return black
+    return (rem & COLOR_MASK[1]).bit_count()
 
 
 def _warnsdorff_dfs(
@@ -307,28 +556,57 @@ def _warnsdorff_dfs(
     node_limit=0,
     path=None,
     deadline=0.0,
+    cancel=None,
+    connected=False,
+    dead=None,
 ):
     """Exhaustive ham path from head covering rem. Neighbors in Warnsdorff order.
 
     Completeness: every neighbor is tried on backtrack. Speed: low-degree first,
     serpentine tie-break, forced corridors, connectivity only at branches.
     If path is a list, successful search appends cell indices in visit order.
+    Raises SolveCancelled once cancel is cancelled.
+
+    Per branch the degree prunes are a few mask operations, and the leftover
+    graph is flood-filled only when head may be a cut vertex: connected says
+    rem is known connected, and a head whose open neighbours share one arc of
+    its 8-cell ring cannot split it.
+
+    dead: optional DeadStates. States already proven dead are skipped, and
+    every state this call exhausts is recorded unless the search was cut.
     """
     prog = current_progress()
     added = 0
+    keys = []
 
-    def fail():
+    def fail(rule=None):
+        # rule is the full telemetry key: no string building per failed node
+        if rule is not None and prog is not None:
+            prog.prune(rule)
         if path is not None and added:
             del path[-added:]
+        if dead is not None and keys and not dead.cut:
+            dead.store(keys)
         return False
 
     while True:
+        if cancel is not None and cancel.cancelled:
+            raise SolveCancelled()
         if deadline and time.perf_counter() > deadline:
-            return fail()
+            if dead is not None:
+                dead.cut = True
+            return fail("dfs deadline")
+        if dead is not None:
+            key = _state_key(head, rem, required_end)
+            if dead.probe(key):
+                return fail("dfs dead state")
+            keys.append(key)
         if node_limit:
             nodes[0] += 1
             if nodes[0] > node_limit:
-                return fail()
+                if dead is not None:
+                    dead.cut = True
+                return fail("dfs node limit")
             if prog is not None:
                 prog.add(1)
         elif prog is not None:
@@ -338,30 +616,31 @@ def _warnsdorff_dfs(
                 if path is not None:
                     path.append(head)
                 return True
-            return fail()
+            return fail("dfs wrong end")
         if required_end is not None and head == required_end:
-            return fail()
+            return fail("dfs wrong end")
         white = nleft - black
         if nleft & 1:
             if _color_of(head):
                 if black != white + 1:
-                    return fail()
+                    return fail("dfs colour parity")
             elif white != black + 1:
-                return fail()
+                return fail("dfs colour parity")
         elif black != white:
-            return fail()
+            return fail("dfs colour parity")
         open_cells = rem ^ (1 << head)
         n_open = nleft - 1
         black_open = black - (1 if _color_of(head) else 0)
         nbrs = [n for n in NEIGHBORS[head] if open_cells & (1 << n)]
         if not nbrs:
-            return fail()
+            return fail("dfs stuck")
         isolated = [n for n in nbrs if (NBR_MASK[n] & open_cells) == 0]
         if isolated:
             if len(isolated) > 1 or n_open != 1:
-                return fail()
+                return fail("dfs isolated cell")
             nbrs = isolated
         if len(nbrs) == 1:
+            # A leaf of rem: dropping it keeps rem connected.
             if path is not None:
                 path.append(head)
                 added += 1
@@ -370,25 +649,21 @@ def _warnsdorff_dfs(
             nleft = n_open
             black = black_open
             continue
-        n_deg1 = 0
-        deg1_open = []
-        r = open_cells
-        while r:
-            b = r & -r
-            i = b.bit_length() - 1
-            d = (NBR_MASK[i] & open_cells).bit_count()
-            if d == 0:
-                return fail()
-            if d == 1:
-                n_deg1 += 1
-                if n_deg1 > 2:
-                    return fail()
-                deg1_open.append(i)
-            r ^= b
+        deg0, deg1 = _low_degree_masks(open_cells)
+        if deg0:
+            return fail("dfs isolated cell")
+        n_deg1 = deg1.bit_count()
+        if n_deg1 > 2:
+            return fail("dfs dead ends")
         if n_deg1 == 2:
-            nbrs = [n for n in nbrs if n in set(deg1_open)]
+            nbrs = [n for n in nbrs if deg1 >> n & 1]
             if not nbrs:
-                return fail()
+                return fail("dfs dead ends")
+        # Every neighbour continues into the same leftover graph, so one
+        # connectivity answer covers them all.
+        if not (connected and RING_SAFE[_ring_bits(head, open_cells)]):
+            if _reachable_mask(nbrs[0], open_cells) != open_cells:
+                return fail("dfs disconnected")
         hr = head // WIDTH
         nbrs.sort(
             key=lambda n: (
@@ -400,8 +675,6 @@ def _warnsdorff_dfs(
             path.append(head)
             added += 1
         for n in nbrs:
-            if _reachable_mask(n, open_cells) != open_cells:
-                continue
             if _warnsdorff_dfs(
                 n,
                 open_cells,
@@ -412,6 +685,9 @@ def _warnsdorff_dfs(
                 node_limit,
                 path,
                 deadline,
+                cancel,
+                True,
+                dead,
             ):
                 return True
         return fail()
@@ -431,13 +707,26 @@ def _path_starts(free, nfree, deg1):
     return starts
 
 
-def _exhaustive_ham_path(grid, node_limit=0, budgets=None, want_path=False, deadline=0.0):
+def _exhaustive_ham_path(
+    grid,
+    node_limit=0,
+    budgets=None,
+    want_path=False,
+    deadline=0.0,
+    cancel=None,
+    dead=None,
+    workers=0,
+):
     """Warnsdorff-ordered DFS. Completes every branch; no timeout-as-no.
 
     Iterative deepening over starts so a good endpoint is tried before
     exhausting a bad one. node_limit > 0 is a yes-filter only.
     budgets: explicit list; 0 means unlimited. Default IDA then unlimited.
     want_path: return [(row, col), ...] or None instead of True/False.
+    dead: DeadStates to share with other searches on this grid (one is
+    made per call otherwise), so later budgets skip proven-dead subtrees.
+    workers > 1: race the start cells of each budget in that many worker
+    processes (wall.pathpool); any start may win, not the first in order.
     """
     free = _free_mask(grid)
     nfree = free.bit_count()
@@ -455,18 +744,31 @@ def _exhaustive_ham_path(grid, node_limit=0, budgets=None, want_path=False, dead
             budgets = (node_limit,)
         else:
             budgets = (4_000, 16_000, 64_000, 0)
+    if workers > 1 and len(starts) > 1:
+        from .pathpool import shared_pool  # pathpool imports this module
+
+        found = shared_pool(workers).exhaustive_path(
+            free, nfree, black, starts, required_end, budgets, deadline, cancel
+        )
+        if found is None:
+            return None if want_path else False
+        return [divmod(i, WIDTH) for i in found] if want_path else True
+    if dead is None:
+        dead = DeadStates()
     prog = current_progress()
     for budget in budgets:
         label = "unlimited" if not budget else f"{budget:,} node cap"
         if prog is not None:
-            prog.set_phase(f"path DFS ({label})")
+            prog.set_phase(f"path DFS ({label}, {dead.summary()})")
         nodes = [0] if budget else None
         for s in starts:
             if budget:
                 nodes[0] = 0
             found = [] if want_path else None
+            dead.cut = False
             if _warnsdorff_dfs(
-                s, free, nfree, black, required_end, nodes, budget, found, deadline
+                s, free, nfree, black, required_end, nodes, budget, found, deadline,
+                cancel, False, dead,
             ):
                 if want_path:
                     return [divmod(i, WIDTH) for i in found]
@@ -478,242 +780,327 @@ def _in_bounds(x, y):
     return 0 <= x < WIDTH and 0 <= y < HEIGHT
 
 
+# Neighbour index in each of UP DOWN LEFT RIGHT, or -1 off the board.
+DIR_STEP = tuple(
+    tuple(
+        i + DY[d] * WIDTH + DX[d]
+        if _in_bounds(i % WIDTH + DX[d], i // WIDTH + DY[d])
+        else -1
+        for d in range(4)
+    )
+    for i in range(N)
+)
+# Direction nibbles (bit d = direction d): set bits, their count, and the
+# first set bit other than a given one (a snake piece's way out), or -1.
+NIB_DIRS = tuple(tuple(d for d in range(4) if nib >> d & 1) for nib in range(16))
+NIB_COUNT = tuple(len(dirs) for dirs in NIB_DIRS)
+NIB_OTHER = tuple(
+    tuple(next((d for d in NIB_DIRS[nib] if d != came), -1) for came in range(4))
+    for nib in range(16)
+)
+# PathBoard._adj tables: off-board directions of each cell as a nibble, and
+# (neighbour, direction bit, neighbour's bit pointing back) for the rest.
+EDGE_NIB = tuple(
+    sum(1 << d for d in range(4) if DIR_STEP[i][d] < 0) for i in range(N)
+)
+NBR_LINKS = tuple(
+    tuple(
+        (DIR_STEP[i][d], 1 << d, 1 << OPP[d]) for d in range(4) if DIR_STEP[i][d] >= 0
+    )
+    for i in range(N)
+)
+
+
 class PathBoard:
-    """Forced snake-fill + guess. 1=empty, 2=wall, 3=snake piece."""
+    """Forced snake-fill + guess. 1=empty, 2=wall, 3=snake piece.
 
-    last_win = None
-    __slots__ = ("w", "s", "nfree", "ends", "dead", "_g", "_deadline", "_timed_out")
+    Flat board: w[i] holds the cell state and s[i] the piece as a direction
+    nibble, i = y * WIDTH + x. Placing a piece marks its neighbours dirty
+    (every empty cell when the end count changes), and force() only
+    re-examines dirty cells, in the same row-major sweeps as a full rescan,
+    so it reaches the same fixed point. Guesses push placements on a trail
+    and undo them instead of cloning the board.
+
+    Search methods return the winning (fully filled) board, or False. The
+    win travels up the call chain, so concurrent solves never share state.
+    """
+
+    __slots__ = (
+        "w", "s", "nfree", "ends", "dead", "_dirty", "_trail",
+        "_deadline", "_timed_out", "_cancel",
+    )
 
-    def __init__(self, grid):
-        self.w = [row[:] for row in grid]
-        self.s = [[[0, 0, 0, 0] for _ in range(WIDTH)] for _ in range(HEIGHT)]
+    def __init__(self, grid, cancel=None):
+        self.w = bytearray(cell for row in grid for cell in row)
+        self.s = bytearray(N)
         self.nfree = sum(cell != WALL for row in grid for cell in row)
         self.ends = 0
         self.dead = False
-        self._g = 0
+        self._dirty = FULL
+        self._trail = []
         self._deadline = 0.0
         self._timed_out = False
+        self._cancel = cancel
 
     def clone(self):
         b = PathBoard.__new__(PathBoard)
-        b.w = [row[:] for row in self.w]
-        b.s = [[cell[:] for cell in row] for row in self.s]
+        b.w = self.w[:]
+        b.s = self.s[:]
         b.nfree = self.nfree
         b.ends = self.ends
         b.dead = self.dead
-        b._g = getattr(self, "_g", 0)
-        b._deadline = getattr(self, "_deadline", 0.0)
-        b._timed_out = getattr(self, "_timed_out", False)
+        b._dirty = self._dirty
+        b._trail = []
+        b._deadline = self._deadline
+        b._timed_out = self._timed_out
+        b._cancel = self._cancel
         return b
 
+    def _mark(self):
+        return len(self._trail), self.ends, self.dead, self._dirty
+
+    def _undo(self, mark):
+        """Take back every placement since mark (placements only fill empties)."""
+        n, self.ends, self.dead, self._dirty = mark
+        trail = self._trail
+        w = self.w
+        s = self.s
+        while len(trail) > n:
+            i = trail.pop()
+            w[i] = 1
+            s[i] = 0
+
+    def _adj(self, i):
+        """(blocked, heads) direction nibbles of cell i.
+
+        Blocked: off board, wall, or a snake piece not pointing at i.
+        Heads: snake pieces pointing at i.
+        """
+        w = self.w
+        s = self.s
+        blocked = EDGE_NIB[i]
+        heads = 0
+        for j, bit, back in NBR_LINKS[i]:
+            cell = w[j]
+            if cell == 2:
+                blocked |= bit
+            elif cell == 3:
+                if s[j] & back:
+                    heads |= bit
+                else:
+                    blocked |= bit
+        return blocked, heads
+
     def adj(self, x, y):
-        a = [0, 0, 0, 0]
-        for d in range(4):
-            nx, ny = x + DX[d], y + DY[d]
-            if not _in_bounds(nx, ny):
-                a[d] = 1
-            elif self.w[ny][nx] == 2:
-                a[d] = 1
-            elif self.w[ny][nx] == 3:
-                a[d] = 2 if self.s[ny][nx][OPP[d]] else 1
-        return a
+        """Per direction: 0 open, 1 blocked, 2 snake head pointing here."""
+        blocked, heads = self._adj(y * WIDTH + x)
+        return [
+            1 if blocked >> d & 1 else 2 if heads >> d & 1 else 0 for d in range(4)
+        ]
 
-    def place(self, x, y, dirs):
-        self.w[y][x] = 3
-        self.s[y][x] = [0, 0, 0, 0]
+    def _place(self, i, dirs):
+        self._trail.append(i)
+        self.w[i] = 3
+        nib = 0
         for d in dirs:
-            self.s[y][x][d] = 1
+            nib |= 1 << d
+        self.s[i] = nib
         if len(dirs) == 1:
             self.ends += 1
+            # force() rules read the end count, so every empty cell may move.
+            self._dirty = FULL
+        else:
+            self._dirty |= NBR_MASK[i]
 
-    def _other_dir(self, x, y, came):
-        found = None
-        for d in range(4):
-            if self.s[y][x][d] and d != came:
-                if found is not None:
-                    return found  # shouldn't happen
-                found = d
-        return found
+    def place(self, x, y, dirs):
+        self._place(y * WIDTH + x, dirs)
 
-    def _join_cycle_len(self, x, y, d1, d2):
-        """If connecting d1 and d2 at (x,y) closes a snake loop, return that
+    def _join_cycle_len(self, i, d1, d2):
+        """If connecting d1 and d2 at cell i closes a snake loop, return that
         loop length (including the new cell). Otherwise 0."""
-        n1x, n1y = x + DX[d1], y + DY[d1]
-        n2x, n2y = x + DX[d2], y + DY[d2]
-        if not (_in_bounds(n1x, n1y) and _in_bounds(n2x, n2y)):
+        w = self.w
+        s = self.s
+        n1 = DIR_STEP[i][d1]
+        n2 = DIR_STEP[i][d2]
+        if n1 < 0 or n2 < 0:
             return 0
-        if self.w[n1y][n1x] != 3 or self.w[n2y][n2x] != 3:
+        if w[n1] != 3 or w[n2] != 3:
             return 0
-        if not self.s[n1y][n1x][OPP[d1]] or not self.s[n2y][n2x][OPP[d2]]:
+        if not (s[n1] >> OPP[d1] & 1) or not (s[n2] >> OPP[d2] & 1):
             return 0
-        cx, cy = n1x, n1y
+        cur = n1
         came = OPP[d1]
         length = 1
         for _ in range(self.nfree + 2):
-            nxt = self._other_dir(cx, cy, came)
-            if nxt is None:
+            nxt = NIB_OTHER[s[cur]][came]
+            if nxt < 0:
                 return 0
-            nx, ny = cx + DX[nxt], cy + DY[nxt]
+            cur = DIR_STEP[cur][nxt]
             length += 1
-            if nx == n2x and ny == n2y:
+            if cur == n2:
                 return length + 1
-            cx, cy, came = nx, ny, OPP[nxt]
+            came = OPP[nxt]
         return 0
 
-    def join_ok(self, x, y, dirs):
-        """True if placing a through-piece is allowed. 'full' if it is a ham cycle."""
+    def _join_ok(self, i, dirs):
         if len(dirs) != 2:
             return True
-        loop = self._join_cycle_len(x, y, dirs[0], dirs[1])
+        loop = self._join_cycle_len(i, dirs[0], dirs[1])
         if not loop:
             return True
         if loop == self.nfree:
             return "full"
         return False
 
+    def join_ok(self, x, y, dirs):
+        """True if placing a through-piece is allowed. 'full' if it is a ham cycle."""
+        return self._join_ok(y * WIDTH + x, dirs)
+
     def force(self):
-        """Apply implied snake pieces. Returns True if a ham cycle/path is forced."""
-        while not self.dead:
-            changed = False
-            for y in range(HEIGHT):
-                for x in range(WIDTH):
-                    if self.w[y][x] != 1:
-                        continue
-                    a = self.adj(x, y)
-                    n_block = a.count(1)
-                    n_head = a.count(2)
-                    if n_head >= 3:
-                        self.dead = True
-                        return False
-                    if n_block == 4:
+        """Apply implied snake pieces. Returns the board if a ham cycle/path is forced.
+
+        Each sweep visits the dirty cells in row-major order. A placement at
+        i queues its newly dirty cells after i into this sweep and the rest
+        into the next one, just as a full rescan would see them.
+        """
+        w = self.w
+        pending = self._dirty
+        self._dirty = 0
+        while pending and not self.dead:
+            sweep = pending
+            pending = 0
+            while sweep:
+                low = sweep & -sweep
+                sweep ^= low
+                i = low.bit_length() - 1
+                if w[i] != 1:
+                    continue
+                blocked, heads = self._adj(i)
+                n_block = NIB_COUNT[blocked]
+                n_head = NIB_COUNT[heads]
+                if n_head >= 3 or n_block == 4:
+                    self.dead = True
+                    return False
+                if n_block == 3:
+                    if self.ends >= 2:
                         self.dead = True
                         return False
-                    if n_block == 3:
-                        if self.ends >= 2:
-                            self.dead = True
-                            return False
-                        d = next(d for d in range(4) if a[d] != 1)
-                        self.place(x, y, (d,))
-                        changed = True
-                        continue
-                    heads = [d for d in range(4) if a[d] == 2]
-                    opens = [d for d in range(4) if a[d] != 1]
-                    if len(heads) == 2:
-                        ok = self.join_ok(x, y, heads)
-                        if ok == "full":
-                            self.place(x, y, heads)
-                            return self._win()
-                        if ok:
-                            # Merge two snake heads. Safe when they are not
-                            # already on the same path; join_ok filters that.
-                            self.place(x, y, heads)
-                            changed = True
-                            continue
-                    if len(heads) == 2 and n_block == 2:
-                        ok = self.join_ok(x, y, heads)
-                        if ok == "full":
-                            self.place(x, y, heads)
-                            return self._win()
-                        if not ok:
+                    dirs = (NIB_DIRS[15 & ~blocked][0],)
+                elif n_head == 2:
+                    dirs = NIB_DIRS[heads]
+                    ok = self._join_ok(i, dirs)
+                    if ok == "full":
+                        self._place(i, dirs)
+                        return self._win()
+                    if not ok:
+                        # Both heads end one path: joining them here would
+                        # close a short loop, fatal unless i has a way out.
+                        if n_block == 2:
                             self.dead = True
                             return False
-                        self.place(x, y, heads)
-                        changed = True
                         continue
-                    if self.ends >= 2 and n_block == 2:
-                        ok = self.join_ok(x, y, opens)
-                        if ok == "full":
-                            self.place(x, y, opens)
-                            return self._win()
-                        if not ok:
-                            self.dead = True
-                            return False
-                        self.place(x, y, opens)
-                        changed = True
-            if not changed:
-                break
+                elif self.ends >= 2 and n_block == 2:
+                    dirs = NIB_DIRS[15 & ~blocked]
+                    ok = self._join_ok(i, dirs)
+                    if ok == "full":
+                        self._place(i, dirs)
+                        return self._win()
+                    if not ok:
+                        self.dead = True
+                        return False
+                else:
+                    continue
+                self._place(i, dirs)
+                dirty = self._dirty
+                self._dirty = 0
+                before = (1 << i) - 1
+                sweep |= dirty & ~before & ~low
+                pending |= dirty & before
         return False
 
-    def walk_from_end(self, x, y):
-        d = next(d for d in range(4) if self.s[y][x][d])
-        seen = {(x, y)}
+    def _walk_from_end(self, i):
+        s = self.s
+        w = self.w
+        d = NIB_DIRS[s[i]][0]
+        seen = {i}
         came = OPP[d]
-        cx, cy = x + DX[d], y + DY[d]
+        cur = DIR_STEP[i][d]
         for _ in range(self.nfree + 2):
-            if not _in_bounds(cx, cy) or self.w[cy][cx] != 3:
+            if cur < 0 or w[cur] != 3:
                 return 0
-            if (cx, cy) in seen:
+            if cur in seen:
                 return 0
-            seen.add((cx, cy))
-            nxt = self._other_dir(cx, cy, came)
-            if nxt is None:
+            seen.add(cur)
+            nxt = NIB_OTHER[s[cur]][came]
+            if nxt < 0:
                 return len(seen)
-            cx, cy, came = cx + DX[nxt], cy + DY[nxt], OPP[nxt]
+            cur, came = DIR_STEP[cur][nxt], OPP[nxt]
         return 0
 
+    def walk_from_end(self, x, y):
+        return self._walk_from_end(y * WIDTH + x)
+
+    def _snake_ends(self):
+        s = self.s
+        return [i for i in range(N) if self.w[i] == 3 and NIB_COUNT[s[i]] == 1]
+
     def is_cover(self):
+        w = self.w
+        s = self.s
+        if 1 in w:
+            return False
         ends = []
         snakes = 0
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if self.w[y][x] == 1:
+        for i in range(N):
+            if w[i] == 3:
+                snakes += 1
+                deg = NIB_COUNT[s[i]]
+                if deg == 1:
+                    ends.append(i)
+                elif deg != 2:
                     return False
-                if self.w[y][x] == 3:
-                    snakes += 1
-                    deg = sum(self.s[y][x])
-                    if deg == 1:
-                        ends.append((x, y))
-                    elif deg != 2:
-                        return False
         if snakes != self.nfree:
             return False
         if len(ends) == 2:
-            return self.walk_from_end(*ends[0]) == self.nfree
+            return self._walk_from_end(ends[0]) == self.nfree
         if len(ends) == 0 and snakes:
-            for y in range(HEIGHT):
-                for x in range(WIDTH):
-                    if self.w[y][x] == 3:
-                        loop = self._join_cycle_len(x, y, *[d for d in range(4) if self.s[y][x][d]][:2])
-                        # walk around using the piece itself: follow one dir all the way back
-                        ds = [d for d in range(4) if self.s[y][x][d]]
-                        if len(ds) != 2:
-                            return False
-                        seen = {(x, y)}
-                        cx, cy = x + DX[ds[0]], y + DY[ds[0]]
-                        came = OPP[ds[0]]
-                        for _ in range(self.nfree + 2):
-                            if not _in_bounds(cx, cy) or self.w[cy][cx] != 3:
-                                return False
-                            if (cx, cy) in seen:
-                                return False
-                            seen.add((cx, cy))
-                            nxt = self._other_dir(cx, cy, came)
-                            if nxt is None:
-                                return False
-                            nx, ny = cx + DX[nxt], cy + DY[nxt]
-                            if nx == x and ny == y:
-                                return len(seen) == self.nfree
-                            cx, cy, came = nx, ny, OPP[nxt]
-                        return False
+            start = w.find(3)
+            ds = NIB_DIRS[s[start]]
+            seen = {start}
+            cur = DIR_STEP[start][ds[0]]
+            came = OPP[ds[0]]
+            for _ in range(self.nfree + 2):
+                if cur < 0 or w[cur] != 3:
+                    return False
+                if cur in seen:
+                    return False
+                seen.add(cur)
+                nxt = NIB_OTHER[s[cur]][came]
+                if nxt < 0:
+                    return False
+                cur, came = DIR_STEP[cur][nxt], OPP[nxt]
+                if cur == start:
+                    return len(seen) == self.nfree
+            return False
         return False
 
     def pick_empty(self):
+        w = self.w
         best = None
         best_open = 5
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if self.w[y][x] != 1:
-                    continue
-                n_open = 4 - self.adj(x, y).count(1)
-                if n_open < best_open:
-                    best_open = n_open
-                    best = (x, y)
-                    if n_open <= 2:
-                        return best
+        i = w.find(1)
+        while i >= 0:
+            n_open = 4 - NIB_COUNT[self._adj(i)[0]]
+            if n_open < best_open:
+                best_open = n_open
+                best = (i % WIDTH, i // WIDTH)
+                if n_open <= 2:
+                    return best
+            i = w.find(1, i + 1)
         return best
 
     def guesses(self, x, y, allow_new_ends=False):
-        opens = [d for d in range(4) if self.adj(x, y)[d] != 1]
+        opens = NIB_DIRS[15 & ~self._adj(y * WIDTH + x)[0]]
         out = []
         for i in range(len(opens)):
             for j in range(i + 1, len(opens)):
@@ -727,87 +1114,83 @@ class PathBoard:
         """Return the covering path as (row, col) cells, or None."""
         if not self.is_cover():
             return None
-        ends = [
-            (x, y)
-            for y in range(HEIGHT)
-            for x in range(WIDTH)
-            if self.w[y][x] == 3 and sum(self.s[y][x]) == 1
-        ]
+        s = self.s
+        ends = self._snake_ends()
         if len(ends) == 2:
-            x, y = ends[0]
-            d = next(d for d in range(4) if self.s[y][x][d])
-            cells = [(y, x)]
+            i = ends[0]
+            d = NIB_DIRS[s[i]][0]
+            cells = [divmod(i, WIDTH)]
             came = OPP[d]
-            cx, cy = x + DX[d], y + DY[d]
+            cur = DIR_STEP[i][d]
             for _ in range(self.nfree):
-                cells.append((cy, cx))
-                nxt = self._other_dir(cx, cy, came)
-                if nxt is None:
+                cells.append(divmod(cur, WIDTH))
+                nxt = NIB_OTHER[s[cur]][came]
+                if nxt < 0:
                     return cells if len(cells) == self.nfree else None
-                cx, cy, came = cx + DX[nxt], cy + DY[nxt], OPP[nxt]
+                cur, came = DIR_STEP[cur][nxt], OPP[nxt]
             return None
         # cycle: pick any snake cell and walk
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if self.w[y][x] == 3:
-                    ds = [d for d in range(4) if self.s[y][x][d]]
-                    if len(ds) != 2:
-                        continue
-                    cells = [(y, x)]
-                    cx, cy = x + DX[ds[0]], y + DY[ds[0]]
-                    came = OPP[ds[0]]
-                    for _ in range(self.nfree):
-                        cells.append((cy, cx))
-                        if cx == x and cy == y:
-                            return cells[:-1]
-                        nxt = self._other_dir(cx, cy, came)
-                        if nxt is None:
-                            return None
-                        cx, cy, came = cx + DX[nxt], cy + DY[nxt], OPP[nxt]
-                    return None
+        start = self.w.find(3)
+        if start < 0:
+            return None
+        ds = NIB_DIRS[s[start]]
+        cells = [divmod(start, WIDTH)]
+        cur = DIR_STEP[start][ds[0]]
+        came = OPP[ds[0]]
+        for _ in range(self.nfree):
+            cells.append(divmod(cur, WIDTH))
+            if cur == start:
+                return cells[:-1]
+            nxt = NIB_OTHER[s[cur]][came]
+            if nxt < 0:
+                return None
+            cur, came = DIR_STEP[cur][nxt], OPP[nxt]
         return None
 
-
     def _win(self):
-        PathBoard.last_win = self
-        return True
+        return self
 
     def original_deg2(self):
-        cells = []
-        for y in range(HEIGHT):
-            for x in range(WIDTH):
-                if self.w[y][x] == 1 and self.adj(x, y).count(1) == 2:
-                    cells.append((x, y))
-        return cells
+        w = self.w
+        return [
+            (i % WIDTH, i // WIDTH)
+            for i in range(N)
+            if w[i] == 1 and NIB_COUNT[self._adj(i)[0]] == 2
+        ]
 
     def _place_through(self, x, y):
-        if self.w[y][x] != 1:
+        i = y * WIDTH + x
+        if self.w[i] != 1:
             return True
-        opens = [d for d in range(4) if self.adj(x, y)[d] != 1]
+        opens = NIB_DIRS[15 & ~self._adj(i)[0]]
         if len(opens) != 2:
             return True
-        ok = self.join_ok(x, y, opens)
+        ok = self._join_ok(i, opens)
         if ok == "full":
-            self.place(x, y, opens)
+            self._place(i, opens)
             return "full"
         if not ok:
             self.dead = True
             return False
-        self.place(x, y, opens)
+        self._place(i, opens)
         return True
 
     def _guess_rest(self, allow_new_ends=False):
         """Through-only fill by default (cycle-solver style). Nested endpoint
-        guesses explode; choose the two ends up front instead."""
-        self._g += 1
+        guesses explode; choose the two ends up front instead.
+
+        A failed call may leave its own forced pieces behind; callers undo
+        to their mark."""
         prog = current_progress()
         if prog is not None:
             prog.tick()
+        check_cancel(self._cancel)
         if self._deadline and time.perf_counter() > self._deadline:
             self._timed_out = True
             return False
-        if self.force():
-            return True
+        found = self.force()
+        if found:
+            return found
         if self.dead:
             return False
         if self.is_cover():
@@ -816,50 +1199,43 @@ class PathBoard:
         if cell is None:
             return False
         x, y = cell
+        i = y * WIDTH + x
         for piece in self.guesses(x, y, allow_new_ends=allow_new_ends):
-            nxt = self.clone()
             if len(piece) == 1:
-                if nxt.ends >= 2:
+                if self.ends >= 2:
                     continue
             else:
-                ok = nxt.join_ok(x, y, piece)
+                ok = self._join_ok(i, piece)
                 if ok == "full":
-                    nxt.place(x, y, piece)
-                    return nxt._win()
+                    self._place(i, piece)
+                    return self._win()
                 if not ok:
                     continue
-            nxt.place(x, y, piece)
-            if nxt._guess_rest(allow_new_ends=allow_new_ends):
-                return True
-            if nxt._timed_out:
-                self._timed_out = True
+            mark = self._mark()
+            self._place(i, piece)
+            found = self._guess_rest(allow_new_ends=allow_new_ends)
+            if found:
+                return found
+            if self._timed_out:
                 return False
+            self._undo(mark)
         return False
 
     def _dirs_of(self, cell):
         x, y = cell
-        return [d for d in range(4) if self.adj(x, y)[d] != 1]
+        return list(NIB_DIRS[15 & ~self._adj(y * WIDTH + x)[0]])
 
     def _legal_end_cells(self):
-        empties = [
-            (x, y)
-            for y in range(HEIGHT)
-            for x in range(WIDTH)
-            if self.w[y][x] == 1
-        ]
-        empties.sort(key=lambda p: 4 - self.adj(p[0], p[1]).count(1))
+        w = self.w
+        empties = [(i % WIDTH, i // WIDTH) for i in range(N) if w[i] == 1]
+        empties.sort(key=lambda p: 4 - NIB_COUNT[self._adj(p[1] * WIDTH + p[0])[0]])
         n = self.nfree
 
         def col(p):
             return (p[0] + p[1]) & 1
 
         if n % 2 == 1:
-            black = sum(
-                1
-                for y in range(HEIGHT)
-                for x in range(WIDTH)
-                if self.w[y][x] != 2 and ((x + y) & 1)
-            )
+            black = sum(1 for i in range(N) if w[i] != 2 and _color_of(i))
             maj = 1 if black > n - black else 0
             return [p for p in empties if col(p) == maj], None
         return [p for p in empties if col(p) == 1], [p for p in empties if col(p) == 0]
@@ -867,28 +1243,32 @@ class PathBoard:
     def _try_end_pair(self, a, b):
         if a == b:
             return False
+        check_cancel(self._cancel)
         if self._deadline and time.perf_counter() > self._deadline:
             self._timed_out = True
             return False
+        ia = a[1] * WIDTH + a[0]
+        ib = b[1] * WIDTH + b[0]
         for da in self._dirs_of(a):
             for db in self._dirs_of(b):
-                c = self.clone()
-                c._g = 0
-                if c.w[a[1]][a[0]] != 1 or c.w[b[1]][b[0]] != 1:
+                if self.w[ia] != 1 or self.w[ib] != 1:
                     continue
-                c.place(a[0], a[1], (da,))
-                c.place(b[0], b[1], (db,))
-                if c._guess_rest(allow_new_ends=False):
-                    return True
-                if c._timed_out:
-                    self._timed_out = True
+                mark = self._mark()
+                self._place(ia, (da,))
+                self._place(ib, (db,))
+                found = self._guess_rest(allow_new_ends=False)
+                if found:
+                    return found
+                if self._timed_out:
                     return False
+                self._undo(mark)
         return False
 
     def _solve_remaining_ends(self):
         """Pick leftover endpoints among remaining empties, then through-fill."""
-        if self.force():
-            return True
+        found = self.force()
+        if found:
+            return found
         if self.dead:
             return False
         if self.is_cover():
@@ -898,12 +1278,7 @@ class PathBoard:
             return self._guess_rest(allow_new_ends=False)
         group_a, group_b = self._legal_end_cells()
         if need == 1:
-            already = [
-                (x, y)
-                for y in range(HEIGHT)
-                for x in range(WIDTH)
-                if self.w[y][x] == 3 and sum(self.s[y][x]) == 1
-            ]
+            already = [divmod(i, WIDTH)[::-1] for i in self._snake_ends()]
             placed_col = None
             if already:
                 placed_col = (already[0][0] + already[0][1]) & 1
@@ -911,56 +1286,65 @@ class PathBoard:
                 group_b if placed_col == 1 else group_a
             )
             for p in cands:
+                i = p[1] * WIDTH + p[0]
                 for d in self._dirs_of(p):
-                    c = self.clone()
-                    if c.w[p[1]][p[0]] != 1:
+                    if self.w[i] != 1:
                         continue
-                    c.place(p[0], p[1], (d,))
-                    if c._guess_rest(allow_new_ends=False):
-                        return True
+                    mark = self._mark()
+                    self._place(i, (d,))
+                    found = self._guess_rest(allow_new_ends=False)
+                    if found:
+                        return found
+                    self._undo(mark)
             return False
         if group_b is None:
             for i in range(len(group_a)):
                 for j in range(i + 1, len(group_a)):
-                    if self._try_end_pair(group_a[i], group_a[j]):
-                        return True
+                    found = self._try_end_pair(group_a[i], group_a[j])
+                    if found:
+                        return found
             return False
         for s in group_a:
             for t in group_b:
-                if self._try_end_pair(s, t):
-                    return True
+                found = self._try_end_pair(s, t)
+                if found:
+                    return found
         return False
 
     def _try_deg2_exceptions(self, deg2, exceptions, end_dirs):
-        b = self.clone()
+        mark = self._mark()
+        found = self._fill_deg2_exceptions(deg2, exceptions, end_dirs)
+        if not found:
+            self._undo(mark)
+        return found
+
+    def _fill_deg2_exceptions(self, deg2, exceptions, end_dirs):
         ex = set(exceptions)
         for (x, y), d in zip(exceptions, end_dirs):
-            if b.w[y][x] != 1:
+            i = y * WIDTH + x
+            if self.w[i] != 1:
                 return False
-            a = b.adj(x, y)
-            if a[d] == 1:
+            if self._adj(i)[0] >> d & 1:
                 return False
-            b.place(x, y, (d,))
+            self._place(i, (d,))
         for x, y in deg2:
             if (x, y) in ex:
                 continue
-            r = b._place_through(x, y)
+            r = self._place_through(x, y)
             if r == "full":
-                return b._win()
+                return self._win()
             if not r:
                 return False
-        if b.ends >= 2:
-            ok = b._guess_rest(allow_new_ends=False)
-        else:
-            ok = b._solve_remaining_ends()
-        if b._timed_out:
-            self._timed_out = True
-        return ok
+        if self.ends >= 2:
+            return self._guess_rest(allow_new_ends=False)
+        return self._solve_remaining_ends()
 
     def solve(self, time_limit=15.0):
+        """Winning PathBoard (read it with path_cells()), or False."""
         self._deadline = (time.perf_counter() + time_limit) if time_limit else 0.0
-        if self.force():
-            return True
+        found = self.force()
+        if found:
+            return found
         if self.dead:
             return False
         if self.is_cover():
@@ -970,21 +1354,14 @@ class PathBoard:
         if self.ends >= 2:
             return self._guess_rest()
 
-        def dirs_of(cell):
-            x, y = cell
-            return [d for d in range(4) if self.adj(x, y)[d] != 1]
+        dirs_of = self._dirs_of
 
         def cell_color(cell):
             return (cell[0] + cell[1]) & 1
 
         n = self.nfree
         if n % 2 == 1:
-            black = sum(
-                1
-                for y in range(HEIGHT)
-                for x in range(WIDTH)
-                if self.w[y][x] != 2 and ((x + y) & 1)
-            )
+            black = sum(1 for i in range(N) if self.w[i] != 2 and _color_of(i))
             majority = 1 if black > n - black else 0
             candidates = [c for c in all_deg2 if cell_color(c) == majority]
         else:
@@ -993,24 +1370,29 @@ class PathBoard:
 
         need = 2 - self.ends
         for k in range(need + 1):
+            check_cancel(self._cancel)
             if self._deadline and time.perf_counter() > self._deadline:
                 self._timed_out = True
                 return False
             if k == 0:
-                if self._try_deg2_exceptions(all_deg2, [], []):
-                    return True
+                found = self._try_deg2_exceptions(all_deg2, [], [])
+                if found:
+                    return found
                 continue
             if k == 1:
                 for cell in candidates:
+                    check_cancel(self._cancel)
                     if self._deadline and time.perf_counter() > self._deadline:
                         self._timed_out = True
                         return False
                     for d in dirs_of(cell):
-                        if self._try_deg2_exceptions(all_deg2, [cell], [d]):
-                            return True
+                        found = self._try_deg2_exceptions(all_deg2, [cell], [d])
+                        if found:
+                            return found
                 continue
             for i in range(len(candidates)):
                 for j in range(i + 1, len(candidates)):
+                    check_cancel(self._cancel)
                     if self._deadline and time.perf_counter() > self._deadline:
                         self._timed_out = True
                         return False
@@ -1019,8 +1401,9 @@ class PathBoard:
                         continue
                     for da in dirs_of(a):
                         for db in dirs_of(b):
-                            if self._try_deg2_exceptions(all_deg2, [a, b], [da, db]):
-                                return True
+                            found = self._try_deg2_exceptions(all_deg2, [a, b], [da, db])
+                            if found:
+                                return found
         return False
 
 
@@ -1029,7 +1412,7 @@ def _warnsdorff_yes(grid, node_limit=12000):
     return _exhaustive_ham_path(grid, node_limit=node_limit)
 
 
-def has_hamiltonian_path(array, node_limit=0):
+def has_hamiltonian_path(array, node_limit=0, cancel=None):
     """Return True iff the open cells admit a Hamiltonian path.
 
     Exhaustive Warnsdorff-ordered DFS with iterative deepening. Stops at
@@ -1045,16 +1428,17 @@ def has_hamiltonian_path(array, node_limit=0):
     nfree = sum(cell != WALL for row in array for cell in row)
     if nfree <= 1:
         return True
-    board = PathBoard(array)
+    board = PathBoard(array, cancel=cancel)
     if board.force():
         return True
     if board.dead:
         return False
-    if _exhaustive_ham_path(array, budgets=(4_000, 16_000)):
+    dead = DeadStates()
+    if _exhaustive_ham_path(array, budgets=(4_000, 16_000), cancel=cancel, dead=dead):
         return True
     if node_limit:
         return False
-    return _exhaustive_ham_path(array, budgets=(0,))
+    return _exhaustive_ham_path(array, budgets=(0,), cancel=cancel, dead=dead)
 
 
 def tour_from_snakemap(wmap, smap):
@@ -1126,7 +1510,7 @@ def tour_from_snakemap(wmap, smap):
     return cells if len(cells) == nfree else None
 
 
-def _warnsdorff_tour(grid, node_limit=12000):
+def _warnsdorff_tour(grid, node_limit=12000, cancel=None):
     """Return a Hamiltonian path as (row, col) cells, or None."""
     free = _free_mask(grid)
     nfree = free.bit_count()
@@ -1157,6 +1541,7 @@ def _warnsdorff_tour(grid, node_limit=12000):
         nodes += 1
         if nodes > node_limit:
             return False
+        check_cancel(cancel)
         if prog is not None:
             prog.add(1)
         path.append(head)
@@ -1210,11 +1595,13 @@ def min_path_end_gap(nfree, cycle_possible=False):
     return 1 if cycle_possible else 3
 
 
-def find_hamiltonian_path(grid, time_limit=None):
+def find_hamiltonian_path(grid, time_limit=None, cancel=None, workers=0):
     """Return covering path as [(row, col), ...], or None if none found.
 
     First path is enough; does not search for closer endpoints.
-    time_limit None: 0s under a progress scope (batch), else 15s.
+    time_limit None: 0s under a batch progress scope, else 15s.
+    cancel: optional CancelToken; raises SolveCancelled when it fires.
+    workers > 1: run the exhaustive DFS start cells in worker processes.
     """
     if len(grid) != HEIGHT or len(grid[0]) != WIDTH:
         raise ValueError(f"expected {HEIGHT}x{WIDTH} grid")
@@ -1232,36 +1619,83 @@ def find_hamiltonian_path(grid, time_limit=None):
     prog = current_progress()
     if prog is not None:
         prog.set_phase("path Warnsdorff tour")
-    tour = _warnsdorff_tour(grid)
+    tour = _warnsdorff_tour(grid, cancel=cancel)
     if tour and verify_path(grid, tour):
         return tour
     if time_limit is None:
-        limit = 0.0 if prog is not None else 15.0
+        limit = 0.0 if prog is not None and prog.batch else 15.0
     else:
         limit = float(time_limit)
     deadline = (time.perf_counter() + limit) if limit else 0.0
     # Same DFS the processor uses for has_path; PathBoard.solve often misses it.
     found = _exhaustive_ham_path(
-        grid, want_path=True, deadline=deadline, budgets=(4_000, 16_000, 0)
+        grid, want_path=True, deadline=deadline, budgets=(4_000, 16_000, 0),
+        cancel=cancel, workers=workers,
     )
     if found and verify_path(grid, found):
         return found
     if prog is not None:
         prog.set_phase("path forced-fill search")
-    if PathBoard(grid).solve(time_limit=limit) and PathBoard.last_win:
-        cells = PathBoard.last_win.path_cells()
+    win = PathBoard(grid, cancel=cancel).solve(time_limit=limit)
+    if win:
+        cells = win.path_cells()
         if cells and verify_path(grid, cells):
             return cells
     return None
 
 
 def _cell_manhattan(a, b):
-    r1, c1 = divmod(a, WIDTH)
-    r2, c2 = divmod(b, WIDTH)
-    return abs(r1 - r2) + abs(c1 - c2)
+    return CELL_DIST[a * N + b]
+
+
+def _gap_pairs(free, lo, hi, dead_end=-1):
+    """Unordered endpoint pairs (a < b) of free cells by gap, lo <= gap < hi.
+
+    Only pairs the checkerboard allows: the majority colour at both ends
+    for an odd cell count, one end of each colour for an even one.
+    dead_end: a lone degree-1 cell, which must then be one of the ends.
+    """
+    nfree = free.bit_count()
+    black = free & COLOR_MASK[1]
+    white = free & COLOR_MASK[0]
+    if nfree % 2:
+        ends = black if black.bit_count() > white.bit_count() else white
+        partner = (ends, ends)
+    else:
+        ends = free
+        partner = (black, white)  # indexed by the colour of a
+    hi = min(hi, MAX_GAP + 1)
+    by_dist = {}
+    starts = (1 << dead_end) & ends if dead_end >= 0 else ends
+    while starts:
+        low = starts & -starts
+        starts ^= low
+        a = low.bit_length() - 1
+        rings = DIST_RING[a]
+        others = partner[(COLOR_MASK[1] >> a) & 1]
+        if dead_end < 0:
+            others &= AFTER[a]
+        for d in range(lo, hi):
+            m = rings[d] & others
+            if not m:
+                continue
+            pairs = by_dist.setdefault(d, [])
+            while m:
+                low = m & -m
+                m ^= low
+                b = low.bit_length() - 1
+                pairs.append((a, b) if a < b else (b, a))
+    return by_dist
 
 
-def _path_between(grid, start, end, node_limit, deadline):
+def end_pairs(grid, lo=1, hi=N):
+    """Every endpoint pair (a < b) the checkerboard allows a Ham Path of
+    grid, gap lo <= gap < hi, as cell indices."""
+    by_dist = _gap_pairs(_free_mask(grid), lo, hi)
+    return [pair for pairs in by_dist.values() for pair in pairs]
+
+
+def _path_between(grid, start, end, node_limit, deadline, cancel=None, dead=None):
     """Ham path from start index to end index, or None."""
     free = _free_mask(grid)
     nfree = free.bit_count()
@@ -1271,6 +1705,8 @@ def _path_between(grid, start, end, node_limit, deadline):
         return [divmod(start, WIDTH)] if nfree == 1 else None
     path = []
     nodes = [0] if node_limit else None
+    if dead is not None:
+        dead.cut = False
     if _warnsdorff_dfs(
         start,
         free,
@@ -1281,6 +1717,9 @@ def _path_between(grid, start, end, node_limit, deadline):
         node_limit,
         path,
         deadline,
+        cancel,
+        False,
+        dead,
     ):
         tour = [divmod(i, WIDTH) for i in path]
         return tour if verify_path(grid, tour) else None
@@ -1291,41 +1730,150 @@ def _cells_to_idx(tour):
     return [r * WIDTH + c for r, c in tour]
 
 
-def _idx_to_cells(path):
-    return [divmod(i, WIDTH) for i in path]
+def _edge_keys():
+    """Random 64-bit key per grid edge, flat [u * N + v] both ways round."""
+    rng = random.Random(N)
+    keys = [0] * (N * N)
+    for u in range(N):
+        for v in NEIGHBORS[u]:
+            if u < v:
+                keys[u * N + v] = keys[v * N + u] = rng.getrandbits(64)
+    return tuple(keys)
 
 
-def _posa_from_tail(path):
-    """Posa rotations that keep a Hamiltonian path and change the tail."""
-    n = len(path)
-    pos = {v: i for i, v in enumerate(path)}
-    tail = path[-1]
-    out = []
-    for nbr in NEIGHBORS[tail]:
-        i = pos.get(nbr)
-        if i is None or i >= n - 2:
-            continue
-        out.append(path[: i + 1] + path[-1:i:-1])
-    return out
+# Zobrist keys: a path hashes to the XOR of its edges, and a rotation swaps
+# one edge for another, so a child's hash is known before it is built.
+_EDGE_KEY = _edge_keys()
+
+
+class _RotationPath:
+    """Covering path kept as a cycle array with one virtual edge a-b.
+
+    A Posa rotation is a 2-opt move on that cycle, so it reverses whichever
+    side of the cut is shorter, in place, and positions stay current. The
+    move that links end e to grid neighbour v and leaves new end w is undone
+    by linking w to v, so search states need no path copies.
+    """
 
+    __slots__ = ("c", "pos", "n", "a", "b")
 
-def _rotation_improve(grid, tour, min_d, deadline=0.0, on_better=None, state_limit=20_000):
-    """BFS of Posa rotations from an existing covering path. Fast gap shrink."""
+    def __init__(self, path):
+        self.c = list(path)
+        self.n = len(path)
+        self.pos = [-1] * N
+        for i, v in enumerate(path):
+            self.pos[v] = i
+        self.a = path[0]
+        self.b = path[-1]
+
+    def moves(self):
+        """(end, neighbour, new end, kept end) for every rotation at either end."""
+        c, pos, n = self.c, self.pos, self.n
+        out = []
+        for e, f in ((self.a, self.b), (self.b, self.a)):
+            ie = pos[e]
+            fwd = c[(ie + 1) % n] == f
+            back = c[ie - 1] if fwd else c[(ie + 1) % n]
+            for v in NEIGHBORS[e]:
+                iv = pos[v]
+                if iv < 0 or v == back:
+                    continue
+                out.append((e, v, c[(iv + 1) % n] if fwd else c[iv - 1], f))
+        return out
+
+    def rotate(self, e, v):
+        """Link end e to its grid neighbour v; returns the new end."""
+        c, pos, n = self.c, self.pos, self.n
+        f = self.b if e == self.a else self.a
+        ie, iv = pos[e], pos[v]
+        if c[(ie + 1) % n] == f:
+            w = c[(iv + 1) % n]
+            lo, hi = iv + 1, ie
+        else:
+            w = c[iv - 1]
+            lo, hi = ie, iv - 1
+        length = (hi - lo) % n + 1
+        if 2 * length > n:
+            lo, hi, length = hi + 1, lo - 1, n - length
+        for _ in range(length >> 1):
+            i, j = lo % n, hi % n
+            x, y = c[i], c[j]
+            c[i] = y
+            pos[y] = i
+            c[j] = x
+            pos[x] = j
+            lo += 1
+            hi -= 1
+        self.a, self.b = w, f
+        return w
+
+    def cells(self):
+        """The path as [(row, col), ...] from end a."""
+        c, n = self.c, self.n
+        ia = self.pos[self.a]
+        step = -1 if c[(ia + 1) % n] == self.b else 1
+        return [divmod(c[(ia + k * step) % n], WIDTH) for k in range(n)]
+
+
+def _rotation_goto(rp, nodes, cur, target):
+    """Move rp from search node cur to target via their common ancestor.
+
+    nodes[i]: (parent, end, neighbour, new end, depth, ...).
+    """
+    down = []
+    while nodes[cur][4] > nodes[target][4]:
+        parent, _e, v, w = nodes[cur][:4]
+        rp.rotate(w, v)
+        cur = parent
+    while nodes[target][4] > nodes[cur][4]:
+        down.append(target)
+        target = nodes[target][0]
+    while cur != target:
+        parent, _e, v, w = nodes[cur][:4]
+        rp.rotate(w, v)
+        cur = parent
+        down.append(target)
+        target = nodes[target][0]
+    for node in reversed(down):
+        rp.rotate(nodes[node][1], nodes[node][2])
+    return down[0] if down else cur
+
+
+def _rotation_improve(
+    grid, tour, min_d, deadline=0.0, on_better=None, state_limit=20_000, cancel=None
+):
+    """Gap-first search of Posa rotations at both ends. Fast gap shrink.
+
+    States are whole paths (edge-set hashes), so one endpoint pair can be
+    reached by several paths with different rotations onwards. The memo
+    keeps the shortest rotation sequence to each pair for the reported path.
+    """
     if not tour or len(tour) <= 2:
         d = path_end_gap(tour)
         return tour, d, d is not None and d <= min_d
     start = _cells_to_idx(tour)
-    best_path = start
     best_d = _cell_manhattan(start[0], start[-1])
     if best_d <= min_d:
         return tour, best_d, True
-    seen = {(min(start[0], start[-1]), max(start[0], start[-1]))}
-    q = collections.deque([start])
+    rp = _RotationPath(start)
+    keys = _EDGE_KEY
+    dist = CELL_DIST
+    h = 0
+    for u, v in zip(start, start[1:]):
+        h ^= keys[u * N + v]
+    # nodes[i]: (parent, end, neighbour, new end, depth, hash)
+    nodes = [(-1, -1, -1, -1, 0, h)]
+    seen = {h}
+    best_key = (min(start[0], start[-1]), max(start[0], start[-1]))
+    memo = {best_key: 0}
+    heap = [(best_d, 0, 0)]
+    cur = 0
     prog = current_progress()
     if prog is not None:
         prog.set_phase(f"rotate endpoints (gap {best_d}, best {min_d})")
     steps = 0
-    while q:
+    while heap:
+        check_cancel(cancel)
         if deadline and time.perf_counter() > deadline:
             break
         steps += 1
@@ -1333,49 +1881,66 @@ def _rotation_improve(grid, tour, min_d, deadline=0.0, on_better=None, state_lim
             break
         if prog is not None and steps % 256 == 0:
             prog.add(256)
-        cur = q.popleft()
-        for base in (cur, cur[::-1]):
-            for nxt in _posa_from_tail(base):
-                a, b = nxt[0], nxt[-1]
-                key = (a, b) if a < b else (b, a)
-                if key in seen:
-                    continue
-                seen.add(key)
-                d = _cell_manhattan(a, b)
-                if d < best_d:
-                    best_d = d
-                    best_path = nxt
-                    cells = _idx_to_cells(nxt)
+        # Newest first within a gap keeps consecutive states a few moves apart.
+        _gap, _newest, node = heapq.heappop(heap)
+        cur = _rotation_goto(rp, nodes, cur, node)
+        depth = nodes[node][4] + 1
+        h = nodes[node][5]
+        for e, v, w, f in rp.moves():
+            ch = h ^ keys[v * N + w] ^ keys[e * N + v]
+            if ch in seen:
+                continue
+            seen.add(ch)
+            nodes.append((node, e, v, w, depth, ch))
+            child = len(nodes) - 1
+            key = (w, f) if w < f else (f, w)
+            known = memo.get(key)
+            if known is None or nodes[known][4] > depth:
+                memo[key] = child
+            d = dist[w * N + f]
+            if d < best_d:
+                best_d = d
+                best_key = key
+                if on_better is not None or best_d <= min_d:
+                    cur = _rotation_goto(rp, nodes, cur, child)
+                    cells = rp.cells()
                     if on_better is not None:
                         on_better(cells, best_d, best_d <= min_d)
-                    if prog is not None:
-                        prog.set_phase(
-                            f"rotate endpoints (gap {best_d}, best {min_d})"
-                        )
                     if best_d <= min_d:
                         return cells, best_d, True
-                q.append(nxt)
-    cells = _idx_to_cells(best_path)
-    return cells, best_d, best_d <= min_d
+                if prog is not None:
+                    prog.improved(best_d)
+                    prog.set_phase(f"rotate endpoints (gap {best_d}, best {min_d})")
+            heapq.heappush(heap, (d, -child, child))
+    _rotation_goto(rp, nodes, cur, memo[best_key])
+    return rp.cells(), best_d, best_d <= min_d
 
 
-def _pathboard_between(grid, start, end, deadline):
+def _pathboard_between(grid, start, end, deadline, cancel=None):
     """Forced-fill ham path with these ends. Returns (tour_or_None, timed_out)."""
     ra, ca = divmod(start, WIDTH)
     rb, cb = divmod(end, WIDTH)
-    board = PathBoard(grid)
+    board = PathBoard(grid, cancel=cancel)
     board._deadline = float(deadline or 0.0)
-    if board._try_end_pair((ca, ra), (cb, rb)):
-        win = PathBoard.last_win
-        if win:
-            cells = win.path_cells()
-            if cells and verify_path(grid, cells):
-                return cells, False
+    win = board._try_end_pair((ca, ra), (cb, rb))
+    if win:
+        cells = win.path_cells()
+        if cells and verify_path(grid, cells):
+            return cells, False
         return None, False
     return None, bool(board._timed_out)
 
 
-def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_possible=False):
+def improve_path_endpoints(
+    grid,
+    tour,
+    time_limit=90.0,
+    on_better=None,
+    cycle_possible=False,
+    cancel=None,
+    workers=0,
+    sat=False,
+):
     """Search for a covering path with a smaller head-tail gap.
 
     Rotates the current snake first, then tries closer endpoint pairs.
@@ -1383,6 +1948,11 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
     minimum so a hard gap-1 search cannot block finding gap 3/4.
     Calls on_better(tour, gap, best) on improvements.
     Returns (tour, gap, best). Timeouts / inconclusive mins never count as proven.
+    Raises SolveCancelled if cancel fires.
+    workers > 1: endpoint pairs that forced fill leaves open are raced in
+    that many worker processes, first success cancelling its siblings.
+    sat: also hand those pairs to the exact SAT back-end (wall.hamsat) in a
+    worker process; whichever of it and the DFS answers first decides the gap.
     """
     if not tour:
         return None, None, False
@@ -1395,13 +1965,14 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
         return tour, best_d, True
 
     free = _free_mask(grid)
-    deg1 = [i for i in range(N) if (free & (1 << i)) and _degree(i, free) == 1]
+    _deg0, deg1_mask = _low_degree_masks(free)
+    deg1 = [i for i in range(N) if deg1_mask >> i & 1]
     if len(deg1) == 2:
         return tour, best_d, True
 
     deadline = (time.perf_counter() + time_limit) if time_limit else 0.0
     tour, best_d, is_best = _rotation_improve(
-        grid, tour, min_d, deadline=deadline, on_better=on_better
+        grid, tour, min_d, deadline=deadline, on_better=on_better, cancel=cancel
     )
     if is_best or best_d <= min_d:
         return tour, best_d, True
@@ -1409,44 +1980,49 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
         return tour, best_d, False
 
     prog = current_progress()
-    cells = [i for i in range(N) if free & (1 << i)]
-    black = sum(1 for i in cells if _color_of(i))
-    white = len(cells) - black
+
+    # Endpoint pairs are retried under growing node caps; dead states found
+    # under a smaller cap (and by sibling pairs) stay dead under the next.
+    dead = DeadStates()
 
     def timed_out():
         return bool(deadline) and time.perf_counter() > deadline
 
-    def pair_ok(a, b):
-        if a == b:
-            return False
-        same = _color_of(a) == _color_of(b)
-        if nfree % 2:
-            if not same:
-                return False
-            majority = 1 if black > white else 0
-            if _color_of(a) != majority:
-                return False
-        elif same:
-            return False
-        if len(deg1) == 1 and a != deg1[0] and b != deg1[0]:
-            return False
-        return True
-
-    by_dist = {}
-    for i, a in enumerate(cells):
-        for b in cells[i + 1 :]:
-            d = _cell_manhattan(a, b)
-            if d < min_d or d >= best_d:
-                continue
-            if not pair_ok(a, b):
-                continue
-            by_dist.setdefault(d, []).append((a, b))
+    by_dist = _gap_pairs(free, min_d, best_d, deg1[0] if deg1 else -1)
     for d, pairs in by_dist.items():
         pairs.sort(key=lambda p: _degree(p[0], free) + _degree(p[1], free))
 
+    def orders(a, b):
+        """(start, end) orientations worth a DFS for the pair a, b."""
+        return [
+            (start, end)
+            for start, end in ((a, b), (b, a))
+            if not (len(deg1) == 1 and start != deg1[0])
+        ]
+
+    def found_path(cand, d):
+        nonlocal tour, best_d
+        tour = cand
+        best_d = d
+        if prog is not None:
+            prog.improved(d)
+        if on_better is not None:
+            on_better(tour, best_d, best_d <= min_d)
+        return "found"
+
+    def sat_answer(fut):
+        """(kind, tour) once the SAT worker settled the gap, else None."""
+        if not fut.done() or fut.cancelled() or fut.exception() is not None:
+            return None
+        kind, cand = fut.result()
+        if kind == "found" and not (
+            verify_path(grid, cand) and path_end_gap(cand) < best_d
+        ):
+            return None
+        return (kind, cand) if kind in ("found", "impossible") else None
+
     def try_gap(d):
         """Return 'found', 'impossible', 'inconclusive', or 'timeout'."""
-        nonlocal tour, best_d
         pairs = by_dist.get(d) or []
         if not pairs:
             return "impossible"
@@ -1459,15 +2035,43 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
             prune_until = time.perf_counter() + 0.08
             if deadline:
                 prune_until = min(prune_until, deadline)
-            cand, unsure = _pathboard_between(grid, a, b, prune_until)
+            cand, unsure = _pathboard_between(grid, a, b, prune_until, cancel)
             if cand:
-                tour = cand
-                best_d = d
-                if on_better is not None:
-                    on_better(tour, best_d, best_d <= min_d)
-                return "found"
+                return found_path(cand, d)
             if unsure:
                 leftover.append((a, b))
+        race = cancel
+        sat_job = None
+        if sat and leftover:
+            from .pathpool import shared_pool  # pathpool imports this module
+
+            sat_pool = shared_pool(1)
+            # The DFS stops as soon as the solver has a definite answer.
+            race = CancelToken(parent=cancel)
+            sat_job = sat_pool.sat_gap(grid, leftover, deadline)
+            sat_job.add_done_callback(
+                lambda fut: sat_answer(fut) is not None and race.cancel()
+            )
+        status = None
+        try:
+            status = dfs_gap(d, leftover, race)
+        except SolveCancelled:
+            check_cancel(cancel)  # else the solver answered first
+        finally:
+            if sat_job is not None:
+                sat_pool.unwind([sat_job])
+        if status in ("found", "impossible") or sat_job is None:
+            return status
+        answer = sat_answer(sat_job)
+        if answer is None:
+            return status
+        kind, cand = answer
+        if kind == "found":
+            return found_path(cand, d)
+        return "impossible"
+
+    def dfs_gap(d, leftover, token):
+        """DFS over the pairs forced fill left open, under growing node caps."""
         budgets = (16_000, 64_000, 250_000, 0)
         if len(leftover) < 80:
             budgets = (4_000,) + budgets
@@ -1479,26 +2083,38 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
             if prog is not None:
                 cap = "unlimited" if not node_limit else f"{node_limit:,} cap"
                 prog.set_phase(
-                    f"closest ends gap {d} ({cap}, {len(leftover)} pairs)"
+                    f"closest ends gap {d} ({cap}, {len(leftover)} pairs, "
+                    f"{dead.summary()})"
                 )
             still = []
-            for a, b in leftover:
+            if workers > 1 and len(leftover) > 1:
+                from .pathpool import shared_pool  # pathpool imports this module
+
+                cand, results = shared_pool(workers).pair_paths(
+                    grid, [orders(a, b) for a, b in leftover], node_limit, deadline,
+                    token,
+                )
+                if cand:
+                    return found_path(cand, d)
                 if timed_out():
                     return "timeout"
-                hit = False
-                for start, end in ((a, b), (b, a)):
-                    if len(deg1) == 1 and start != deg1[0]:
-                        continue
-                    cand = _path_between(grid, start, end, node_limit, deadline)
-                    if cand:
-                        tour = cand
-                        best_d = d
-                        if on_better is not None:
-                            on_better(tour, best_d, best_d <= min_d)
-                        return "found"
-                    hit = True
-                if node_limit or hit:
-                    still.append((a, b))
+                for pair, result in zip(leftover, results):
+                    if node_limit or result[1]:
+                        still.append(pair)
+            else:
+                for a, b in leftover:
+                    if timed_out():
+                        return "timeout"
+                    hit = False
+                    for start, end in orders(a, b):
+                        cand = _path_between(
+                            grid, start, end, node_limit, deadline, token, dead
+                        )
+                        if cand:
+                            return found_path(cand, d)
+                        hit = True
+                    if node_limit or hit:
+                        still.append((a, b))
             leftover = still if node_limit else []
         return "inconclusive" if leftover else "impossible"
 
@@ -1530,12 +2146,16 @@ def improve_path_endpoints(grid, tour, time_limit=90.0, on_better=None, cycle_po
     return tour, best_d, True
 
 
-def find_hamiltonian_path_closest_ends(grid, time_limit=90.0):
+def find_hamiltonian_path_closest_ends(
+    grid, time_limit=90.0, cancel=None, workers=0, sat=False
+):
     """First covering path, then a closer head-tail if time allows."""
-    tour = find_hamiltonian_path(grid)
+    tour = find_hamiltonian_path(grid, cancel=cancel, workers=workers)
     if not tour:
         return None
-    tour, _gap, _best = improve_path_endpoints(grid, tour, time_limit=time_limit)
+    tour, _gap, _best = improve_path_endpoints(
+        grid, tour, time_limit=time_limit, cancel=cancel, workers=workers, sat=sat
+    )
     return tour
 
 
@@ -1594,8 +2214,18 @@ def _self_test():
             small[r][c] = 1
     assert coloring_allows_path(small)
     assert has_hamiltonian_path(small)
-    assert PathBoard(small).solve()
-    assert verify_path(small, PathBoard.last_win.path_cells())
+    win = PathBoard(small).solve()
+    assert win and verify_path(small, win.path_cells())
+
+    board = PathBoard(empty)
+    assert not board.force()
+    before = (board.w[:], board.s[:], board.ends, board._dirty)
+    mark = board._mark()
+    board.place(0, 0, (1,))
+    board.place(2, 2, (0, 3))
+    board.force()
+    board._undo(mark)
+    assert (board.w, board.s, board.ends, board._dirty) == before
 
     split = _blank(2)
     split[0][0] = 1
@@ -1631,8 +2261,8 @@ def _self_test():
         line[0][c] = 1
     assert coloring_allows_path(line)
     assert has_hamiltonian_path(line)
-    assert PathBoard(line).solve()
-    assert verify_path(line, PathBoard.last_win.path_cells())
+    win = PathBoard(line).solve()
+    assert win and verify_path(line, win.path_cells())
 
     # Exhaustive leftover DFS (skip Warnsdorff) still decides these.
     assert _exhaustive_ham_path(empty)
@@ -1641,6 +2271,32 @@ def _self_test():
     assert not _exhaustive_ham_path(branch)
     assert _exhaustive_ham_path(line)
 
+    dead = DeadStates()
+    assert not _exhaustive_ham_path(branch, dead=dead)
+    assert dead.stores and not dead.cut
+    hits = dead.hits
+    assert not _exhaustive_ham_path(branch, dead=dead)
+    assert dead.hits > hits
+    tiny = DeadStates(limit=2)
+    tiny.store([1, 2, 3])
+    tiny.store([4, 5])
+    assert len(tiny) <= 2 * 3 and tiny.probe(4) and not tiny.probe(1)
+
+    snake = [r * WIDTH + (c if r % 2 == 0 else 3 - c) for r in range(3) for c in range(4)]
+    rect = _blank(2)
+    for i in snake:
+        rect[i // WIDTH][i % WIDTH] = 1
+    rp = _RotationPath(snake)
+    for e, v, w, f in rp.moves():
+        before = rp.cells()
+        assert rp.rotate(e, v) == w and {rp.a, rp.b} == {w, f}
+        assert verify_path(rect, rp.cells())
+        rp.rotate(w, v)
+        assert rp.cells() in (before, before[::-1])
+    assert len(_gap_pairs(FULL, 1, 2)[1]) == (WIDTH - 1) * HEIGHT + (HEIGHT - 1) * WIDTH
+    tour, gap, best = _rotation_improve(rect, [divmod(i, WIDTH) for i in snake], 3)
+    assert best and gap == 3 and verify_path(rect, tour) and path_end_gap(tour) == 3
+
     wall_bits = "1" + "0" * (N - 1)
     assert bits_flip_h(bits_flip_h(wall_bits)) == wall_bits
     assert bits_flip_v(bits_flip_v(wall_bits)) == wall_bits
@@ -1651,6 +2307,24 @@ def _self_test():
     assert has_hamiltonian_path(g) == has_hamiltonian_path(bits_to_grid(bits_flip_h(wall_bits)))
     assert has_hamiltonian_path(g) == has_hamiltonian_path(bits_to_grid(bits_flip_v(wall_bits)))
 
+    free = _free_mask(g)
+    deg0, deg1 = _low_degree_masks(free)
+    for i in range(N):
+        if free >> i & 1:
+            assert bool(deg0 >> i & 1) == (_degree(i, free) == 0)
+            assert bool(deg1 >> i & 1) == (_degree(i, free) == 1)
+    assert RING_SAFE[0xFF] and RING_SAFE[0b00000111]
+    assert not RING_SAFE[0b00000101] and not RING_SAFE[0b00010001]
+
+    stopped = CancelToken()
+    stopped.cancel()
+    try:
+        find_hamiltonian_path(empty, cancel=stopped)
+    except SolveCancelled:
+        pass
+    else:
+        raise AssertionError("cancelled search should raise SolveCancelled")
+
     print("hampath self-test ok")
 
 
@@ -0,0 +1,439 @@
+"""Exact closest-ends back-end: Ham Path with given endpoint pairs as SAT.
+
+The DFS in wall.hampath proves "no path for gap d" by exhausting every
+endpoint pair, which often outlasts the 90 s window. This module asks the
+same question of a small CDCL solver instead and is raced against the DFS
+(see improve_path_endpoints), so whichever finishes first answers.
+
+Encoding, one variable per grid edge between free cells plus one endpoint
+variable t(v) per cell:
+  degree(v) = 2 - t(v)              direct clauses over <= 4 edges
+  exactly two endpoints             at-least-one + sequential counter <= 2
+  t(a) -> OR t(b), (a, b) allowed   endpoints form one of the given pairs
+  no 2x2 square of four edges       cheap cycle cut up front
+Connectivity is lazy: every model whose edges hold a cycle S gets the cut
+"some edge leaves S" and the solver continues with its learnt clauses.
+
+Pure Python, no dependencies. Enable the race with WALLALL_SAT=1.
+"""
+
+import heapq
+import os
+import time
+
+from .hampath import HEIGHT, N, WALL, WIDTH, check_cancel, verify_path
+
+SAT_ENABLED = os.getenv("WALLALL_SAT", "0").strip().lower() in ("1", "true", "yes")
+
+_CHECK_EVERY = 256  # conflicts between deadline / cancel checks
+_RESTART_BASE = 100  # conflicts per Luby unit
+
+
+def _luby(i):
+    """i-th element (1-based) of the Luby restart sequence 1 1 2 1 1 2 4 ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    while (1 << k) - 1 != i:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+    return 1 << (k - 1)
+
+
+class Solver:
+    """Small incremental CDCL SAT solver.
+
+    Literals are DIMACS ints (v or -v, v >= 1). Two watched literals,
+    first-UIP learning with non-chronological backjumping, VSIDS-style
+    activities, phase saving and Luby restarts. Clauses may be added
+    between solve() calls; learnt clauses are kept.
+    """
+
+    def __init__(self):
+        self.nvars = 0
+        self.clauses = []
+        self.watches = [[], []]  # index 2v (v true watched) / 2v+1 (-v)
+        self.value = [0]  # per var: 1 true, -1 false, 0 unassigned
+        self.level = [0]
+        self.reason = [-1]
+        self.activity = [0.0]
+        self.phase = [False]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.var_inc = 1.0
+        self.heap = []
+        self.ok = True
+        self.conflicts = 0
+
+    def new_var(self):
+        self.nvars += 1
+        v = self.nvars
+        self.watches.extend(([], []))
+        self.value.append(0)
+        self.level.append(0)
+        self.reason.append(-1)
+        self.activity.append(0.0)
+        self.phase.append(False)
+        heapq.heappush(self.heap, (0.0, v))
+        return v
+
+    @staticmethod
+    def _w(lit):
+        return lit << 1 if lit > 0 else ((-lit) << 1) | 1
+
+    def _lit_value(self, lit):
+        v = self.value[lit if lit > 0 else -lit]
+        return v if lit > 0 else -v
+
+    def add_clause(self, lits):
+        """Add a clause at decision level 0. Returns False once unsatisfiable."""
+        if not self.ok:
+            return False
+        self._cancel_until(0)
+        out = []
+        for lit in lits:
+            val = self._lit_value(lit)
+            if val == 1 or -lit in out:
+                return True
+            if val == 0 and lit not in out:
+                out.append(lit)
+        if not out:
+            self.ok = False
+            return False
+        if len(out) == 1:
+            self._enqueue(out[0], -1)
+            if self._propagate() >= 0:
+                self.ok = False
+            return self.ok
+        self._attach(out)
+        return True
+
+    def _attach(self, lits):
+        ci = len(self.clauses)
+        self.clauses.append(lits)
+        self.watches[self._w(lits[0])].append(ci)
+        self.watches[self._w(lits[1])].append(ci)
+        return ci
+
+    def _enqueue(self, lit, reason):
+        v = lit if lit > 0 else -lit
+        self.value[v] = 1 if lit > 0 else -1
+        self.level[v] = len(self.trail_lim)
+        self.reason[v] = reason
+        self.trail.append(lit)
+
+    def _propagate(self):
+        """Unit propagation. Returns a conflicting clause index, or -1."""
+        value = self.value
+        clauses = self.clauses
+        watches = self.watches
+        trail = self.trail
+        while self.qhead < len(trail):
+            p = trail[self.qhead]
+            self.qhead += 1
+            false_lit = -p
+            wi = p << 1 | 1 if p > 0 else (-p) << 1
+            ws = watches[wi]
+            keep = []
+            n = len(ws)
+            k = 0
+            while k < n:
+                ci = ws[k]
+                k += 1
+                c = clauses[ci]
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], false_lit
+                first = c[0]
+                fv = value[first if first > 0 else -first]
+                if (fv if first > 0 else -fv) == 1:
+                    keep.append(ci)
+                    continue
+                for j in range(2, len(c)):
+                    lit = c[j]
+                    lv = value[lit if lit > 0 else -lit]
+                    if (lv if lit > 0 else -lv) != -1:
+                        c[1], c[j] = lit, false_lit
+                        watches[lit << 1 if lit > 0 else ((-lit) << 1) | 1].append(ci)
+                        break
+                else:
+                    keep.append(ci)
+                    if (fv if first > 0 else -fv) == -1:
+                        keep.extend(ws[k:])
+                        watches[wi] = keep
+                        self.qhead = len(trail)
+                        return ci
+                    self._enqueue(first, ci)
+            watches[wi] = keep
+        return -1
+
+    def _bump(self, v):
+        self.activity[v] += self.var_inc
+        if self.activity[v] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self.heap = [(-self.activity[u], u) for u in range(1, self.nvars + 1)
+                         if not self.value[u]]
+            heapq.heapify(self.heap)
+        elif not self.value[v]:
+            heapq.heappush(self.heap, (-self.activity[v], v))
+
+    def _analyze(self, confl):
+        """First-UIP learnt clause and the level to backjump to."""
+        seen = set()
+        learnt = [0]
+        counter = 0
+        p = 0
+        idx = len(self.trail) - 1
+        level_now = len(self.trail_lim)
+        while True:
+            c = self.clauses[confl]
+            for q in (c if p == 0 else c[1:]):
+                v = q if q > 0 else -q
+                if v not in seen and self.level[v] > 0:
+                    seen.add(v)
+                    self._bump(v)
+                    if self.level[v] >= level_now:
+                        counter += 1
+                    else:
+                        learnt.append(q)
+            while True:
+                p = self.trail[idx]
+                idx -= 1
+                if (p if p > 0 else -p) in seen:
+                    break
+            v = p if p > 0 else -p
+            seen.discard(v)
+            counter -= 1
+            if counter == 0:
+                break
+            confl = self.reason[v]
+        learnt[0] = -p
+        self.var_inc *= 1.05
+        if len(learnt) == 1:
+            return learnt, 0
+        best = max(range(1, len(learnt)), key=lambda i: self.level[abs(learnt[i])])
+        learnt[1], learnt[best] = learnt[best], learnt[1]
+        return learnt, self.level[abs(learnt[1])]
+
+    def _cancel_until(self, lvl):
+        if len(self.trail_lim) <= lvl:
+            return
+        start = self.trail_lim[lvl]
+        for lit in self.trail[start:]:
+            v = lit if lit > 0 else -lit
+            self.phase[v] = lit > 0
+            self.value[v] = 0
+            self.reason[v] = -1
+            heapq.heappush(self.heap, (-self.activity[v], v))
+        del self.trail[start:]
+        del self.trail_lim[lvl:]
+        self.qhead = start
+
+    def _decide(self):
+        heap = self.heap
+        value = self.value
+        while heap:
+            _act, v = heapq.heappop(heap)
+            if not value[v]:
+                return v if self.phase[v] else -v
+        for v in range(1, self.nvars + 1):
+            if not value[v]:
+                return v if self.phase[v] else -v
+        return 0
+
+    def solve(self, deadline=0.0, cancel=None):
+        """True (model in value), False (unsatisfiable) or None (timed out).
+
+        Raises SolveCancelled if cancel fires.
+        """
+        if not self.ok:
+            return False
+        if self._propagate() >= 0:
+            self.ok = False
+            return False
+        restart = 1
+        budget = _luby(restart) * _RESTART_BASE
+        while True:
+            confl = self._propagate()
+            if confl >= 0:
+                self.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learnt, back = self._analyze(confl)
+                self._cancel_until(back)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], -1)
+                else:
+                    self._enqueue(learnt[0], self._attach(learnt))
+                budget -= 1
+                if self.conflicts % _CHECK_EVERY == 0:
+                    check_cancel(cancel)
+                    if deadline and time.perf_counter() > deadline:
+                        self._cancel_until(0)
+                        return None
+                continue
+            if budget <= 0:
+                restart += 1
+                budget = _luby(restart) * _RESTART_BASE
+                self._cancel_until(0)
+                continue
+            lit = self._decide()
+            if not lit:
+                return True
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(lit, -1)
+
+    def model_true(self, v):
+        return self.value[v] == 1
+
+
+def _at_most(solver, lits, k):
+    """Sequential-counter encoding of sum(lits) <= k."""
+    n = len(lits)
+    if n <= k:
+        return
+    # s[i][j]: at least j+1 of lits[0..i] are true
+    s = [[solver.new_var() for _ in range(k)] for _ in range(n - 1)]
+    solver.add_clause([-lits[0], s[0][0]])
+    for j in range(1, k):
+        solver.add_clause([-s[0][j]])
+    for i in range(1, n - 1):
+        solver.add_clause([-lits[i], s[i][0]])
+        solver.add_clause([-s[i - 1][0], s[i][0]])
+        for j in range(1, k):
+            solver.add_clause([-lits[i], -s[i - 1][j - 1], s[i][j]])
+            solver.add_clause([-s[i - 1][j], s[i][j]])
+        solver.add_clause([-lits[i], -s[i - 1][k - 1]])
+    solver.add_clause([-lits[n - 1], -s[n - 2][k - 1]])
+
+
+class GapEncoding:
+    """Ham Path on the free cells of a 10x9 grid, endpoints from a pair list."""
+
+    def __init__(self, grid, pairs):
+        self.grid = grid
+        self.solver = solver = Solver()
+        free = [i for i in range(N) if grid[i // WIDTH][i % WIDTH] != WALL]
+        self.free = free
+        free_set = set(free)
+        self.edge = {}  # (u, v) with u < v -> var
+        self.incident = {i: [] for i in free}
+        for u in free:
+            r, c = divmod(u, WIDTH)
+            for v in ((u + 1) if c + 1 < WIDTH else -1, (u + WIDTH) if r + 1 < HEIGHT else -1):
+                if v in free_set:
+                    var = solver.new_var()
+                    self.edge[(u, v)] = var
+                    self.incident[u].append(var)
+                    self.incident[v].append(var)
+        self.end = {i: solver.new_var() for i in free}
+
+        for i in free:
+            edges = self.incident[i]
+            t = self.end[i]
+            solver.add_clause(list(edges))  # no isolated cell
+            for a in range(len(edges)):
+                for b in range(a + 1, len(edges)):
+                    solver.add_clause([-t, -edges[a], -edges[b]])
+                    for c in range(b + 1, len(edges)):
+                        solver.add_clause([-edges[a], -edges[b], -edges[c]])
+                solver.add_clause([t] + [e for e in edges if e != edges[a]])
+
+        ends = [self.end[i] for i in free]
+        solver.add_clause(ends)
+        _at_most(solver, ends, 2)
+
+        partners = {i: set() for i in free}
+        for a, b in pairs:
+            partners[a].add(b)
+            partners[b].add(a)
+        for i in free:
+            solver.add_clause([-self.end[i]] + [self.end[j] for j in sorted(partners[i])])
+
+        for u in free:
+            square = [(u, u + 1), (u, u + WIDTH), (u + 1, u + WIDTH + 1), (u + WIDTH, u + WIDTH + 1)]
+            if all(e in self.edge for e in square):
+                solver.add_clause([-self.edge[e] for e in square])
+
+    def _chosen(self):
+        adj = {i: [] for i in self.free}
+        for (u, v), var in self.edge.items():
+            if self.solver.model_true(var):
+                adj[u].append(v)
+                adj[v].append(u)
+        return adj
+
+    def _components(self, adj):
+        seen = set()
+        comps = []
+        for s in self.free:
+            if s in seen:
+                continue
+            comp = [s]
+            seen.add(s)
+            k = 0
+            while k < len(comp):
+                for nb in adj[comp[k]]:
+                    if nb not in seen:
+                        seen.add(nb)
+                        comp.append(nb)
+                k += 1
+            comps.append(comp)
+        return comps
+
+    def _cut(self, comp):
+        inside = set(comp)
+        return [
+            var
+            for (u, v), var in self.edge.items()
+            if (u in inside) != (v in inside)
+        ]
+
+    def solve(self, deadline=0.0, cancel=None):
+        """('found', tour), ('impossible', None) or ('timeout', None)."""
+        solver = self.solver
+        while True:
+            check_cancel(cancel)
+            sat = solver.solve(deadline=deadline, cancel=cancel)
+            if sat is None:
+                return "timeout", None
+            if not sat:
+                return "impossible", None
+            adj = self._chosen()
+            comps = self._components(adj)
+            if len(comps) == 1:
+                tour = self._tour(adj)
+                if tour and verify_path(self.grid, tour):
+                    return "found", tour
+                return "timeout", None
+            for comp in comps:
+                solver.add_clause(self._cut(comp))
+
+    def _tour(self, adj):
+        ends = [i for i in self.free if len(adj[i]) == 1]
+        if len(ends) != 2:
+            return None
+        prev, cur = -1, ends[0]
+        out = []
+        while True:
+            out.append(divmod(cur, WIDTH))
+            nxt = [nb for nb in adj[cur] if nb != prev]
+            if not nxt:
+                break
+            prev, cur = cur, nxt[0]
+        return out
+
+
+def gap_path(grid, pairs, deadline=0.0, cancel=None):
+    """Ham Path whose ends are one of pairs (cell index tuples), exactly.
+
+    Returns ('found', [(row, col), ...]), ('impossible', None) once no such
+    path exists, or ('timeout', None). Raises SolveCancelled if cancel fires.
+    """
+    if not pairs:
+        return "impossible", None
+    return GapEncoding(grid, pairs).solve(deadline=deadline, cancel=cancel)
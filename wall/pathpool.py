@@ -0,0 +1,318 @@
+"""Process-parallel covering-path search for wall.hampath.
+
+Start cells of the exhaustive DFS and endpoint pairs of one closest-ends
+gap are independent searches, so they fan out to worker processes here.
+Each batch of jobs gets its own stop flag, a byte in shared memory that
+the workers' CancelToken reads: the first success sets it and the
+siblings unwind at their next DFS node. A flag is cleared for reuse only
+once every job of its batch has finished, so no late job misses a stop,
+and concurrent solves on one pool never stop each other's jobs.
+
+Each worker keeps one DeadStates table for its lifetime. Dead-state keys
+describe the whole remaining board, so they stay valid across every job,
+whatever the start cell, pair, node cap or solve.
+
+Solves share one pool, shared_pool(), started on first use and kept for
+the life of the process, so worker start-up is paid once rather than per
+search. The exact SAT back-end (wall.hamsat) runs on it too, so it can
+race the DFS of the calling thread.
+
+Enable with WALLALL_WORKERS=<n>; 0 or 1 keeps the sequential search.
+"""
+
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from .hampath import (
+    CancelToken,
+    DeadStates,
+    SolveCancelled,
+    _path_between,
+    _warnsdorff_dfs,
+    current_progress,
+)
+from .hamsat import gap_path
+
+PATH_WORKERS = max(0, int(os.getenv("WALLALL_WORKERS", "0")))
+
+# The bot solves in asyncio.to_thread workers; forking a threaded process
+# is unsafe, so start workers from a clean interpreter.
+_START_METHOD = (
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+_POLL_SECONDS = 0.05
+_UNWIND_SECONDS = 5.0
+# Stop flags per pool: batches that can be in flight at once.
+_SLOTS = 64
+
+# Worker-process state: _flags by _init_worker, _stop per job by _in_slot.
+_flags = None
+_stop = None
+_dead = None
+
+
+class _Flag:
+    """Event-like view of one stop byte, for CancelToken."""
+
+    __slots__ = ("flags", "slot")
+
+    def __init__(self, flags, slot):
+        self.flags = flags
+        self.slot = slot
+
+    def set(self):
+        self.flags[self.slot] = 1
+
+    def is_set(self):
+        return self.flags[self.slot] != 0
+
+
+def _init_worker(flags):
+    global _flags, _dead
+    _flags = flags
+    _dead = DeadStates()
+
+
+def _in_slot(slot, fn, args):
+    """fn(*args) in a worker, with _stop reading the batch's flag."""
+    global _stop
+    _stop = CancelToken(_Flag(_flags, slot))
+    return fn(*args)
+
+
+def _deadline_in(seconds):
+    return (time.perf_counter() + seconds) if seconds else 0.0
+
+
+def _start_job(start, free, nfree, black, required_end, node_limit, seconds):
+    """Covering path from one start cell as cell indices, or None."""
+    path = []
+    nodes = [0] if node_limit else None
+    _dead.cut = False
+    try:
+        if _warnsdorff_dfs(
+            start, free, nfree, black, required_end, nodes, node_limit, path,
+            _deadline_in(seconds), _stop, False, _dead,
+        ):
+            return path
+    except SolveCancelled:
+        pass
+    return None
+
+
+def _pair_job(grid, orders, node_limit, seconds):
+    """(tour or None, tried) for one endpoint pair, both orientations."""
+    deadline = _deadline_in(seconds)
+    tried = False
+    try:
+        for start, end in orders:
+            tour = _path_between(grid, start, end, node_limit, deadline, _stop, _dead)
+            if tour:
+                return tour, True
+            tried = True
+    except SolveCancelled:
+        return None, True
+    return None, tried
+
+
+def _sat_job(grid, pairs, seconds):
+    """hamsat.gap_path in a worker: (status, tour or None)."""
+    try:
+        return gap_path(grid, pairs, _deadline_in(seconds), _stop)
+    except SolveCancelled:
+        return "timeout", None
+
+
+def _cancellable_job(fn, args):
+    """fn(*args, cancel=<the pool's stop token>) in a worker; None once stopped."""
+    try:
+        return fn(*args, cancel=_stop)
+    except SolveCancelled:
+        return None
+
+
+class PathPool:
+    """Worker processes plus one stop flag per batch of jobs."""
+
+    def __init__(self, workers):
+        ctx = multiprocessing.get_context(_START_METHOD)
+        self.workers = workers
+        self._flags = ctx.RawArray("b", _SLOTS)
+        self._free = list(range(_SLOTS))
+        self._running = [0] * _SLOTS  # unfinished futures per slot
+        self._lock = threading.Condition()
+        self._pool = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self._flags,),
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+    def close(self):
+        # Workers unwind within a DFS node once their flag is set. Waiting
+        # for them also keeps the flags alive until late starters read them.
+        for slot in range(_SLOTS):
+            self._flags[slot] = 1
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _submit(self, fn, jobs):
+        """Futures of fn(*job) per job, all under one fresh stop flag."""
+        with self._lock:
+            while not self._free:
+                self._lock.wait()
+            slot = self._free.pop()
+            self._running[slot] = len(jobs)
+        futures = [self._pool.submit(_in_slot, slot, fn, job) for job in jobs]
+        for fut in futures:
+            fut.slot = slot
+            fut.add_done_callback(self._job_done)
+        return futures
+
+    def _job_done(self, fut):
+        with self._lock:
+            self._running[fut.slot] -= 1
+            if not self._running[fut.slot]:
+                # Every job that could read this flag is over: safe to re-arm.
+                self._flags[fut.slot] = 0
+                self._free.append(fut.slot)
+                self._lock.notify()
+
+    def race(self, fn, jobs, won, deadline=0.0, cancel=None):
+        """Run fn(*job) for every job until won(result) holds for one of them.
+
+        Returns (winning result or None, results in job order). Jobs that
+        never finished (a win, the deadline, or cancel stopped them first)
+        have result None. Raises SolveCancelled if cancel fires.
+        """
+        futures = {fut: i for i, fut in enumerate(self._submit(fn, jobs))}
+        results = [None] * len(jobs)
+        winner = None
+        pending = set(futures)
+        prog = current_progress()
+        try:
+            while pending and winner is None:
+                if cancel is not None and cancel.cancelled:
+                    raise SolveCancelled()
+                if deadline and time.perf_counter() > deadline:
+                    break
+                done, pending = wait(
+                    pending, timeout=_POLL_SECONDS, return_when=FIRST_COMPLETED
+                )
+                for fut in done:
+                    result = fut.result()
+                    results[futures[fut]] = result
+                    if prog is not None:
+                        prog.tick()
+                    if winner is None and won(result):
+                        winner = result
+        finally:
+            self.unwind(pending)
+        return winner, results
+
+    def map_within(self, fn, jobs, deadline=0.0, cancel=None, on_result=None):
+        """fn(*job, cancel=token) for every job until the deadline.
+
+        Returns results in job order, None for jobs that did not finish.
+        on_result(result) sees each finished result as it arrives.
+        fn must be a module-level function so workers can import it.
+        Raises SolveCancelled if cancel fires.
+        """
+
+        def seen(result):
+            if on_result is not None and result is not None:
+                on_result(result)
+            return False
+
+        _winner, results = self.race(
+            _cancellable_job, [(fn, job) for job in jobs], seen, deadline, cancel
+        )
+        return results
+
+    def sat_gap(self, grid, pairs, deadline):
+        """Start hamsat.gap_path in a worker; its future yields (status, tour).
+
+        Stop it early with unwind([future]).
+        """
+        seconds = max(deadline - time.perf_counter(), 1e-3) if deadline else 0.0
+        return self._submit(_sat_job, [(grid, pairs, seconds)])[0]
+
+    def unwind(self, pending):
+        """Stop the unfinished futures' batches and wait (bounded) for them.
+
+        Their flags stay set until the last job of each batch has finished.
+        """
+        pending = [fut for fut in pending if not fut.done()]
+        if not pending:
+            return
+        for fut in pending:
+            self._flags[fut.slot] = 1
+            fut.cancel()
+        # Bounded: a broken pool never finishes its futures.
+        wait(pending, timeout=_UNWIND_SECONDS)
+
+    def exhaustive_path(
+        self, free, nfree, black, starts, required_end, budgets, deadline, cancel
+    ):
+        """Parallel _exhaustive_ham_path: cell indices of a covering path, or None."""
+        prog = current_progress()
+        for budget in budgets:
+            if deadline and time.perf_counter() > deadline:
+                return None
+            if prog is not None:
+                label = "unlimited" if not budget else f"{budget:,} node cap"
+                prog.set_phase(
+                    f"path DFS ({label}, {len(starts)} starts on {self.workers} workers)"
+                )
+            seconds = max(deadline - time.perf_counter(), 1e-3) if deadline else 0.0
+            jobs = [
+                (s, free, nfree, black, required_end, budget, seconds) for s in starts
+            ]
+            found, _results = self.race(
+                _start_job, jobs, lambda path: path is not None, deadline, cancel
+            )
+            if found is not None:
+                return found
+        return None
+
+    def pair_paths(self, grid, pair_orders, node_limit, deadline, cancel):
+        """Parallel leftover step of improve_path_endpoints.
+
+        pair_orders: [(start, end) orientations to try] per pair.
+        Returns (tour or None, [(tour, tried) or None per pair]).
+        """
+        seconds = max(deadline - time.perf_counter(), 1e-3) if deadline else 0.0
+        jobs = [(grid, orders, node_limit, seconds) for orders in pair_orders]
+        winner, results = self.race(
+            _pair_job, jobs, lambda result: bool(result[0]), deadline, cancel
+        )
+        return (winner[0] if winner else None), results
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool(workers):
+    """The process-wide pool with at least workers processes, started lazily.
+
+    A request for more workers than it has replaces it; the old pool
+    finishes its queued jobs and then exits. Fetch the pool per batch
+    rather than holding on to it across a solve.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None or _shared.workers < workers:
+            old = _shared
+            _shared = PathPool(workers)
+            if old is not None:
+                old._pool.shutdown(wait=False)
+        return _shared
@@ -6,10 +6,14 @@ dark checkerboard, zero gap, blue tapered body, Google-Snake head at path end.
 
 from __future__ import annotations
 
+import functools
 import io
 import math
 import os
-from typing import List, Optional, Sequence, Tuple
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from PIL import Image, ImageDraw, ImageFilter, ImageFont
 
@@ -35,6 +39,14 @@ PUPIL = (0x1A, 0x3A, 0x8A)
 NOSTRIL = (0x2A, 0x4A, 0x9A)
 TEXT = (232, 236, 241)
 
+# Analyse heatmap: what a one-cell edit still admits (wall.analyse statuses).
+HEAT = {
+    "cycle": (0x3F, 0xB9, 0x50),
+    "path": (0xE3, 0xA0, 0x08),
+    "none": (0xC0, 0x39, 0x2B),
+    "unknown": (0x5A, 0x5F, 0x6B),
+}
+
 Point = Tuple[float, float]
 Cell = Tuple[int, int]
 
@@ -60,13 +72,13 @@ def _mix(t: float) -> Tuple[int, int, int]:
     return tuple(int(round(h + (p - h) * t)) for h, p in zip(HEAD_COL, TIP_COL))
 
 
-def _cell_origin(r: int, c: int, x0: float, y0: float) -> Point:
-    return (x0 + c * CELL, y0 + r * CELL)
+def _cell_origin(r: int, c: int, x0: float, y0: float, cell: int = CELL) -> Point:
+    return (x0 + c * cell, y0 + r * cell)
 
 
-def _cell_center(r: int, c: int, x0: float, y0: float) -> Point:
-    x, y = _cell_origin(r, c, x0, y0)
-    return (x + CELL / 2, y + CELL / 2)
+def _cell_center(r: int, c: int, x0: float, y0: float, cell: int = CELL) -> Point:
+    x, y = _cell_origin(r, c, x0, y0, cell)
+    return (x + cell / 2, y + cell / 2)
 
 
 def _rot(local_x: float, local_y: float, ux: float, uy: float, ox: float, oy: float) -> Point:
@@ -99,8 +111,19 @@ def _stroke_seg(
         draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
 
 
-def _draw_snake(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float) -> None:
-    """Port of Board-tab showTour body + Google-Snake head (head = path end)."""
+def _draw_snake(
+    draw: ImageDraw.ImageDraw,
+    pts: Sequence[Point],
+    cell: float,
+    steps: Optional[range] = None,
+    head: bool = True,
+) -> None:
+    """Port of Board-tab showTour body + Google-Snake head (head = path end).
+
+    steps limits the body to those tour steps (step i joins pts[i] and
+    pts[i + 1]) and head=False leaves the head out, so a replay can add
+    the snake a few cells at a time with the finished snake's taper.
+    """
     n = len(pts)
     if n == 0:
         return
@@ -145,13 +168,12 @@ def _draw_snake(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float) ->
         poly.append((pts[i][0], pts[i][1], t_at(i)))
     poly.append((head_x, head_y, 0.0))
 
-    for i in range(len(poly) - 1):
+    for i in range(len(poly) - 1) if steps is None else steps:
         x0, y0, t0 = poly[i]
         x1, y1, t1 = poly[i + 1]
-        steps = 4
-        for s in range(steps):
-            u0 = s / steps
-            u1 = (s + 1) / steps
+        for s in range(4):
+            u0 = s / 4
+            u1 = (s + 1) / 4
             xa = x0 + (x1 - x0) * u0
             ya = y0 + (y1 - y0) * u0
             xb = x0 + (x1 - x0) * u1
@@ -159,6 +181,8 @@ def _draw_snake(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float) ->
             t = t0 * (1 - (u0 + u1) / 2) + t1 * ((u0 + u1) / 2)
             _stroke_seg(draw, (xa, ya), (xb, yb), width_at(t), _mix(t))
 
+    if not head:
+        return
     # Head (Google Snake style)
     col = _mix(0)
     neck_r = head_w / 2
@@ -196,15 +220,280 @@ def _draw_snake(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float) ->
         _circle(draw, _rot(lx, ly, ux, uy, head_x, head_y), rad, fill)
 
 
+@dataclass(frozen=True)
+class RenderProfile:
+    """Speed / quality trade-offs for render_board_png."""
+
+    scale: int  # supersampling factor; 1 draws at output size, no resize
+    shadow: bool  # blurred drop shadow under the snake
+    colors: int  # palette PNG with this many colours; 0 keeps RGB
+    optimize: bool  # PNG optimize pass (slower encode, fewer bytes)
+
+
+# FINAL is the Board-tab look. FAST is for interim "searching closer…"
+# frames that are replaced seconds later.
+FINAL = RenderProfile(scale=SCALE, shadow=True, colors=0, optimize=True)
+FAST = RenderProfile(scale=1, shadow=False, colors=64, optimize=False)
+PROFILES = {"final": FINAL, "fast": FAST}
+INTERIM_PROFILE = PROFILES.get(
+    os.getenv("WALLALL_INTERIM_RENDER", "fast").strip().lower(), FAST
+)
+
+# Replay GIF: one frame per few tour steps, then the finished board held.
+# Discord's upload limit is 10 MB per message without boosts; the board
+# PNG goes in the same message, so the GIF stays well under it.
+REPLAY_MAX_FRAMES = 60
+REPLAY_MAX_BYTES = 8 * 1024 * 1024
+REPLAY_FRAME_MS = 60
+REPLAY_HOLD_MS = 3000
+REPLAY_COLORS = 64
+
+
+def _metrics(scale: int) -> Tuple[int, int, int]:
+    """(PAD, FRAME, CELL) at another supersampling factor."""
+    return PAD // SCALE * scale, FRAME // SCALE * scale, BASE_CELL * scale
+
+
+def _board_size(title_h: int, scale: int) -> Tuple[int, int]:
+    pad, frame, cell = _metrics(scale)
+    return pad * 2 + frame * 2 + 10 * cell, title_h + pad * 2 + frame * 2 + 9 * cell
+
+
+@functools.lru_cache(maxsize=4)
+def _background(title_h: int, scale: int) -> Image.Image:
+    """Frame and checkerboard at scale, without walls or caption. Do not mutate.
+
+    About 5 MB per entry at SCALE, 0.6 MB at 1x: at most 20 MB cached.
+    """
+    pad, frame, cell = _metrics(scale)
+    width, height = _board_size(title_h, scale)
+    img = Image.new("RGB", (width, height), BG)
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle(
+        (pad, title_h + pad, width - pad, height - pad),
+        radius=FRAME_RADIUS // SCALE * scale,
+        fill=BOARD_BG,
+        outline=FRAME_COL,
+        width=frame,
+    )
+    for r in range(9):
+        for c in range(10):
+            x, y = _cell_origin(r, c, pad + frame, title_h + pad + frame, cell)
+            draw.rectangle((x, y, x + cell, y + cell), fill=CHK_B if (r + c) & 1 else CHK_A)
+    return img
+
+
+@functools.lru_cache(maxsize=4)
+def _wall_layer(walls: int, title_h: int, scale: int) -> Image.Image:
+    """_background plus the walls of bitmask walls (bit r * 10 + c). Do not mutate.
+
+    Sized for one solve's redraws (each profile, with and without a
+    caption), not for many patterns: as with _background, at most 20 MB.
+    """
+    img = _background(title_h, scale).copy()
+    draw = ImageDraw.Draw(img)
+    pad, frame, cell = _metrics(scale)
+    inner = pad + frame
+    while walls:
+        low = walls & -walls
+        walls ^= low
+        r, c = divmod(low.bit_length() - 1, 10)
+        x, y = _cell_origin(r, c, inner, title_h + inner, cell)
+        draw.rectangle((x, y, x + cell, y + cell), fill=WALL)
+    return img
+
+
+def _wall_mask(grid: Sequence[Sequence[int]]) -> int:
+    walls = 0
+    for r in range(9):
+        for c in range(10):
+            if grid[r][c] == 2:
+                walls |= 1 << (r * 10 + c)
+    return walls
+
+
+def _paste_shadow(img: Image.Image, pts: Sequence[Point], scale: int) -> None:
+    """Blurred snake shadow (Board feDropShadow), darkening img in place.
+
+    The shadow is soft and the image is downsampled by scale anyway, so
+    the mask is drawn and blurred at 1x on the snake's bounding box only,
+    then stretched back over that box.
+    """
+    cell = BASE_CELL * scale
+    blur = max(1.0, cell * 0.045)
+    margin = cell * 0.75 + 3 * blur
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    x0 = max(0, int((min(xs) - margin) // scale) * scale)
+    y0 = max(0, int((min(ys) - margin) // scale) * scale)
+    x1 = min(img.width // scale * scale, int(math.ceil((max(xs) + margin) / scale)) * scale)
+    y1 = min(img.height // scale * scale, int(math.ceil((max(ys) + margin) / scale)) * scale)
+    mask = Image.new("L", ((x1 - x0) // scale, (y1 - y0) // scale), 0)
+    _draw_snake_shadow(
+        ImageDraw.Draw(mask),
+        [((x - x0) / scale, (y - y0) / scale) for x, y in pts],
+        float(BASE_CELL),
+        ink=100,
+    )
+    mask = mask.filter(ImageFilter.GaussianBlur(radius=blur / scale))
+    mask = mask.resize((x1 - x0, y1 - y0), Image.Resampling.BILINEAR)
+    img.paste((0, 0, 0), (x0, y0, x1, y1), mask)
+
+
+def _draw_board(
+    grid: Sequence[Sequence[int]],
+    tour: Optional[Sequence[Cell]],
+    caption: str,
+    profile: RenderProfile,
+) -> Image.Image:
+    """Board image at output size, before PNG encoding."""
+    scale = profile.scale
+    pad, frame, cell = _metrics(scale)
+    title_h = 18 * scale if caption else 0
+    inner_x = pad + frame
+    inner_y = title_h + pad + frame
+    img = _wall_layer(_wall_mask(grid), title_h, scale).copy()
+    width, height = img.size
+
+    if caption:
+        draw = ImageDraw.Draw(img)
+        draw.text((pad, 6 * scale), caption, fill=TEXT, font=_font(10 * scale))
+
+    if tour:
+        pts: List[Point] = [_cell_center(r, c, inner_x, inner_y, cell) for r, c in tour]
+        if profile.shadow:
+            _paste_shadow(img, [(p[0], p[1] + cell * 0.05) for p in pts], scale)
+        _draw_snake(ImageDraw.Draw(img), pts, float(cell))
+
+    if scale > 1:
+        img = img.resize((width // scale, height // scale), Image.Resampling.LANCZOS)
+    return img
+
+
+def _encode(img: Image.Image, profile: RenderProfile) -> bytes:
+    if profile.colors:
+        img = img.quantize(profile.colors, method=Image.Quantize.FASTOCTREE)
+    buf = io.BytesIO()
+    img.save(buf, format="PNG", optimize=profile.optimize)
+    return buf.getvalue()
+
+
 def render_board_png(
     grid: Sequence[Sequence[int]],
     tour: Optional[Sequence[Cell]] = None,
     *,
     is_cycle: bool = False,
     caption: str = "",
+    profile: RenderProfile = FINAL,
+) -> bytes:
+    """PNG matching the local Wall Research Board tab (blue snake).
+
+    Frame, checkerboard and walls come from a cache keyed by the wall
+    mask; each call only adds the caption, the snake and its shadow.
+    profile picks supersampling, shadow and PNG encoding (FINAL or FAST).
+    """
+    return _encode(_draw_board(grid, tour, caption, profile), profile)
+
+
+def render_replay_gif(
+    grid: Sequence[Sequence[int]],
+    tour: Sequence[Cell],
+    *,
+    caption: str = "",
+    max_frames: int = REPLAY_MAX_FRAMES,
+    max_bytes: int = REPLAY_MAX_BYTES,
+) -> Optional[bytes]:
+    """Looping GIF of the snake tracing tour, ending on the finished board.
+
+    Frames are drawn at 1x on one canvas over the cached wall layer, each
+    adding only its new tour steps, and mapped onto the palette of the
+    finished board (so every frame shares one palette and Pillow stores
+    only the changed box). Long tours put several steps in a frame to stay
+    within max_frames; a GIF over max_bytes is retried with half the
+    frames. None if the tour is empty or even two frames are too big.
+    """
+    if not tour:
+        return None
+    pad, frame, cell = _metrics(1)
+    title_h = 18 if caption else 0
+    base = _wall_layer(_wall_mask(grid), title_h, 1).copy()
+    if caption:
+        ImageDraw.Draw(base).text((pad, 6), caption, fill=TEXT, font=_font(10))
+    inner = pad + frame
+    pts = [_cell_center(r, c, inner, title_h + inner, cell) for r, c in tour]
+    done = base.copy()
+    _draw_snake(ImageDraw.Draw(done), pts, float(cell))
+    palette = done.quantize(REPLAY_COLORS, method=Image.Quantize.FASTOCTREE)
+
+    total = max(1, len(pts) - 1)
+    frames_n = min(max_frames, total)
+    while frames_n >= 1:
+        per = -(-total // frames_n)
+        canvas = base.copy()
+        draw = ImageDraw.Draw(canvas)
+        frames = []
+        for start in range(0, total, per):
+            _draw_snake(draw, pts, float(cell), range(start, min(start + per, total)), head=False)
+            frames.append(canvas.quantize(palette=palette, dither=Image.Dither.NONE))
+        _draw_snake(draw, pts, float(cell), range(0), head=True)
+        frames.append(canvas.quantize(palette=palette, dither=Image.Dither.NONE))
+        buf = io.BytesIO()
+        frames[0].save(
+            buf,
+            format="GIF",
+            save_all=True,
+            append_images=frames[1:],
+            duration=[REPLAY_FRAME_MS] * (len(frames) - 1) + [REPLAY_HOLD_MS],
+            loop=0,
+        )
+        if buf.tell() <= max_bytes:
+            return buf.getvalue()
+        frames_n //= 2
+    return None
+
+
+def bench_profiles(repeat: int = 20) -> Dict[str, dict]:
+    """Median draw and encode milliseconds, and PNG bytes, per profile.
+
+    The board is open with a serpentine tour over all 90 cells, the
+    longest snake a board can have.
+    """
+    grid = [[1] * 10 for _ in range(9)]
+    tour = [(r, c if r % 2 == 0 else 9 - c) for r in range(9) for c in range(10)]
+    caption = "Ham Path · gap 9 · closest possible 1 · 0 walls · searching closer…"
+    report = {}
+    for name, profile in PROFILES.items():
+        _encode(_draw_board(grid, tour, caption, profile), profile)  # warm the caches
+        draw_ms, encode_ms = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            img = _draw_board(grid, tour, caption, profile)
+            mid = time.perf_counter()
+            png = _encode(img, profile)
+            draw_ms.append((mid - start) * 1000)
+            encode_ms.append((time.perf_counter() - mid) * 1000)
+        report[name] = {
+            "draw_ms": round(statistics.median(draw_ms), 2),
+            "encode_ms": round(statistics.median(encode_ms), 2),
+            "bytes": len(png),
+        }
+    return report
+
+
+def render_heatmap_png(
+    grid: Sequence[Sequence[int]],
+    statuses: Sequence[str],
+    *,
+    caption: str = "",
 ) -> bytes:
-    """PNG matching the local Wall Research Board tab (blue snake)."""
-    title_h = 18 * SCALE if caption else 0
+    """Board with every cell tinted by the status of toggling it.
+
+    statuses: one wall.analyse status per cell, row-major. Empty cells are
+    filled with the colour of adding a wall there; walls keep a dark core
+    inside a ring in the colour of removing them.
+    """
+    legend_h = 16 * SCALE
+    title_h = (18 * SCALE if caption else 0) + legend_h
     grid_w = 10 * CELL
     grid_h = 9 * CELL
     inner_x = PAD + FRAME
@@ -214,11 +503,22 @@ def render_board_png(
 
     img = Image.new("RGB", (width, height), BG)
     draw = ImageDraw.Draw(img)
-
+    font = _font(10 * SCALE)
     if caption:
-        draw.text((PAD, 6 * SCALE), caption, fill=TEXT, font=_font(10 * SCALE))
+        draw.text((PAD, 6 * SCALE), caption, fill=TEXT, font=font)
+    x = PAD
+    y = title_h - legend_h + 2 * SCALE
+    for name, label in (
+        ("cycle", "keeps a cycle"),
+        ("path", "keeps a path"),
+        ("none", "neither"),
+        ("unknown", "out of time"),
+    ):
+        box = 9 * SCALE
+        draw.rectangle((x, y, x + box, y + box), fill=HEAT[name])
+        draw.text((x + box + 3 * SCALE, y - SCALE), label, fill=TEXT, font=font)
+        x += box + 3 * SCALE + int(draw.textlength(label, font=font)) + 10 * SCALE
 
-    # Framed board
     draw.rounded_rectangle(
         (PAD, title_h + PAD, PAD + FRAME * 2 + grid_w, title_h + PAD + FRAME * 2 + grid_h),
         radius=FRAME_RADIUS,
@@ -226,31 +526,22 @@ def render_board_png(
         outline=FRAME_COL,
         width=FRAME,
     )
-
+    inset = CELL * 0.06
+    core = CELL * 0.22
     for r in range(9):
         for c in range(10):
-            x, y = _cell_origin(r, c, inner_x, inner_y)
+            x0, y0 = _cell_origin(r, c, inner_x, inner_y)
+            draw.rectangle(
+                (x0, y0, x0 + CELL, y0 + CELL), fill=CHK_B if (r + c) & 1 else CHK_A
+            )
+            heat = HEAT.get(statuses[r * 10 + c], HEAT["unknown"])
+            draw.rectangle(
+                (x0 + inset, y0 + inset, x0 + CELL - inset, y0 + CELL - inset), fill=heat
+            )
             if grid[r][c] == 2:
-                fill = WALL
-            else:
-                fill = CHK_B if (r + c) & 1 else CHK_A
-            draw.rectangle((x, y, x + CELL, y + CELL), fill=fill)
-
-    if tour:
-        pts: List[Point] = [_cell_center(r, c, inner_x, inner_y) for r, c in tour]
-        # Soft drop shadow (Board feDropShadow)
-        shadow = Image.new("RGBA", img.size, (0, 0, 0, 0))
-        sdraw = ImageDraw.Draw(shadow)
-        _draw_snake_shadow(
-            sdraw,
-            [(p[0], p[1] + CELL * 0.05) for p in pts],
-            float(CELL),
-        )
-        shadow = shadow.filter(ImageFilter.GaussianBlur(radius=max(1.0, CELL * 0.045)))
-        base = img.convert("RGBA")
-        img = Image.alpha_composite(base, shadow).convert("RGB")
-        draw = ImageDraw.Draw(img)
-        _draw_snake(draw, pts, float(CELL))
+                draw.rectangle(
+                    (x0 + core, y0 + core, x0 + CELL - core, y0 + CELL - core), fill=WALL
+                )
 
     out = img.resize((width // SCALE, height // SCALE), Image.Resampling.LANCZOS)
     buf = io.BytesIO()
@@ -258,7 +549,9 @@ def render_board_png(
     return buf.getvalue()
 
 
-def _draw_snake_shadow(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float) -> None:
+def _draw_snake_shadow(
+    draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: float, ink=(0, 0, 0, 100)
+) -> None:
     """Same geometry as _draw_snake but flat translucent black for blur shadow."""
     n = len(pts)
     if n == 0:
@@ -299,7 +592,6 @@ def _draw_snake_shadow(draw: ImageDraw.ImageDraw, pts: Sequence[Point], cell: fl
     for i in range(1, head_i):
         poly.append((pts[i][0], pts[i][1], t_at(i)))
     poly.append((head_x, head_y, 0.0))
-    ink = (0, 0, 0, 100)
     for i in range(len(poly) - 1):
         x0, y0, t0 = poly[i]
         x1, y1, t1 = poly[i + 1]
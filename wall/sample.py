@@ -0,0 +1,221 @@
+"""Random Wall All patterns: cycle / path / no-path rates and solver times.
+
+Sample i of seed s is new_pattern drawn from random.Random((s << 32) | i),
+so a (seed, n) pair names the same boards on every machine and commit.
+Each board is classified like an analyse edit (cycle if balanced and
+solvable, else path, else none; unknown once CELL_SECONDS run out) and
+timed. Samples fan out over wall.pathpool workers (WALLALL_WORKERS) and
+are folded into SampleStats as they arrive.
+
+Run as a benchmark:
+    SAMPLE_N=2000 SAMPLE_SEED=0 WALLALL_WORKERS=4 python3 -m wall.sample
+SAMPLE_JSON=<file> also writes the summary (with the slowest boards) as JSON.
+Same seed and n give the same boards, so the counts only move when a
+solver change does or when boards near CELL_SECONDS flip to or from unknown.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import math
+import os
+import random
+import time
+from dataclasses import asdict, dataclass
+from typing import Callable, Dict, List, Optional
+
+from . import new_pattern, pathpool
+from .analyse import CELL_SECONDS, CYCLE, NONE, PATH, UNKNOWN, cycle_coloring_ok, edit_status
+from .hampath import HEIGHT, WALL, WIDTH, check_cancel
+
+STATUSES = (CYCLE, PATH, NONE, UNKNOWN)
+Z_95 = 1.959964
+SLOWEST = 5
+
+
+@dataclass
+class Sample:
+    """One classified board: its seed index, pattern string, status and time."""
+
+    index: int
+    pattern: str
+    status: str
+    seconds: float
+
+
+def sample_grid(seed: int, index: int):
+    """The index-th random pattern of seed as a 1 / 2 grid."""
+    board = new_pattern(WIDTH, HEIGHT, random.Random((seed << 32) | index))
+    return [[WALL if cell == WALL else 1 for cell in row] for row in board]
+
+
+def _sample_job(seed, index, seconds, cancel=None):
+    grid = sample_grid(seed, index)
+    start = time.perf_counter()
+    status = edit_status(grid, None, cycle_coloring_ok(grid), seconds, cancel)
+    return Sample(
+        index,
+        "".join(str(cell) for row in grid for cell in row),
+        status,
+        time.perf_counter() - start,
+    )
+
+
+def wilson(hits: int, n: int, z: float = Z_95):
+    """(low, high) Wilson score interval for a rate of hits / n."""
+    if n == 0:
+        return 0.0, 1.0
+    p = hits / n
+    denom = 1 + z * z / n
+    centre = (p + z * z / (2 * n)) / denom
+    half = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / denom
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def _quantile(ordered: List[float], q: float) -> float:
+    """Nearest-rank quantile of an already sorted list."""
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q * len(ordered)) - 1))]
+
+
+class SampleStats:
+    """Running counts, rates and solve-time distributions of a sample."""
+
+    def __init__(self, seed: int = 0):
+        self.seed = seed
+        self.n = 0
+        self.counts: Dict[str, int] = {s: 0 for s in STATUSES}
+        self.times: Dict[str, List[float]] = {s: [] for s in STATUSES}
+        self._slowest: List[tuple] = []  # min-heap of (seconds, index, Sample)
+
+    def add(self, sample: Sample) -> None:
+        self.n += 1
+        self.counts[sample.status] += 1
+        self.times[sample.status].append(sample.seconds)
+        entry = (sample.seconds, sample.index, sample)
+        if len(self._slowest) < SLOWEST:
+            heapq.heappush(self._slowest, entry)
+        elif entry > self._slowest[0]:
+            heapq.heapreplace(self._slowest, entry)
+
+    def rate(self, status: str):
+        """(rate, low, high) of status, with its 95% interval."""
+        hits = self.counts[status]
+        low, high = wilson(hits, self.n)
+        return (hits / self.n if self.n else 0.0), low, high
+
+    def quantiles(self, status: Optional[str] = None) -> Dict[str, float]:
+        """p50 / p90 / p99 / max solve seconds of one status (or all)."""
+        if status is None:
+            ordered = sorted(t for s in STATUSES for t in self.times[s])
+        else:
+            ordered = sorted(self.times[status])
+        return {
+            "p50": _quantile(ordered, 0.50),
+            "p90": _quantile(ordered, 0.90),
+            "p99": _quantile(ordered, 0.99),
+            "max": ordered[-1] if ordered else 0.0,
+        }
+
+    def slowest(self) -> List[Sample]:
+        return [entry[2] for entry in sorted(self._slowest, reverse=True)]
+
+    def summary(self) -> str:
+        lines = [f"{self.n} patterns (seed {self.seed})"]
+        for status in STATUSES:
+            if status == UNKNOWN and not self.counts[status]:
+                continue
+            rate, low, high = self.rate(status)
+            q = self.quantiles(status)
+            lines.append(
+                f"  {status:<8}{self.counts[status]:>7}  {rate:6.2%}  "
+                f"[{low:6.2%}, {high:6.2%}]  "
+                f"p50 {q['p50'] * 1000:7.1f}ms  p90 {q['p90'] * 1000:7.1f}ms  "
+                f"max {q['max'] * 1000:7.1f}ms"
+            )
+        return "\n".join(lines)
+
+    def as_dict(self) -> dict:
+        out = {"seed": self.seed, "n": self.n, "statuses": {}}
+        for status in STATUSES:
+            rate, low, high = self.rate(status)
+            out["statuses"][status] = {
+                "count": self.counts[status],
+                "rate": rate,
+                "ci95": [low, high],
+                "seconds": self.quantiles(status),
+            }
+        out["seconds"] = self.quantiles()
+        out["slowest"] = [asdict(s) for s in self.slowest()]
+        return out
+
+
+def sample(
+    n: int,
+    seed: int = 0,
+    seconds: float = CELL_SECONDS,
+    workers: Optional[int] = None,
+    on_update: Optional[Callable[[SampleStats], None]] = None,
+    interval: float = 1.0,
+    cancel=None,
+) -> SampleStats:
+    """Classify n random patterns of seed; on_update(stats) every interval s.
+
+    Raises SolveCancelled if cancel fires.
+    """
+    if workers is None:
+        workers = pathpool.PATH_WORKERS
+    stats = SampleStats(seed)
+    last = [time.perf_counter()]
+
+    def add(result: Sample) -> None:
+        stats.add(result)
+        now = time.perf_counter()
+        if on_update is not None and now - last[0] >= interval:
+            last[0] = now
+            on_update(stats)
+
+    if workers > 1:
+        jobs = [(seed, i, seconds) for i in range(n)]
+        pathpool.shared_pool(workers).map_within(
+            _sample_job, jobs, cancel=cancel, on_result=add
+        )
+    else:
+        for i in range(n):
+            check_cancel(cancel)
+            add(_sample_job(seed, i, seconds, cancel))
+    if on_update is not None:
+        on_update(stats)
+    return stats
+
+
+def _main() -> None:
+    n = int(os.getenv("SAMPLE_N", "1000"))
+    seed = int(os.getenv("SAMPLE_SEED", "0"))
+    seconds = float(os.getenv("SAMPLE_SECONDS", str(CELL_SECONDS)))
+    out = os.getenv("SAMPLE_JSON", "")
+    workers = max(1, pathpool.PATH_WORKERS)
+    print(f"Sampling {n} patterns (seed {seed}) on {workers} worker(s)...")
+    start = time.perf_counter()
+    stats = sample(
+        n, seed, seconds, workers,
+        on_update=lambda s: print(f"  {s.n}/{n}", end="\r", flush=True),
+    )
+    print()
+    print(stats.summary())
+    print(f"  wall {time.perf_counter() - start:.1f}s")
+    for s in stats.slowest():
+        print(f"  slow {s.seconds * 1000:8.1f}ms  #{s.index} {s.status:<8}{s.pattern}")
+    if out:
+        report = stats.as_dict()
+        report["workers"] = workers
+        report["cell_seconds"] = seconds
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"  wrote {out}")
+
+
+if __name__ == "__main__":
+    _main()
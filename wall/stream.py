@@ -5,17 +5,25 @@ from __future__ import annotations
 import asyncio
 import hashlib
 import io
-from typing import Awaitable, Callable, Optional
+from typing import Awaitable, Callable, List, Optional
 
 import discord
 
-from . import PatternResult, solve_pattern
+from . import PatternResult, render_result, solve_pattern, stopped_result, telemetry, wall_render
+from .hampath import CancelToken, SolveCancelled, progress_scope
 
 FIRST_SOLVE_TIMEOUT = 45
 IMPROVE_WAIT_TIMEOUT = 105  # 90s Board-tab improve + render slack
+# Solves that answer within PROGRESS_DELAY never show a progress line.
+# Discord allows about 5 edits per 5s per channel; progress takes at most
+# one edit per PROGRESS_EDIT_SECONDS and waits that long after any edit.
+PROGRESS_DELAY = 2.0
+PROGRESS_EDIT_SECONDS = 3.0
+REPLAY_SKIPPED = "-# Replay skipped: the animation would be too large to attach."
 
 SendFn = Callable[[PatternResult], Awaitable[discord.Message]]
 EditFn = Callable[[discord.Message, PatternResult], Awaitable[None]]
+TextFn = Callable[[discord.Message, str], Awaitable[None]]
 
 
 def pattern_file(result: PatternResult) -> Optional[discord.File]:
@@ -26,6 +34,20 @@ def pattern_file(result: PatternResult) -> Optional[discord.File]:
     return discord.File(io.BytesIO(result.png), filename=f"wallall-{digest}.png")
 
 
+def pattern_files(result: PatternResult) -> List[discord.File]:
+    """Board PNG, then the replay GIF when there is one."""
+    files = []
+    file = pattern_file(result)
+    if file:
+        files.append(file)
+    if result.gif:
+        digest = hashlib.sha1(result.gif).hexdigest()[:10]
+        files.append(
+            discord.File(io.BytesIO(result.gif), filename=f"wallall-replay-{digest}.gif")
+        )
+    return files
+
+
 def _content(result: PatternResult) -> str:
     text = result.content or ""
     if len(text) > 1900:
@@ -34,42 +56,166 @@ def _content(result: PatternResult) -> str:
 
 
 async def send_pattern_message(target, result: PatternResult) -> discord.Message:
-    file = pattern_file(result)
-    if file:
-        return await target.send(_content(result), file=file)
+    files = pattern_files(result)
+    if files:
+        return await target.send(_content(result), files=files)
     return await target.send(_content(result))
 
 
 async def edit_pattern_message(message: discord.Message, result: PatternResult) -> None:
-    file = pattern_file(result)
-    if file:
-        await message.edit(content=_content(result), attachments=[file])
-    else:
-        await message.edit(content=_content(result), attachments=[])
+    await message.edit(content=_content(result), attachments=pattern_files(result))
+
+
+async def edit_progress_text(message: discord.Message, content: str) -> None:
+    """Content-only edit: the attached board stays as it is."""
+    await message.edit(content=content)
+
+
+_RUNNING = object()
+
+
+def _newest(queue: asyncio.Queue, item):
+    """Skip to the newest queued result; results nobody saw are dropped.
+
+    Returns (newest PatternResult or None, the end marker that followed it
+    or _RUNNING while the solve is still going).
+    """
+    latest = None
+    while isinstance(item, PatternResult):
+        latest = item
+        try:
+            item = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return latest, _RUNNING
+    return latest, item
+
+
+def _progress_content(shown: Optional[PatternResult], line: str) -> str:
+    if shown is None:
+        return f"Solving… · {line}"
+    return f"{_content(shown)}\n-# ⏳ {line}"
 
 
 async def stream_pattern_solve(
     cleaned: str,
     send: SendFn,
     edit: EditFn,
+    cancel: Optional[CancelToken] = None,
+    edit_text: TextFn = edit_progress_text,
+    replay: bool = False,
+    text: bool = False,
 ) -> None:
-    """Run the solver in a thread and update the Discord message as the gap improves."""
+    """Run the solver in a thread and update the Discord message as the gap improves.
+
+    While the search runs, its SearchProgress line (phase, steps, rate) is
+    shown under the current result, or in a placeholder message before the
+    first one, through rate-limited edit_text calls. The solver thread
+    only stores the latest line, so the DFS never waits on Discord.
+
+    The solver does not render: each improvement is queued as a bare
+    result, and only the newest one is drawn (in a worker thread) when the
+    previous send or edit has finished. Results the search is still trying
+    to beat (PatternResult.searching) use wall.render.INTERIM_PROFILE; the
+    rest use FINAL. If the solve stops while an interim board is showing,
+    that board is redrawn with FINAL and a "not proven closest" caption. With replay, final results also get
+    the replay GIF, or a note when it would be too large. With text,
+    results carry a text board in their caption and nothing is rendered.
+
+    The solve is cancelled as soon as this coroutine stops listening (timeout,
+    error, or task cancellation). Callers may pass their own token to
+    supersede a solve that is still running.
+    """
     loop = asyncio.get_running_loop()
     queue: asyncio.Queue = asyncio.Queue()
+    if cancel is None:
+        cancel = CancelToken()
+
+    last: list = [None]
+    status: list = [None]  # latest progress line, written by the solver thread
 
     def on_update(result: PatternResult) -> None:
+        last[0] = result
         loop.call_soon_threadsafe(queue.put_nowait, result)
 
+    def emit(line: str) -> None:
+        status[0] = line
+
     def work() -> None:
-        try:
-            solve_pattern(cleaned, on_update=on_update)
-        except Exception as error:
-            loop.call_soon_threadsafe(queue.put_nowait, error)
-        else:
-            loop.call_soon_threadsafe(queue.put_nowait, None)
+        with progress_scope(emit, batch=False) as prog:
+            try:
+                solve_pattern(
+                    cleaned, on_update=on_update, cancel=cancel, render=False, text=text
+                )
+            except SolveCancelled:
+                telemetry.record_solve(prog, last[0], cancelled=True)
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            except Exception as error:
+                telemetry.record_solve(prog)
+                loop.call_soon_threadsafe(queue.put_nowait, error)
+            else:
+                telemetry.record_solve(prog, last[0])
+                loop.call_soon_threadsafe(queue.put_nowait, None)
 
     worker = asyncio.create_task(asyncio.to_thread(work))
     message = None
+    shown: Optional[PatternResult] = None
+    shown_interim = False
+    lock = asyncio.Lock()
+    last_edit = [0.0]
+
+    async def show(result: PatternResult, interim: bool = False) -> None:
+        nonlocal message, shown, shown_interim
+        if not text:
+            profile = wall_render.INTERIM_PROFILE if interim else wall_render.FINAL
+            await asyncio.to_thread(render_result, result, profile, replay and not interim)
+            if replay and not interim and result.tour and result.gif is None:
+                result.content += f"\n{REPLAY_SKIPPED}"
+        async with lock:
+            if message is None:
+                message = await send(result)
+            else:
+                await edit(message, result)
+            shown, shown_interim = result, interim
+            last_edit[0] = loop.time()
+
+    stop = asyncio.Event()
+
+    async def pause(seconds: float) -> bool:
+        """Sleep unless stopped first; True once stopped."""
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def show_progress() -> None:
+        # A result edit resets the clock, so progress never lands right
+        # after one (nor on a final answer: the worker ends first).
+        nonlocal message
+        if await pause(PROGRESS_DELAY):
+            return
+        posted = None
+        while True:
+            wait = last_edit[0] + PROGRESS_EDIT_SECONDS - loop.time()
+            line = status[0]
+            if wait <= 0 and line and line != posted:
+                async with lock:
+                    content = _progress_content(shown, line)
+                    try:
+                        if message is None:
+                            message = await send(PatternResult(content))
+                        else:
+                            await edit_text(message, content)
+                    except Exception as error:
+                        # Progress is cosmetic: never let it mask the solve's outcome.
+                        print(f"Wall All progress edit failed: {error!r}")
+                    last_edit[0] = loop.time()
+                posted = line
+                wait = PROGRESS_EDIT_SECONDS
+            if await pause(max(wait, 0.1)):
+                return
+
+    progress = asyncio.create_task(show_progress())
     first = True
     timed_out = False
     try:
@@ -80,27 +226,35 @@ async def stream_pattern_solve(
             except asyncio.TimeoutError:
                 timed_out = True
                 break
-            if item is None:
+            latest, end = _newest(queue, item)
+            if latest is not None:
+                first = False
+                await show(latest, interim=latest.searching)
+            if isinstance(end, Exception):
+                raise end
+            if end is not _RUNNING:
                 break
-            if isinstance(item, Exception):
-                raise item
-            first = False
-            if message is None:
-                message = await send(item)
-            else:
-                await edit(message, item)
     finally:
+        # Nobody reads further updates: stop the search instead of waiting it out.
+        cancel.cancel()
+        stop.set()
+        await progress
         await worker
-        while True:
+        try:
+            latest, _end = _newest(queue, queue.get_nowait())
+        except asyncio.QueueEmpty:
+            latest = None
+        if latest is not None:
+            await show(latest)
+        elif shown_interim and not text:
+            # The search stopped before beating it: this board is the answer.
+            await show(stopped_result(shown))
+        if shown is None and message is not None:
+            # Only a progress placeholder: the caller reports the failure.
             try:
-                item = queue.get_nowait()
-            except asyncio.QueueEmpty:
-                break
-            if item is None or isinstance(item, Exception):
-                continue
-            if message is None:
-                message = await send(item)
-            else:
-                await edit(message, item)
+                await message.delete()
+            except discord.HTTPException:
+                pass
+            message = None
     if timed_out and message is None:
         raise asyncio.TimeoutError()
@@ -0,0 +1,172 @@
+"""Per-solve search telemetry and running aggregates for the owner command.
+
+wall.stream runs every /wallall and `pattern` solve under a SearchProgress
+and hands its record() here when the solve ends. Each solve keeps:
+  - its phases (steps and seconds, keyed without the parenthetical detail)
+  - prune counts by rule (_early_impossible, _warnsdorff_dfs)
+  - improved gaps over time
+  - seconds of side work inside the phases (PNG rendering, only when
+    solve_pattern renders inline; wall.stream renders off the solver)
+  - the outcome
+
+The last RECENT solves are kept whole. Every solve also feeds histograms
+of solve and phase time, which is what /wall-telemetry shows. In-memory
+only: a restart starts from zero.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import Counter, deque
+from typing import Dict
+
+RECENT = 50
+# Upper bucket edges in seconds; the last bucket is everything slower.
+EDGES = (0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0, 30.0, 100.0)
+BAR = 20
+
+
+class Histogram:
+    """Counts of values per EDGES bucket, plus their sum."""
+
+    __slots__ = ("counts", "total", "n")
+
+    def __init__(self):
+        self.counts = [0] * (len(EDGES) + 1)
+        self.total = 0.0
+        self.n = 0
+
+    def add(self, value: float) -> None:
+        k = 0
+        while k < len(EDGES) and value > EDGES[k]:
+            k += 1
+        self.counts[k] += 1
+        self.total += value
+        self.n += 1
+
+    def lines(self):
+        peak = max(self.counts) or 1
+        out = []
+        for k, count in enumerate(self.counts):
+            if not count:
+                continue
+            label = f"≤{EDGES[k]:g}s" if k < len(EDGES) else f">{EDGES[-1]:g}s"
+            bar = "█" * max(1, round(BAR * count / peak))
+            out.append(f"{label:>7} {bar:<{BAR}} {count}")
+        return out
+
+
+class _Phase:
+    __slots__ = ("runs", "nodes", "hist")
+
+    def __init__(self):
+        self.runs = 0
+        self.nodes = 0
+        self.hist = Histogram()
+
+
+def phase_key(name: str) -> str:
+    """'closest ends gap 3 (forced fill, 12 pairs)' -> 'closest ends gap 3'."""
+    return name.split(" (", 1)[0]
+
+
+_lock = threading.Lock()
+_recent: deque = deque(maxlen=RECENT)
+_solves = Histogram()
+_phases: Dict[str, _Phase] = {}
+_prunes: Counter = Counter()
+_outcomes: Counter = Counter()
+_improvements: Counter = Counter()  # improvements per solve -> solves
+_timers: Counter = Counter()  # seconds of side work, e.g. render
+_since = time.time()
+
+
+def _outcome(result, cancelled: bool) -> str:
+    if cancelled:
+        return "cancelled"
+    if result is None or not result.kind:
+        return "error"
+    if result.kind == "path":
+        return "path (closest)" if result.proven else "path"
+    return result.kind
+
+
+def record_solve(progress, result=None, cancelled: bool = False) -> dict:
+    """Store one finished solve (progress: its SearchProgress)."""
+    record = progress.record()
+    record["at"] = time.time()
+    record["outcome"] = _outcome(result, cancelled)
+    record["gap"] = result.gap if result is not None else None
+    with _lock:
+        _recent.append(record)
+        _solves.add(record["seconds"])
+        _outcomes[record["outcome"]] += 1
+        _improvements[len(record["improvements"])] += 1
+        for name, steps, seconds in record["phases"]:
+            phase = _phases.setdefault(phase_key(name), _Phase())
+            phase.runs += 1
+            phase.nodes += steps
+            phase.hist.add(seconds)
+        _prunes.update(record["prunes"])
+        _timers.update(record["timers"])
+    return record
+
+
+def reset() -> None:
+    global _solves, _since
+    with _lock:
+        _recent.clear()
+        _solves = Histogram()
+        _phases.clear()
+        _prunes.clear()
+        _outcomes.clear()
+        _improvements.clear()
+        _timers.clear()
+        _since = time.time()
+
+
+def recent():
+    with _lock:
+        return list(_recent)
+
+
+def summary(top: int = 8) -> str:
+    """Text report: outcomes, solve-time histogram, phases, prunes."""
+    with _lock:
+        if not _solves.n:
+            return "No solves recorded yet."
+        hours = (time.time() - _since) / 3600
+        lines = [
+            f"{_solves.n} solves in {hours:.1f}h · "
+            f"{_solves.total:.1f}s total · mean {_solves.total / _solves.n:.2f}s",
+            "Outcomes: " + ", ".join(f"{k} {v}" for k, v in _outcomes.most_common()),
+            "",
+            "Solve time:",
+            *_solves.lines(),
+            "",
+            "Phases by total time:",
+        ]
+        phases = sorted(_phases.items(), key=lambda kv: -kv[1].hist.total)
+        for name, phase in phases[:top]:
+            share = phase.hist.total / _solves.total if _solves.total else 0.0
+            rate = phase.nodes / phase.hist.total if phase.hist.total else 0.0
+            lines.append(
+                f"  {name}: {phase.hist.total:.1f}s ({share:.0%}) · "
+                f"{phase.runs} runs · {phase.nodes:,} steps · {rate:,.0f}/s"
+            )
+        for name, seconds in _timers.most_common():
+            share = seconds / _solves.total if _solves.total else 0.0
+            lines.append(f"  of which {name}: {seconds:.1f}s ({share:.0%})")
+        if phases:
+            name, phase = phases[0]
+            lines += ["", f"{name} time:", *phase.hist.lines()]
+        if _prunes:
+            lines += ["", "Prunes:"]
+            lines += [f"  {rule}: {count:,}" for rule, count in _prunes.most_common(top)]
+        lines += [
+            "",
+            "Improvements per solve: "
+            + ", ".join(f"{k}×{v}" for k, v in sorted(_improvements.items())),
+        ]
+        return "\n".join(lines)
@@ -0,0 +1,69 @@
+"""Who gets Wall All answers as text boards instead of PNGs.
+
+Opt-in per user (slow connections) or per channel (busy channels), kept
+in wall_text_mode.json next to the other bot state files. A solve is
+text-only if either its user or its channel opted in.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+STATE_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "wall_text_mode.json")
+SCOPES = ("user", "channel")
+
+_lock = threading.Lock()
+_state: Optional[Dict[str, List[int]]] = None
+
+
+def _empty_state() -> Dict[str, List[int]]:
+    return {scope: [] for scope in SCOPES}
+
+
+def _load() -> Dict[str, List[int]]:
+    global _state
+    if _state is not None:
+        return _state
+    _state = _empty_state()
+    if os.path.isfile(STATE_PATH):
+        try:
+            with open(STATE_PATH, "r", encoding="utf-8") as handle:
+                data = json.load(handle)
+            for scope in SCOPES:
+                _state[scope] = [int(i) for i in data.get(scope) or []]
+        except Exception as error:
+            print(f"[wall-text] Could not read state: {error}")
+    return _state
+
+
+def _save(state: Dict[str, List[int]]) -> None:
+    try:
+        with open(STATE_PATH, "w", encoding="utf-8") as handle:
+            json.dump(state, handle, indent=2)
+            handle.write("\n")
+    except Exception as error:
+        print(f"[wall-text] Could not write state: {error}")
+
+
+def is_text_mode(user_id: Optional[int], channel_id: Optional[int]) -> bool:
+    with _lock:
+        state = _load()
+        return (user_id is not None and int(user_id) in state["user"]) or (
+            channel_id is not None and int(channel_id) in state["channel"]
+        )
+
+
+def set_text_mode(scope: str, target_id: int, enabled: bool) -> None:
+    """Turn text boards on or off for one user or channel (scope in SCOPES)."""
+    if scope not in SCOPES:
+        raise ValueError(f"scope must be one of {SCOPES}")
+    with _lock:
+        state = _load()
+        ids = [i for i in state[scope] if i != int(target_id)]
+        if enabled:
+            ids.append(int(target_id))
+        state[scope] = sorted(ids)
+        _save(state)